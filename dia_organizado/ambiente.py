@@ -0,0 +1,25 @@
+"""Escolha do módulo de settings pelo ambiente.
+
+``AMBIENTE=producao`` (variável de ambiente ou ``.env``) usa
+``dia_organizado.settings_producao``; qualquer outro valor, ou nenhum, usa
+``dia_organizado.settings``. ``DJANGO_SETTINGS_MODULE``, se definido, tem
+precedência.
+"""
+import os
+
+from decouple import config
+
+
+MODULOS_SETTINGS = {
+    "desenvolvimento": "dia_organizado.settings",
+    "producao": "dia_organizado.settings_producao",
+}
+
+
+def modulo_settings():
+    ambiente = config("AMBIENTE", default="desenvolvimento")
+    return MODULOS_SETTINGS.get(ambiente, MODULOS_SETTINGS["desenvolvimento"])
+
+
+def definir_settings():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", modulo_settings())
@@ -9,8 +9,11 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 
 import os
 
+from dia_organizado.ambiente import definir_settings
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dia_organizado.settings")
+definir_settings()
+# Sob ASGI, listas e calendário usam as views assíncronas (ver tarefas/urls.py)
+os.environ.setdefault("TAREFAS_VIEWS_ASSINCRONAS", "true")
 
 application = get_asgi_application()
@@ -10,8 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import tempfile
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -24,8 +25,11 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = config('SECRET_KEY')
 
 # SECURITY WARNING: don't run with debug turned on in production!
+# (dia_organizado/settings_producao.py, escolhido com AMBIENTE=producao)
 DEBUG = True
 
+AMBIENTE = config('AMBIENTE', default='desenvolvimento')
+
 ALLOWED_HOSTS = []
 
 
@@ -45,8 +49,45 @@ INSTALLED_APPS = [
 
 CRISPY_TEMPLATE_PACK = 'bootstrap4'
 
+# Quantidade de tarefas por página nas listas (paginação por cursor)
+TAREFAS_ITENS_POR_PAGINA = config('TAREFAS_ITENS_POR_PAGINA', default=50, cast=int)
+
+# Dias à frente com as ocorrências das tarefas recorrentes na lista de pendentes
+TAREFAS_RECORRENCIAS_DIAS = config('TAREFAS_RECORRENCIAS_DIAS', default=14, cast=int)
+
+# Backend da busca: "auto" (FTS5 no SQLite, tsvector no PostgreSQL) ou "icontains"
+TAREFAS_BUSCA = config('TAREFAS_BUSCA', default='auto')
+
+# Validade (segundos) das listas em cache; a invalidação normal é por sinal
+TAREFAS_CACHE_TIMEOUT = config('TAREFAS_CACHE_TIMEOUT', default=600, cast=int)
+
+# Guarda em cache o HTML do crispy dos formulários de tarefa ainda não
+# enviados (ligado em settings_producao; em desenvolvimento atrapalharia
+# editar os templates)
+TAREFAS_CACHE_FORMULARIOS = False
+
+# Listas e calendário servidos pelas views assíncronas; o asgi.py liga por
+# padrão, já que sob WSGI elas só acrescentariam a adaptação async -> sync
+TAREFAS_VIEWS_ASSINCRONAS = config('TAREFAS_VIEWS_ASSINCRONAS', default=False, cast=bool)
+
+# Guarda as páginas das listas e do calendário inteiras no cache "respostas"
+# (ligado em settings_producao, pelo mesmo motivo dos formulários)
+TAREFAS_CACHE_RESPOSTAS = False
+
+# Perfil de cada requisição (tarefas.perfil): Server-Timing, log JSON no
+# logger "tarefas.perfil" e agregado por URL, lido com "manage.py perfil_tarefas"
+TAREFAS_PERFIL = config('TAREFAS_PERFIL', default=False, cast=bool)
+TAREFAS_PERFIL_JANELA = config('TAREFAS_PERFIL_JANELA', default=200, cast=int)
+TAREFAS_PERFIL_INTERVALO = config('TAREFAS_PERFIL_INTERVALO', default=5, cast=int)
+TAREFAS_PERFIL_DIR = config(
+    'TAREFAS_PERFIL_DIR', default=str(Path(tempfile.gettempdir()) / "dia_organizado_perfil"),
+)
+
 MIDDLEWARE = [
+    # Primeiro, para medir a requisição inteira; só atua com TAREFAS_PERFIL
+    "tarefas.perfil.PerfilMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "tarefas.replicas.PrimarioAposEscritaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -68,6 +109,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "tarefas.context_processors.contadores",
             ],
         },
     },
@@ -82,8 +124,99 @@ WSGI_APPLICATION = "dia_organizado.wsgi.application"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": config('DB_NOME', default=str(BASE_DIR / "db.sqlite3")),
+    }
+}
+
+# Perfil "producao": WAL, synchronous=NORMAL, mmap e cache em cada conexão
+# (tarefas/sqlite.py), transações de escrita IMMEDIATE para que a disputa
+# pelo lock aconteça no BEGIN, e até "timeout" segundos de espera pelo lock
+# (o busy timeout da conexão; não há outro lugar que o defina)
+DB_PERFIL = config('DB_PERFIL', default=AMBIENTE)
+TAREFAS_SQLITE_OTIMIZADO = DB_PERFIL == 'producao'
+
+if TAREFAS_SQLITE_OTIMIZADO:
+    DATABASES["default"]["OPTIONS"] = {
+        "transaction_mode": "IMMEDIATE",
+        "timeout": 20,
+    }
+
+# Réplicas de leitura para as listas e o calendário (tarefas/replicas.py).
+# Localmente, DB_REPLICAS pode apontar para outros arquivos SQLite, copiados
+# do primário com `python manage.py sincronizar_replicas`
+DB_REPLICAS = config('DB_REPLICAS', default='', cast=Csv())
+TAREFAS_REPLICAS_LEITURA = []
+for numero, nome in enumerate(DB_REPLICAS, start=1):
+    alias = f"replica_{numero}"
+    DATABASES[alias] = {**DATABASES["default"], "NAME": nome, "TEST": {"MIRROR": "default"}}
+    TAREFAS_REPLICAS_LEITURA.append(alias)
+
+DATABASE_ROUTERS = ["tarefas.replicas.RoteadorReplicas"]
+
+# Segundos em que um cliente lê do primário depois de escrever
+TAREFAS_PRIMARIO_APOS_ESCRITA = config('TAREFAS_PRIMARIO_APOS_ESCRITA', default=5, cast=int)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "dia-organizado",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+    # Páginas inteiras das listas e do calendário (tarefas.cache_respostas);
+    # com CACHE_RESPOSTAS_DIR, ficam em arquivos, junto com as versões
+    "respostas": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "dia-organizado-respostas",
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    },
+    # Versões que invalidam os caches acima (tarefas.cache_tarefas). Precisam
+    # ser as mesmas em todos os processos do servidor: aqui, em memória, só
+    # valem para um processo (runserver); com CACHE_VERSOES_DIR, e sempre em
+    # settings_producao, ficam em arquivos. Sem expiração, porque o incr dos
+    # backends sem incr nativo regrava a chave com o timeout padrão
+    "versoes": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "dia-organizado-versoes",
+        "TIMEOUT": None,
+    },
+}
+CACHE_VERSOES_DIR = config('CACHE_VERSOES_DIR', default='')
+CACHE_RESPOSTAS_DIR = config('CACHE_RESPOSTAS_DIR', default='')
+if CACHE_RESPOSTAS_DIR:
+    CACHES["respostas"] = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": CACHE_RESPOSTAS_DIR,
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    }
+    # Páginas em arquivos são lidas por todos os processos; a versão que as
+    # invalida também precisa ser, senão a escrita de um processo não chega
+    # às páginas servidas pelos outros
+    CACHE_VERSOES_DIR = CACHE_VERSOES_DIR or str(Path(CACHE_RESPOSTAS_DIR) / "versoes")
+if CACHE_VERSOES_DIR:
+    CACHES["versoes"] = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": CACHE_VERSOES_DIR,
+        "TIMEOUT": None,
     }
+
+
+# Logging
+# https://docs.djangoproject.com/en/5.1/topics/logging/
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        # Uma linha JSON por requisição quando TAREFAS_PERFIL está ligado
+        "tarefas.perfil": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
 }
 
 
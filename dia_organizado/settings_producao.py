@@ -0,0 +1,83 @@
+"""
+Settings de produção: as mesmas de ``settings.py`` com os ajustes abaixo.
+
+Escolhidas com ``AMBIENTE=producao`` (ver ``dia_organizado/ambiente.py``),
+que também liga o perfil de produção do SQLite (``DB_PERFIL``).
+``python manage.py benchmark_settings`` compara a vazão com ``settings.py``.
+"""
+
+from decouple import Csv, config
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, CACHE_VERSOES_DIR, CACHES, DATABASES, MIDDLEWARE, TEMPLATES
+
+
+DEBUG = False
+
+ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='localhost,127.0.0.1', cast=Csv())
+
+STATIC_ROOT = config('STATIC_ROOT', default=str(BASE_DIR / "staticfiles"))
+
+
+# Templates compilados uma única vez por processo (cached loader) e sem o
+# context processor de debug
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        "APP_DIRS": False,
+        "OPTIONS": {
+            **TEMPLATES[0]["OPTIONS"],
+            "context_processors": [
+                processor for processor in TEMPLATES[0]["OPTIONS"]["context_processors"]
+                if processor != "django.template.context_processors.debug"
+            ],
+            "loaders": [
+                ("django.template.loaders.cached.Loader", [
+                    "django.template.loaders.filesystem.Loader",
+                    "django.template.loaders.app_directories.Loader",
+                ]),
+            ],
+        },
+    },
+]
+
+# O HTML do crispy dos formulários vazios fica em cache (ver tarefas.views)
+TAREFAS_CACHE_FORMULARIOS = True
+
+# Páginas inteiras das listas e do calendário em cache (ver tarefas.cache_respostas)
+TAREFAS_CACHE_RESPOSTAS = True
+
+
+# Versões dos caches em arquivos, compartilhadas entre os processos do
+# gunicorn/uvicorn: em memória, uma escrita num worker não invalidaria as
+# listas em cache nos outros (ver tarefas.cache_tarefas)
+CACHES = {
+    **CACHES,
+    "versoes": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": CACHE_VERSOES_DIR or str(BASE_DIR / "cache_versoes"),
+        "TIMEOUT": None,
+    },
+}
+
+
+# Conexões persistentes entre requisições, verificadas antes de reutilizar
+DATABASES = {
+    alias: {
+        **banco,
+        "CONN_MAX_AGE": config('CONN_MAX_AGE', default=60, cast=int),
+        "CONN_HEALTH_CHECKS": True,
+    }
+    for alias, banco in DATABASES.items()
+}
+
+
+# GZip e ETag/304 para as páginas HTML. Ficam logo após o SecurityMiddleware,
+# como recomenda a documentação, para atuar sobre a resposta final.
+_posicao = MIDDLEWARE.index("django.middleware.security.SecurityMiddleware") + 1
+MIDDLEWARE = [
+    *MIDDLEWARE[:_posicao],
+    "django.middleware.gzip.GZipMiddleware",
+    "django.middleware.http.ConditionalGetMiddleware",
+    *MIDDLEWARE[_posicao:],
+]
@@ -7,10 +7,9 @@ For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
 """
 
-import os
-
+from dia_organizado.ambiente import definir_settings
 from django.core.wsgi import get_wsgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dia_organizado.settings")
+definir_settings()
 
 application = get_wsgi_application()
@@ -1,12 +1,13 @@
 #!/usr/bin/env python
 """Django's command-line utility for administrative tasks."""
-import os
 import sys
 
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dia_organizado.settings")
+    from dia_organizado.ambiente import definir_settings
+
+    definir_settings()
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -1,6 +1,7 @@
 from django.contrib import admin
-from .models import Tarefa, Categoria
+from .models import Tarefa, Categoria, Recorrencia
 
 
 admin.site.register(Tarefa)
-admin.site.register(Categoria)
\ No newline at end of file
+admin.site.register(Categoria)
+admin.site.register(Recorrencia)
\ No newline at end of file
@@ -0,0 +1,265 @@
+"""API JSON de tarefas e categorias.
+
+As listas aceitam os mesmos filtros das páginas HTML (``status``, ``q``,
+``categoria``, ``ordenar_por`` e ``cursor``) e ``?fields=`` para escolher os
+campos de cada item; só as colunas desses campos são lidas do banco.
+
+As respostas de leitura têm ETags fortes. O de uma coleção vem de um único
+agregado sobre as tarefas filtradas (quantidade e maior ``atualizado_em``,
+delas e das suas categorias): com ``If-None-Match`` atual a resposta é 304
+sem carregar nem serializar nenhuma linha. Nos detalhes, ``If-Match`` protege
+PATCH/PUT/DELETE contra sobrescrever uma alteração alheia (412).
+
+Escritas exigem corpo ``application/json`` (``_ler_corpo``, mesmo nas
+transições, que não têm dados), que um formulário de outro site não consegue
+enviar; por isso as views dispensam o token CSRF. DELETE também não sai de
+um formulário.
+"""
+import functools
+import hashlib
+import json
+
+from django.db.models import Count, Max
+from django.forms.models import model_to_dict
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition, require_http_methods
+
+from .consultas import CHAVES_ORDENACAO, consultar_tarefas, filtros_da_requisicao
+from .forms import CategoriaForm, TarefaForm
+from .models import Categoria, Tarefa
+from .paginacao import paginar
+from .transicoes import ACOES, TransicaoInvalida, transicionar
+
+
+# Campo da API -> colunas lidas do banco para ele
+COLUNAS_TAREFA = {
+    "id": ("id",),
+    "titulo": ("titulo",),
+    "descricao": ("descricao",),
+    "data": ("data",),
+    "prioridade": ("prioridade",),
+    "status": ("status",),
+    "categoria": ("categoria__id", "categoria__nome"),
+    "atualizado_em": ("atualizado_em",),
+}
+
+CAMPOS_CATEGORIA = ("id", "nome", "atualizado_em")
+
+
+class ErroApi(Exception):
+    def __init__(self, mensagem, status=400, **extra):
+        super().__init__(mensagem)
+        self.mensagem = mensagem
+        self.status = status
+        self.extra = extra
+
+
+def _api(view):
+    """Converte ``ErroApi`` e 404 em respostas JSON e dispensa o CSRF (ver docstring do módulo)."""
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except Http404:
+            return JsonResponse({"erro": "Não encontrado."}, status=404)
+        except ErroApi as erro:
+            return JsonResponse({"erro": erro.mensagem, **erro.extra}, status=erro.status)
+    return csrf_exempt(wrapper)
+
+
+def _etag(*partes):
+    return hashlib.sha1(json.dumps(partes, default=str).encode()).hexdigest()
+
+
+def _campos(request, disponiveis):
+    pedido = request.GET.get("fields", "")
+    if not pedido:
+        return list(disponiveis)
+    campos = list(dict.fromkeys(c.strip() for c in pedido.split(",") if c.strip()))
+    desconhecidos = [c for c in campos if c not in disponiveis]
+    if desconhecidos:
+        raise ErroApi(f"Campos desconhecidos: {', '.join(desconhecidos)}.", disponiveis=list(disponiveis))
+    return campos
+
+
+def _ler_corpo(request):
+    if request.content_type != "application/json":
+        raise ErroApi("Envie o corpo como application/json.", status=415)
+    try:
+        corpo = json.loads(request.body or b"{}")
+    except ValueError:
+        raise ErroApi("JSON inválido.")
+    if not isinstance(corpo, dict):
+        raise ErroApi("O corpo deve ser um objeto JSON.")
+    return corpo
+
+
+def _salvar(form):
+    if not form.is_valid():
+        raise ErroApi("Dados inválidos.", erros=form.errors.get_json_data())
+    return form.save()
+
+
+def _dados_formulario(request, instancia, campos_form):
+    """Corpo de PUT (completo) ou de PATCH (mesclado aos valores atuais)."""
+    corpo = _ler_corpo(request)
+    if request.method == "PATCH":
+        return {**model_to_dict(instancia, fields=campos_form), **corpo}
+    return corpo
+
+
+# Tarefas
+
+def serializar_tarefa(tarefa, campos=tuple(COLUNAS_TAREFA)):
+    dados = {}
+    for campo in campos:
+        if campo == "categoria":
+            dados[campo] = {"id": tarefa.categoria.id, "nome": tarefa.categoria.nome}
+        else:
+            dados[campo] = getattr(tarefa, campo)
+    return dados
+
+
+def _filtrar_tarefas(request):
+    return consultar_tarefas(tarefas=Tarefa.objects.all(), **filtros_da_requisicao(request.GET))
+
+
+def _etag_tarefas(request):
+    tarefas, _ = _filtrar_tarefas(request)
+    marcador = tarefas.aggregate(
+        total=Count("id"),
+        tarefas=Max("atualizado_em"),
+        categorias=Max("categoria__atualizado_em"),
+    )
+    return _etag(sorted(request.GET.lists()), marcador)
+
+
+@condition(etag_func=_etag_tarefas)
+def _listar_tarefas(request):
+    campos = _campos(request, COLUNAS_TAREFA)
+    tarefas, ordenar_por = _filtrar_tarefas(request)
+    chaves = CHAVES_ORDENACAO[ordenar_por]
+    colunas = {coluna for campo in campos for coluna in COLUNAS_TAREFA[campo]}
+    colunas.update(chave for chave in chaves if chave != "relevancia")
+    if "categoria" in campos:
+        tarefas = tarefas.select_related("categoria")
+    pagina = paginar(tarefas.only(*colunas), chaves, request.GET.get("cursor") or None)
+    return JsonResponse({
+        "resultados": [serializar_tarefa(tarefa, campos) for tarefa in pagina],
+        "ordenar_por": ordenar_por,
+        "cursor_anterior": pagina.cursor_anterior,
+        "cursor_proximo": pagina.cursor_proximo,
+    })
+
+
+def _criar_tarefa(request):
+    tarefa = _salvar(TarefaForm(_ler_corpo(request)))
+    resposta = JsonResponse(serializar_tarefa(tarefa), status=201)
+    resposta["Location"] = reverse("api_tarefa", args=[tarefa.id])
+    return resposta
+
+
+@_api
+@require_http_methods(["GET", "HEAD", "POST"])
+def tarefas_api(request):
+    if request.method == "POST":
+        return _criar_tarefa(request)
+    return _listar_tarefas(request)
+
+
+def _etag_tarefa(request, tarefa_id):
+    marcador = (
+        Tarefa.objects.filter(id=tarefa_id)
+        .values_list("atualizado_em", "categoria__atualizado_em")
+        .first()
+    )
+    if marcador is None:
+        return None
+    return _etag(tarefa_id, request.GET.get("fields", ""), marcador)
+
+
+@_api
+@require_http_methods(["GET", "HEAD", "PUT", "PATCH", "DELETE"])
+@condition(etag_func=_etag_tarefa)
+def tarefa_api(request, tarefa_id):
+    tarefa = get_object_or_404(Tarefa.objects.select_related("categoria"), id=tarefa_id)
+    if request.method == "DELETE":
+        tarefa.delete()
+        return HttpResponse(status=204)
+    if request.method in ("PUT", "PATCH"):
+        dados = _dados_formulario(request, tarefa, TarefaForm._meta.fields)
+        tarefa = _salvar(TarefaForm(dados, instance=tarefa))
+        return JsonResponse(serializar_tarefa(tarefa))
+    return JsonResponse(serializar_tarefa(tarefa, _campos(request, COLUNAS_TAREFA)))
+
+
+@_api
+@require_http_methods(["POST"])
+def transicao_tarefa_api(request, tarefa_id, acao):
+    # Exclusão é DELETE no detalhe da tarefa
+    if ACOES.get(acao) is None:
+        raise Http404
+    # Sem corpo JSON, a transição poderia vir de um formulário de outro site
+    _ler_corpo(request)
+    try:
+        transicionar(tarefa_id, acao)
+    except Tarefa.DoesNotExist:
+        raise Http404
+    except TransicaoInvalida as erro:
+        raise ErroApi(str(erro), status=409)
+    tarefa = Tarefa.objects.select_related("categoria").get(id=tarefa_id)
+    return JsonResponse(serializar_tarefa(tarefa))
+
+
+# Categorias
+
+def serializar_categoria(categoria, campos=CAMPOS_CATEGORIA):
+    return {campo: getattr(categoria, campo) for campo in campos}
+
+
+def _etag_categorias(request):
+    marcador = Categoria.objects.aggregate(total=Count("id"), categorias=Max("atualizado_em"))
+    return _etag(request.GET.get("fields", ""), marcador)
+
+
+@condition(etag_func=_etag_categorias)
+def _listar_categorias(request):
+    campos = _campos(request, CAMPOS_CATEGORIA)
+    categorias = Categoria.objects.order_by("nome", "id").only(*campos)
+    return JsonResponse({"resultados": [serializar_categoria(c, campos) for c in categorias]})
+
+
+@_api
+@require_http_methods(["GET", "HEAD", "POST"])
+def categorias_api(request):
+    if request.method == "POST":
+        categoria = _salvar(CategoriaForm(_ler_corpo(request)))
+        resposta = JsonResponse(serializar_categoria(categoria), status=201)
+        resposta["Location"] = reverse("api_categoria", args=[categoria.id])
+        return resposta
+    return _listar_categorias(request)
+
+
+def _etag_categoria(request, categoria_id):
+    marcador = Categoria.objects.filter(id=categoria_id).values_list("atualizado_em", flat=True).first()
+    if marcador is None:
+        return None
+    return _etag(categoria_id, request.GET.get("fields", ""), marcador)
+
+
+@_api
+@require_http_methods(["GET", "HEAD", "PUT", "PATCH", "DELETE"])
+@condition(etag_func=_etag_categoria)
+def categoria_api(request, categoria_id):
+    categoria = get_object_or_404(Categoria, id=categoria_id)
+    if request.method == "DELETE":
+        categoria.delete()
+        return HttpResponse(status=204)
+    if request.method in ("PUT", "PATCH"):
+        dados = _dados_formulario(request, categoria, CategoriaForm._meta.fields)
+        categoria = _salvar(CategoriaForm(dados, instance=categoria))
+        return JsonResponse(serializar_categoria(categoria))
+    return JsonResponse(serializar_categoria(categoria, _campos(request, CAMPOS_CATEGORIA)))
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class TarefasConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tarefas"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from . import signals  # noqa: F401
+        from .sqlite import configurar_conexao_sqlite
+
+        connection_created.connect(configurar_conexao_sqlite, dispatch_uid="tarefas_sqlite_pragmas")
@@ -0,0 +1,229 @@
+"""Benchmark de todas as URLs de ``tarefas/urls.py`` pelo cliente de testes do Django.
+
+Cada URL tem um cenário em ``CENARIOS`` (método, argumentos e dados). As
+ações que alteram uma tarefa (concluir, excluir, adiar, mover...) pegam uma
+tarefa nova a cada requisição, para que todas as repetições façam o mesmo
+trabalho; as ações de uma ocorrência recorrente pegam a ocorrência seguinte
+de uma regra diária. Para cada URL são medidos os percentis de latência, a média de
+consultas ao banco e o pico de memória alocada (``tracemalloc``) durante uma
+requisição. ``comparar`` aponta as regressões em relação a um resultado
+anterior. O comando ``benchmark_tarefas`` roda tudo num banco temporário
+preenchido por ``seed_tarefas``.
+"""
+import time
+import tracemalloc
+from collections import Counter
+from datetime import date, timedelta
+
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .models import Categoria, Recorrencia, Tarefa
+from .recorrencias import datas_ocorrencias
+
+
+class Amostras:
+    """Ids usados para montar as URLs dos cenários."""
+
+    def __init__(self):
+        self.categoria_id = Categoria.objects.order_by("id").values_list("id", flat=True).first()
+        pendentes = Tarefa.objects.filter(status="pendente").order_by("-id").values_list("id", flat=True)
+        self.tarefa_id = pendentes.first()
+        # Consumidas pelas ações que mudam o status ou apagam a tarefa
+        self._pendentes = iter(list(pendentes.exclude(id=self.tarefa_id)))
+        self._fora_da_lista = iter(list(
+            Tarefa.objects.exclude(status="pendente").order_by("-id").values_list("id", flat=True)
+        ))
+        self.recorrencia = Recorrencia.objects.filter(
+            frequencia="diaria", ate__isnull=True, quantidade__isnull=True,
+        ).order_by("id").first()
+        if self.categoria_id is None or self.tarefa_id is None or self.recorrencia is None:
+            raise ValueError(
+                "O banco precisa de categorias, tarefas pendentes e uma recorrência diária (ver seed_tarefas)."
+            )
+        # A primeira, para o modal; as seguintes, consumidas pelas ações
+        hoje = date.today()
+        datas = datas_ocorrencias(self.recorrencia, hoje, hoje + timedelta(days=3650))
+        self.data_ocorrencia = datas[0].isoformat()
+        self._ocorrencias = iter([data.isoformat() for data in datas[1:]])
+
+    def _proxima(self, ids, descricao):
+        try:
+            return next(ids)
+        except StopIteration:
+            raise ValueError(f"Acabaram as tarefas {descricao}; gere mais com --tarefas.") from None
+
+    def pendente(self):
+        return self._proxima(self._pendentes, "pendentes")
+
+    def fora_da_lista(self):
+        return self._proxima(self._fora_da_lista, "concluídas ou adiadas")
+
+    def ocorrencia(self):
+        return self._proxima(self._ocorrencias, "recorrentes")
+
+
+def _get(**kwargs):
+    return lambda amostras: ("get", {nome: valor(amostras) for nome, valor in kwargs.items()}, None)
+
+
+def _tarefa(amostras):
+    return amostras.tarefa_id
+
+
+def _pendente(amostras):
+    return amostras.pendente()
+
+
+# url_name -> função(amostras) que devolve (método, kwargs do reverse, dados);
+# dados em str são enviados como corpo application/json
+CENARIOS = {
+    "tarefas_pendentes_list": _get(),
+    "concluir_tarefa": _get(tarefa_id=_pendente),
+    "excluir_tarefa": _get(tarefa_id=_pendente),
+    "adiar_tarefa": _get(tarefa_id=_pendente),
+    "adicionar_tarefa": _get(),
+    "editar_tarefa": _get(tarefa_id=_tarefa),
+    "criar_categoria": _get(),
+    "tarefas_concluidas_list": _get(),
+    "tarefas_adiadas_list": _get(),
+    "modal_tarefa": _get(tarefa_id=_tarefa),
+    "mover_para_tarefas": _get(tarefa_id=lambda amostras: amostras.fora_da_lista()),
+    "adicionar_recorrencia": _get(),
+    "modal_ocorrencia": _get(
+        recorrencia_id=lambda amostras: amostras.recorrencia.id,
+        data=lambda amostras: amostras.data_ocorrencia,
+    ),
+    "ocorrencia_tarefa": lambda amostras: (
+        "get", {"recorrencia_id": amostras.recorrencia.id, "data": amostras.ocorrencia(), "acao": "concluir"}, None,
+    ),
+    "acao_em_massa": lambda amostras: (
+        "post", {}, {"acao": "adiar", "ids": [amostras.pendente() for _ in range(10)]},
+    ),
+    # Uma categoria só, para que a exportação não domine o tempo do benchmark
+    "exportar_tarefas": lambda amostras: ("get", {}, {"categoria": amostras.categoria_id}),
+    "calendario_mensal": _get(),
+    "modal_dia": _get(
+        ano=lambda amostras: date.today().year,
+        mes=lambda amostras: date.today().month,
+        dia=lambda amostras: date.today().day,
+    ),
+    "api_tarefas": _get(),
+    "api_tarefa": _get(tarefa_id=_tarefa),
+    "api_transicao_tarefa": lambda amostras: (
+        "post", {"tarefa_id": amostras.pendente(), "acao": "concluir"}, "{}",
+    ),
+    "api_categorias": _get(),
+    "api_categoria": _get(categoria_id=lambda amostras: amostras.categoria_id),
+}
+
+
+def _requisitar(cliente, nome, cenario, amostras):
+    metodo, kwargs, dados = cenario(amostras)
+    caminho = reverse(nome, kwargs=kwargs)
+    extra = {"content_type": "application/json"} if isinstance(dados, str) else {}
+    resposta = getattr(cliente, metodo)(caminho, dados, **extra)
+    if resposta.streaming:
+        b"".join(resposta.streaming_content)
+    return metodo, caminho, resposta.status_code
+
+
+def _limpar_caches():
+    for alias in ("default", "respostas"):
+        caches[alias].clear()
+
+
+def _percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+
+def medir_url(cliente, nome, amostras, requisicoes, frio=False):
+    """Mede ``requisicoes`` requisições de uma URL, depois de uma de aquecimento."""
+    cenario = CENARIOS[nome]
+    _requisitar(cliente, nome, cenario, amostras)
+    latencias, consultas, status = [], [], Counter()
+    for _ in range(requisicoes):
+        if frio:
+            _limpar_caches()
+        with CaptureQueriesContext(connection) as capturadas:
+            inicio = time.perf_counter()
+            metodo, caminho, codigo = _requisitar(cliente, nome, cenario, amostras)
+            latencias.append(time.perf_counter() - inicio)
+        consultas.append(len(capturadas))
+        status[codigo] += 1
+
+    # Memória numa requisição à parte: o tracemalloc deixa tudo mais lento
+    if frio:
+        _limpar_caches()
+    ja_rastreando = tracemalloc.is_tracing()
+    if not ja_rastreando:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    _requisitar(cliente, nome, cenario, amostras)
+    pico = tracemalloc.get_traced_memory()[1] - base
+    if not ja_rastreando:
+        tracemalloc.stop()
+
+    return {
+        "metodo": metodo.upper(),
+        "caminho": caminho,
+        "status": sorted(status),
+        "p50_ms": round(_percentil(latencias, 0.50) * 1000, 3),
+        "p95_ms": round(_percentil(latencias, 0.95) * 1000, 3),
+        "p99_ms": round(_percentil(latencias, 0.99) * 1000, 3),
+        "media_ms": round(sum(latencias) / len(latencias) * 1000, 3),
+        "consultas": round(sum(consultas) / len(consultas), 2),
+        "pico_memoria_kb": round(pico / 1024, 1),
+    }
+
+
+def medir_urls(cliente, requisicoes=30, frio=False, nomes=None):
+    """``{url_name: medidas}`` de todas as URLs com nome em ``tarefas.urls``.
+
+    URLs sem cenário aparecem com ``{"erro": "sem cenário"}``, para que uma
+    URL nova não fique fora do benchmark sem ninguém perceber.
+    """
+    from . import urls
+
+    amostras = Amostras()
+    resultados = {}
+    for padrao in urls.urlpatterns:
+        if not padrao.name or (nomes and padrao.name not in nomes):
+            continue
+        if padrao.name not in CENARIOS:
+            resultados[padrao.name] = {"erro": "sem cenário"}
+            continue
+        resultados[padrao.name] = medir_url(cliente, padrao.name, amostras, requisicoes, frio)
+    return resultados
+
+
+def comparar(atual, base, tolerancia=0.25, folga_ms=1.0, folga_kb=64):
+    """Regressões de ``atual`` em relação a ``base`` (ambos ``{url_name: medidas}``).
+
+    Devolve ``[(url_name, métrica, antes, depois)]``. A latência é comparada
+    pela mediana, bem mais estável que o p95 com poucas requisições; ela e a
+    memória podem piorar até ``tolerancia`` (mais uma folga absoluta, para
+    não acusar ruído em valores pequenos). Consultas e status não podem
+    mudar para pior.
+    """
+    regressoes = []
+    for nome, medidas in atual.items():
+        anterior = base.get(nome)
+        if anterior is None or "erro" in anterior:
+            continue
+        if "erro" in medidas:
+            regressoes.append((nome, "erro", None, medidas["erro"]))
+            continue
+        if medidas["p50_ms"] > anterior["p50_ms"] * (1 + tolerancia) + folga_ms:
+            regressoes.append((nome, "p50_ms", anterior["p50_ms"], medidas["p50_ms"]))
+        if medidas["consultas"] > anterior["consultas"] + 0.5:
+            regressoes.append((nome, "consultas", anterior["consultas"], medidas["consultas"]))
+        if medidas["pico_memoria_kb"] > anterior["pico_memoria_kb"] * (1 + tolerancia) + folga_kb:
+            regressoes.append((nome, "pico_memoria_kb", anterior["pico_memoria_kb"], medidas["pico_memoria_kb"]))
+        if medidas["status"] != anterior["status"]:
+            regressoes.append((nome, "status", anterior["status"], medidas["status"]))
+    return regressoes
@@ -0,0 +1,96 @@
+"""Backends da busca textual (campo ``q``) das listas de tarefas.
+
+- ``BuscaSQLiteFTS``: tabela virtual FTS5 ``tarefas_tarefa_fts``;
+- ``BuscaPostgres``: coluna ``tsvector`` com índice GIN;
+- ``BuscaIcontains``: o ``icontains`` original, usado como alternativa.
+
+Os dois índices textuais são criados pela migração 0011 e mantidos em dia
+por triggers no próprio banco, então qualquer escrita (ORM, admin, SQL
+direto) os atualiza. Os backends textuais anotam ``relevancia``, em que
+valores menores indicam resultados mais relevantes.
+"""
+import re
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+
+TABELA_FTS = "tarefas_tarefa_fts"
+
+
+def _palavras(termo):
+    return re.findall(r"\w+", termo)
+
+
+class BuscaIcontains:
+    ordena_por_relevancia = False
+
+    def buscar(self, tarefas, termo):
+        return tarefas.filter(
+            Q(titulo__icontains=termo) |
+            Q(descricao__icontains=termo) |
+            Q(categoria__nome__icontains=termo)
+        )
+
+
+class BuscaSQLiteFTS:
+    ordena_por_relevancia = True
+
+    def buscar(self, tarefas, termo):
+        # Cada palavra vira um prefixo entre aspas: "reu"* casa com "reunião"
+        consulta = " ".join('"%s"*' % palavra for palavra in _palavras(termo))
+        return tarefas.filter(RawSQL(
+            f'"tarefas_tarefa"."id" IN (SELECT rowid FROM {TABELA_FTS} WHERE {TABELA_FTS} MATCH %s)',
+            (consulta,), output_field=BooleanField(),
+        )).annotate(relevancia=RawSQL(
+            f"(SELECT bm25({TABELA_FTS}, 10.0, 5.0, 1.0) FROM {TABELA_FTS} "
+            f'WHERE {TABELA_FTS} MATCH %s AND rowid = "tarefas_tarefa"."id")',
+            (consulta,), output_field=FloatField(),
+        ))
+
+
+class BuscaPostgres:
+    ordena_por_relevancia = True
+
+    def buscar(self, tarefas, termo):
+        consulta = " & ".join(f"{palavra}:*" for palavra in _palavras(termo))
+        tsquery = "to_tsquery('portuguese', %s)"
+        return tarefas.filter(RawSQL(
+            f'"tarefas_tarefa"."busca" @@ {tsquery}', (consulta,), output_field=BooleanField(),
+        )).annotate(relevancia=RawSQL(
+            f'-ts_rank("tarefas_tarefa"."busca", {tsquery})', (consulta,), output_field=FloatField(),
+        ))
+
+
+_indice_disponivel = {}
+
+
+def _tem_indice_textual(alias):
+    connection = connections[alias]
+    chave = (alias, connection.settings_dict["NAME"])
+    if chave not in _indice_disponivel:
+        if connection.vendor == "sqlite":
+            _indice_disponivel[chave] = TABELA_FTS in connection.introspection.table_names()
+        elif connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                colunas = connection.introspection.get_table_description(cursor, "tarefas_tarefa")
+            _indice_disponivel[chave] = any(coluna.name == "busca" for coluna in colunas)
+        else:
+            _indice_disponivel[chave] = False
+    return _indice_disponivel[chave]
+
+
+def backend_busca(termo="", alias=DEFAULT_DB_ALIAS):
+    """Escolhe o backend conforme ``TAREFAS_BUSCA`` ("auto" ou "icontains") e o banco.
+
+    ``alias`` é o banco em que a consulta vai rodar (``queryset.db``), que
+    pode ser uma réplica (ver ``tarefas.replicas``).
+    """
+    if (getattr(settings, "TAREFAS_BUSCA", "auto") == "icontains"
+            or not _palavras(termo) or not _tem_indice_textual(alias)):
+        return BuscaIcontains()
+    if connections[alias].vendor == "postgresql":
+        return BuscaPostgres()
+    return BuscaSQLiteFTS()
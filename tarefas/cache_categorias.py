@@ -0,0 +1,95 @@
+"""Categorias em cache, para o filtro das listas e as opções do ``TarefaForm``.
+
+As categorias quase nunca mudam e aparecem em quase toda página. Ficam em
+duas camadas:
+
+- no cache do Django (compartilhado entre os processos, se o backend for),
+  numa chave com a versão das categorias;
+- na memória do processo, junto com a versão lida, para que uma página
+  não precise nem desserializar a lista: basta ler a versão.
+
+A versão fica no cache ``versoes``, o mesmo para todos os processos (ver
+``tarefas.cache_tarefas``), e é lida a cada chamada: uma categoria criada
+num processo descarta a cópia em memória dos demais na próxima leitura.
+
+A versão muda a cada ``post_save``/``post_delete`` de ``Categoria`` (ver
+``tarefas.signals``), com o mesmo esquema de ``invalidar_tarefas``; operações
+em massa, que não disparam sinais, chamam ``invalidar_categorias``.
+"""
+from django.core.cache import cache
+from django.db import transaction
+
+from .cache_tarefas import acache, aler_versao, incrementar_versao, ler_versao, timeout_cache
+from .models import Categoria
+from .replicas import leitura_em_replica
+
+
+CHAVE_VERSAO = "tarefas:categorias:versao"
+
+# (versão, categorias) lidas por último neste processo
+_local = (None, ())
+
+
+def _consulta():
+    return Categoria.objects.order_by("id")
+
+
+def versao_categorias():
+    return ler_versao(CHAVE_VERSAO)
+
+
+async def aversao_categorias():
+    return await aler_versao(CHAVE_VERSAO)
+
+
+def _incrementar_versao():
+    global _local
+    _local = (None, ())
+    incrementar_versao(CHAVE_VERSAO)
+
+
+def invalidar_categorias():
+    """Descarta as categorias em cache, agora e de novo após o commit."""
+    _incrementar_versao()
+    transaction.on_commit(_incrementar_versao)
+
+
+def _guardar_local(versao, categorias):
+    global _local
+    categorias = tuple(categorias)
+    if not leitura_em_replica():
+        _local = (versao, categorias)
+    return categorias
+
+
+def listar_categorias():
+    """Todas as categorias, por id; só consulta o banco quando a versão muda."""
+    versao = versao_categorias()
+    versao_local, categorias = _local
+    if versao_local == versao:
+        return categorias
+    chave = f"tarefas:categorias:{versao}"
+    categorias = cache.get(chave)
+    if categorias is None:
+        categorias = list(_consulta())
+        if not leitura_em_replica():
+            cache.set(chave, categorias, timeout_cache())
+    return _guardar_local(versao, categorias)
+
+
+async def alistar_categorias():
+    versao = await aversao_categorias()
+    versao_local, categorias = _local
+    if versao_local == versao:
+        return categorias
+    chave = f"tarefas:categorias:{versao}"
+    categorias = await acache("get", chave)
+    if categorias is None:
+        categorias = [categoria async for categoria in _consulta().aiterator()]
+        if not leitura_em_replica():
+            await acache("set", chave, categorias, timeout_cache())
+    return _guardar_local(versao, categorias)
+
+
+def categorias_por_id():
+    return {categoria.id: categoria for categoria in listar_categorias()}
@@ -0,0 +1,179 @@
+"""Cache das páginas inteiras das listas e do calendário.
+
+``cache_resposta`` guarda o HTML das respostas no cache ``respostas``, numa
+chave formada por:
+
+- a versão das tarefas (``versao_tarefas``), trocada a cada alteração de
+  ``Tarefa`` ou ``Categoria``: a invalidação é pela versão, não pelo tempo.
+  Ela fica no cache ``versoes``; com ``CACHE_RESPOSTAS_DIR``, o settings
+  põe as versões em arquivos no mesmo diretório das páginas, para que a
+  escrita de um processo invalide as páginas que os outros servem;
+- o dia de hoje, porque as páginas dependem de ``today``; as entradas
+  também expiram à meia-noite;
+- o caminho e a querystring normalizada (parâmetros em ordem, espaços
+  colapsados, vazios descartados);
+- o cookie do CSRF, porque as listas trazem o token do formulário das
+  ações em massa. Por isso cada navegador tem as próprias entradas, e
+  respostas que criam o cookie não são guardadas.
+
+Páginas montadas com leituras de uma réplica, que podem estar atrasadas,
+também não são guardadas (ver ``tarefas.replicas``).
+
+Requisições com mensagens pendentes (``django.contrib.messages``) passam
+direto, já que a mensagem aparece uma vez só. Acertos e falhas de cada view
+são contados no próprio cache: ``estatisticas_respostas()`` ou
+``python manage.py cache_respostas``.
+"""
+import functools
+import hashlib
+from datetime import datetime, time, timedelta
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from .cache_tarefas import acache, aversao_tarefas, timeout_cache, versao_tarefas
+from .replicas import leitura_em_replica
+
+
+ALIAS = "respostas"
+
+# Views com cache_resposta (url_name), listadas nas estatísticas
+VIEWS_EM_CACHE = (
+    "tarefas_pendentes_list", "tarefas_concluidas_list", "tarefas_adiadas_list", "calendario_mensal",
+)
+TIPOS_CONTADOR = ("acertos", "falhas")
+
+
+def _ativo(request):
+    return (
+        getattr(settings, "TAREFAS_CACHE_RESPOSTAS", False)
+        and request.method == "GET"
+        # O armazenamento padrão (FallbackStorage) sempre usa este cookie
+        # quando há mensagens pendentes, mesmo as que transbordam para a sessão
+        and CookieStorage.cookie_name not in request.COOKIES
+    )
+
+
+def normalizar_querystring(parametros):
+    pares = sorted(
+        (nome, " ".join(valor.split()))
+        for nome in parametros for valor in parametros.getlist(nome)
+    )
+    return urlencode([(nome, valor) for nome, valor in pares if valor])
+
+
+def chave_resposta(request, versao, hoje):
+    csrf = request.COOKIES.get(settings.CSRF_COOKIE_NAME, "")
+    identificacao = f"{request.path}?{normalizar_querystring(request.GET)}|{csrf}"
+    return f"tarefas:resposta:{versao}:{hoje.isoformat()}:{hashlib.sha1(identificacao.encode()).hexdigest()}"
+
+
+def _timeout(agora):
+    """Segundos até a meia-noite, limitados a ``TAREFAS_CACHE_TIMEOUT``."""
+    meia_noite = datetime.combine(agora.date() + timedelta(days=1), time.min)
+    return max(1, min(timeout_cache(), int((meia_noite - agora).total_seconds())))
+
+
+def _armazenavel(request, response):
+    # O template pediu um token CSRF sem que o navegador tivesse o cookie: o
+    # HTML só vale junto com o cookie novo desta resposta
+    cookie_novo = (
+        request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        and request.META.get("CSRF_COOKIE") != request.COOKIES.get(settings.CSRF_COOKIE_NAME)
+    )
+    return (
+        response.status_code == 200 and not response.streaming and not response.cookies and not cookie_novo
+        and not leitura_em_replica()
+    )
+
+
+def _pagina(response):
+    return {"conteudo": response.content, "tipo": response["Content-Type"]}
+
+
+def _resposta(pagina):
+    response = HttpResponse(pagina["conteudo"], content_type=pagina["tipo"])
+    response["X-Cache"] = "HIT"
+    return response
+
+
+def _chave_contador(nome, tipo):
+    return f"tarefas:respostas:{tipo}:{nome}"
+
+
+def _nome_view(request):
+    match = getattr(request, "resolver_match", None)
+    return match.url_name if match and match.url_name else request.path
+
+
+def _contar(request, tipo):
+    respostas = caches[ALIAS]
+    chave = _chave_contador(_nome_view(request), tipo)
+    respostas.add(chave, 0, timeout=None)
+    respostas.incr(chave)
+
+
+async def _acontar(request, tipo):
+    chave = _chave_contador(_nome_view(request), tipo)
+    await acache("add", chave, 0, timeout=None, alias=ALIAS)
+    await acache("incr", chave, alias=ALIAS)
+
+
+def cache_resposta(view):
+    """Serve a página do cache ``respostas`` enquanto as tarefas e o dia não mudarem."""
+    if iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def wrapper_async(request, *args, **kwargs):
+            if not _ativo(request):
+                return await view(request, *args, **kwargs)
+            agora = datetime.now()
+            chave = chave_resposta(request, await aversao_tarefas(), agora.date())
+            pagina = await acache("get", chave, alias=ALIAS)
+            if pagina is not None:
+                await _acontar(request, "acertos")
+                return _resposta(pagina)
+            await _acontar(request, "falhas")
+            response = await view(request, *args, **kwargs)
+            if _armazenavel(request, response):
+                await acache("set", chave, _pagina(response), _timeout(agora), alias=ALIAS)
+            response["X-Cache"] = "MISS"
+            return response
+        return wrapper_async
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not _ativo(request):
+            return view(request, *args, **kwargs)
+        agora = datetime.now()
+        chave = chave_resposta(request, versao_tarefas(), agora.date())
+        pagina = caches[ALIAS].get(chave)
+        if pagina is not None:
+            _contar(request, "acertos")
+            return _resposta(pagina)
+        _contar(request, "falhas")
+        response = view(request, *args, **kwargs)
+        if _armazenavel(request, response):
+            caches[ALIAS].set(chave, _pagina(response), _timeout(agora))
+        response["X-Cache"] = "MISS"
+        return response
+    return wrapper
+
+
+def estatisticas_respostas():
+    """``{url_name: {"acertos": n, "falhas": n}}`` das views em ``VIEWS_EM_CACHE``."""
+    chaves = {_chave_contador(nome, tipo): (nome, tipo) for nome in VIEWS_EM_CACHE for tipo in TIPOS_CONTADOR}
+    valores = caches[ALIAS].get_many(list(chaves))
+    estatisticas = {nome: dict.fromkeys(TIPOS_CONTADOR, 0) for nome in VIEWS_EM_CACHE}
+    for chave, (nome, tipo) in chaves.items():
+        estatisticas[nome][tipo] = valores.get(chave, 0)
+    return estatisticas
+
+
+def zerar_estatisticas():
+    caches[ALIAS].delete_many([
+        _chave_contador(nome, tipo) for nome in VIEWS_EM_CACHE for tipo in TIPOS_CONTADOR
+    ])
@@ -0,0 +1,183 @@
+"""Cache das listas de tarefas no framework de cache do Django.
+
+Cada combinação normalizada de filtros guarda só os ids da página; as linhas
+ficam em entradas próprias por tarefa, compartilhadas entre as listas. Todas
+as chaves incluem uma versão, incrementada sempre que uma ``Tarefa`` ou
+``Categoria`` muda (ver ``tarefas.signals``) — trocar a versão invalida tudo
+de uma vez, sem precisar apagar chaves.
+
+As listas ficam no cache ``default``, que pode ser local a cada processo; as
+versões, no cache ``versoes``, que precisa ser o mesmo para todos os
+processos do servidor, senão uma escrita num deles não invalida as listas
+dos outros. Por isso ``settings_producao`` sempre o guarda em arquivos.
+
+Leituras feitas numa réplica não são guardadas (ver ``tarefas.replicas``).
+
+As funções com prefixo ``a`` são as versões assíncronas usadas pelas views
+assíncronas (ver ``acache``).
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from .replicas import leitura_em_replica
+
+
+CHAVE_VERSAO = "tarefas:versao"
+
+ALIAS_VERSOES = "versoes"
+
+
+def timeout_cache():
+    return getattr(settings, "TAREFAS_CACHE_TIMEOUT", 600)
+
+
+async def acache(metodo, *args, alias="default", **kwargs):
+    """Chama ``caches[alias].<metodo>`` a partir de código assíncrono.
+
+    Os métodos ``aget``/``aset`` do Django passam por ``sync_to_async`` em
+    todos os backends; para o ``LocMemCache``, que não faz I/O, essa ida e
+    volta por uma thread custa mais que a própria leitura (sob carga, a
+    lista assíncrona ficava mais lenta que a síncrona), então ele é chamado
+    direto.
+    """
+    backend = caches[alias]
+    if isinstance(backend, LocMemCache):
+        return getattr(backend, metodo)(*args, **kwargs)
+    return await getattr(backend, f"a{metodo}")(*args, **kwargs)
+
+
+def _versao_inicial():
+    # Se a chave da versão for descartada pelo cache, recomeçar do relógio
+    # (e não de 1) evita reaproveitar entradas de uma versão antiga
+    return time.time_ns() // 1000
+
+
+def ler_versao(chave):
+    """Versão guardada em ``chave`` no cache ``versoes``, criada na primeira leitura."""
+    versoes = caches[ALIAS_VERSOES]
+    versao = versoes.get(chave)
+    if versao is None:
+        versoes.add(chave, _versao_inicial(), timeout=None)
+        versao = versoes.get(chave)
+    return versao
+
+
+async def aler_versao(chave):
+    versao = await acache("get", chave, alias=ALIAS_VERSOES)
+    if versao is None:
+        await acache("add", chave, _versao_inicial(), timeout=None, alias=ALIAS_VERSOES)
+        versao = await acache("get", chave, alias=ALIAS_VERSOES)
+    return versao
+
+
+def incrementar_versao(chave):
+    # Em backends sem incr atômico (arquivos), duas escritas simultâneas
+    # podem chegar ao mesmo número; ainda assim a versão muda, e o segundo
+    # incremento de invalidar_tarefas cobre a janela até o commit
+    versoes = caches[ALIAS_VERSOES]
+    try:
+        versoes.incr(chave)
+    except ValueError:
+        versoes.set(chave, _versao_inicial(), timeout=None)
+
+
+def versao_tarefas():
+    return ler_versao(CHAVE_VERSAO)
+
+
+async def aversao_tarefas():
+    return await aler_versao(CHAVE_VERSAO)
+
+
+def _incrementar_versao():
+    incrementar_versao(CHAVE_VERSAO)
+
+
+def invalidar_tarefas():
+    """Descarta as listas em cache.
+
+    Incrementa agora, para a própria transação não ler dados antigos, e de
+    novo após o commit, para descartar o que outra requisição tenha posto em
+    cache antes de os dados novos ficarem visíveis.
+    """
+    _incrementar_versao()
+    transaction.on_commit(_incrementar_versao)
+
+
+def _resumo(parametros):
+    serializado = json.dumps(parametros, sort_keys=True, default=str)
+    return hashlib.sha1(serializado.encode()).hexdigest()
+
+
+def chave_lista(**parametros):
+    return f"tarefas:lista:{versao_tarefas()}:{_resumo(parametros)}"
+
+
+async def achave_lista(**parametros):
+    return f"tarefas:lista:{await aversao_tarefas()}:{_resumo(parametros)}"
+
+
+def obter_lista(chave):
+    return cache.get(chave)
+
+
+async def aobter_lista(chave):
+    return await acache("get", chave)
+
+
+def _entrada_lista(pagina, ordenar_por):
+    return {
+        "ids": [tarefa.id for tarefa in pagina.itens],
+        "ordenar_por": ordenar_por,
+        "cursor_anterior": pagina.cursor_anterior,
+        "cursor_proximo": pagina.cursor_proximo,
+    }
+
+
+def guardar_lista(chave, pagina, ordenar_por):
+    if leitura_em_replica():
+        return
+    cache.set(chave, _entrada_lista(pagina, ordenar_por), timeout_cache())
+    versao = versao_tarefas()
+    cache.set_many({f"tarefas:linha:{versao}:{t.id}": t for t in pagina.itens}, timeout_cache())
+
+
+async def aguardar_lista(chave, pagina, ordenar_por):
+    if leitura_em_replica():
+        return
+    await acache("set", chave, _entrada_lista(pagina, ordenar_por), timeout_cache())
+    versao = await aversao_tarefas()
+    await acache("set_many", {f"tarefas:linha:{versao}:{t.id}": t for t in pagina.itens}, timeout_cache())
+
+
+def obter_linhas(ids, consulta):
+    """Devolve as tarefas de ``ids`` na mesma ordem, buscando no banco só as ausentes do cache."""
+    versao = versao_tarefas()
+    chaves = {f"tarefas:linha:{versao}:{id_}": id_ for id_ in ids}
+    encontradas = {chaves[chave]: tarefa for chave, tarefa in cache.get_many(list(chaves)).items()}
+    faltando = [id_ for id_ in ids if id_ not in encontradas]
+    if faltando:
+        novas = consulta.in_bulk(faltando)
+        if not leitura_em_replica():
+            cache.set_many({f"tarefas:linha:{versao}:{id_}": t for id_, t in novas.items()}, timeout_cache())
+        encontradas.update(novas)
+    return [encontradas[id_] for id_ in ids if id_ in encontradas]
+
+
+async def aobter_linhas(ids, consulta):
+    versao = await aversao_tarefas()
+    chaves = {f"tarefas:linha:{versao}:{id_}": id_ for id_ in ids}
+    encontradas = {chaves[chave]: tarefa for chave, tarefa in (await acache("get_many", list(chaves))).items()}
+    faltando = [id_ for id_ in ids if id_ not in encontradas]
+    if faltando:
+        novas = await consulta.ain_bulk(faltando)
+        if not leitura_em_replica():
+            await acache("set_many", {f"tarefas:linha:{versao}:{id_}": t for id_, t in novas.items()}, timeout_cache())
+        encontradas.update(novas)
+    return [encontradas[id_] for id_ in ids if id_ in encontradas]
@@ -0,0 +1,73 @@
+"""Montagem das consultas de tarefas usadas pelas listas e pelo calendário.
+
+Toda listagem passa por ``consultar_tarefas``: ela sempre junta a categoria
+(as linhas exibem ``tarefa.categoria``) e carrega só as colunas que os
+templates e a paginação usam.
+"""
+from .busca import backend_busca
+from .models import Tarefa
+
+
+# Colunas lidas pelos templates das listas e pelas chaves de ordenação; a
+# descrição só aparece nos modais, buscados à parte (views.modal_tarefa)
+CAMPOS_LISTAGEM = (
+    "id", "titulo", "data", "prioridade", "prioridade_rank",
+    "categoria__id", "categoria__nome",
+)
+
+# Chaves de ordenação de cada opção de "ordenar_por"; o id no final torna a
+# ordem total, como a paginação por cursor exige. "prioridade" usa a coluna
+# numérica indexada em vez de um Case/When por linha.
+CHAVES_ORDENACAO = {
+    "data": ("data", "prioridade", "id"),
+    "prioridade": ("prioridade_rank", "data", "id"),
+    "relevancia": ("relevancia", "id"),
+}
+
+
+def tarefas_para_listagem():
+    return Tarefa.objects.select_related("categoria").only(*CAMPOS_LISTAGEM)
+
+
+def buscar_tarefas(tarefas, busca, ordenar_por):
+    """Aplica a busca textual e normaliza "ordenar_por".
+
+    Com busca e sem ordenação explícita, os resultados vêm por relevância
+    (quando o backend a oferece).
+    """
+    relevancia = False
+    if busca:
+        backend = backend_busca(busca, tarefas.db)
+        tarefas = backend.buscar(tarefas, busca)
+        relevancia = backend.ordena_por_relevancia
+    if not ordenar_por and relevancia:
+        ordenar_por = "relevancia"
+    if ordenar_por not in CHAVES_ORDENACAO or (ordenar_por == "relevancia" and not relevancia):
+        ordenar_por = "data"
+    return tarefas, ordenar_por
+
+
+def filtros_da_requisicao(parametros):
+    """Lê ``status``, ``q``, ``categoria`` e ``ordenar_por`` de ``request.GET`` para ``consultar_tarefas``."""
+    categoria = parametros.get("categoria", "")
+    return {
+        "status": parametros.get("status", ""),
+        "busca": " ".join(parametros.get("q", "").split()),
+        "categoria_id": int(categoria) if categoria.isdigit() else None,
+        "ordenar_por": parametros.get("ordenar_por", ""),
+    }
+
+
+def consultar_tarefas(status, busca="", categoria_id=None, ordenar_por="", tarefas=None):
+    """Devolve ``(queryset, ordenar_por)`` com os filtros das listas aplicados.
+
+    ``tarefas`` troca a consulta base (por padrão ``tarefas_para_listagem()``);
+    ``status`` vazio não filtra por status.
+    """
+    tarefas = tarefas_para_listagem() if tarefas is None else tarefas
+    if status:
+        tarefas = tarefas.filter(status=status)
+    tarefas, ordenar_por = buscar_tarefas(tarefas, busca, ordenar_por)
+    if categoria_id:
+        tarefas = tarefas.filter(categoria_id=categoria_id)
+    return tarefas, ordenar_por
@@ -0,0 +1,59 @@
+"""Leitura e reconstrução da tabela ``ContadorTarefas``.
+
+Os contadores são atualizados pelos triggers da migração 0012 na mesma
+instrução que altera a tarefa, então criar, concluir, adiar, mover ou
+excluir já os mantém corretos. Aqui ficam a leitura (em cache, junto com a
+versão das listas) e a reconstrução completa.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from .cache_tarefas import invalidar_tarefas, timeout_cache, versao_tarefas
+from .models import ContadorTarefas, Tarefa
+from .replicas import leitura_em_replica
+
+
+def _instantaneo():
+    chave = f"tarefas:contadores:{versao_tarefas()}"
+    contadores = cache.get(chave)
+    if contadores is None:
+        contadores = {"status": {}, "categorias": {}}
+        for status, categoria_id, total in ContadorTarefas.objects.values_list(
+                "status", "categoria_id", "total"):
+            if categoria_id is None:
+                contadores["status"][status] = total
+            else:
+                contadores["categorias"].setdefault(status, {})[categoria_id] = total
+        if not leitura_em_replica():
+            cache.set(chave, contadores, timeout_cache())
+    return contadores
+
+
+def contagem_por_status():
+    """``{status: total}`` de todas as tarefas."""
+    return _instantaneo()["status"]
+
+
+def contagem_por_categoria(status):
+    """``{categoria_id: total}`` das tarefas com ``status``."""
+    return _instantaneo()["categorias"].get(status, {})
+
+
+def recalcular_contadores():
+    """Reconstrói os contadores a partir de ``COUNT(*)`` nas tarefas."""
+    with transaction.atomic():
+        ContadorTarefas.objects.all().delete()
+        totais = dict(Tarefa.objects.values_list("status").annotate(n=Count("id")).order_by())
+        contadores = [
+            ContadorTarefas(status=status, total=totais.get(status, 0))
+            for status, _ in Tarefa.OPCOES_STATUS
+        ]
+        contadores += [
+            ContadorTarefas(status=status, categoria_id=categoria_id, total=n)
+            for categoria_id, status, n in Tarefa.objects.values_list("categoria_id", "status")
+            .annotate(n=Count("id")).order_by()
+        ]
+        ContadorTarefas.objects.bulk_create(contadores)
+    invalidar_tarefas()
+    return contadores
@@ -0,0 +1,15 @@
+from django.utils.functional import SimpleLazyObject
+
+from .contadores import contagem_por_status
+
+
+def contadores(request):
+    """Totais por status para os badges da barra de navegação."""
+    def totais():
+        por_status = contagem_por_status()
+        return {
+            "pendentes": por_status.get("pendente", 0),
+            "concluidas": por_status.get("concluído", 0),
+            "adiadas": por_status.get("adiado", 0),
+        }
+    return {"contadores": SimpleLazyObject(totais)}
@@ -0,0 +1,114 @@
+"""Geração de tarefas e categorias sintéticas para testes de carga e benchmarks.
+
+As tarefas seguem proporções parecidas com as de uso real: metade pendente,
+datas espalhadas em torno de hoje (as concluídas mais no passado, as
+pendentes mais no futuro), prioridade média mais comum e títulos e
+descrições montados de listas de palavras, para que a busca textual tenha o
+que encontrar. Algumas regras de recorrência completam o calendário. Com a
+mesma ``semente``, os dados saem iguais.
+"""
+import random
+from datetime import date, timedelta
+
+from django.utils import timezone
+
+from .cache_categorias import invalidar_categorias
+from .cache_tarefas import invalidar_tarefas
+from .recorrencias import invalidar_recorrencias
+from .models import Categoria, Recorrencia, Tarefa
+
+
+NOMES_CATEGORIAS = (
+    "Trabalho", "Casa", "Estudos", "Saúde", "Finanças", "Família", "Compras",
+    "Viagens", "Projetos", "Academia", "Leitura", "Carro",
+)
+VERBOS = (
+    "Revisar", "Enviar", "Comprar", "Agendar", "Pagar", "Organizar", "Ligar para",
+    "Preparar", "Estudar", "Limpar", "Responder", "Planejar", "Atualizar",
+)
+OBJETOS = (
+    "relatório", "reunião", "fatura", "dentista", "apresentação", "mercado",
+    "documentos", "orçamento", "e-mails", "garagem", "contrato", "prova",
+    "passagens", "academia", "aniversário", "planilha",
+)
+COMPLEMENTOS = (
+    "antes do prazo", "com a equipe", "da semana", "do mês", "pendente desde ontem",
+    "com calma", "para o cliente", "no fim de semana", "sem falta",
+)
+
+# (valor, peso)
+STATUS = (("pendente", 50), ("concluído", 35), ("adiado", 15))
+PRIORIDADES = (("alta", 25), ("média", 50), ("baixa", 25))
+FREQUENCIAS = (("diaria", 20), ("semanal", 60), ("mensal", 20))
+
+
+def _escolher(rng, opcoes):
+    valores, pesos = zip(*opcoes)
+    return rng.choices(valores, weights=pesos)[0]
+
+
+def gerar_categorias(quantidade, rng):
+    for i in range(quantidade):
+        nome = NOMES_CATEGORIAS[i % len(NOMES_CATEGORIAS)]
+        yield Categoria(nome=nome if i < len(NOMES_CATEGORIAS) else f"{nome} {i // len(NOMES_CATEGORIAS) + 1}")
+
+
+def gerar_tarefas(quantidade, categoria_ids, rng, hoje=None, dias=180):
+    """Itera ``quantidade`` tarefas (não salvas) com datas em ``hoje ± dias``."""
+    hoje = hoje or date.today()
+    for i in range(quantidade):
+        status = _escolher(rng, STATUS)
+        # Concluídas tendem ao passado e pendentes ao futuro
+        deslocamento = {"concluído": -1, "pendente": 1}.get(status, 0)
+        dia = int(rng.triangular(-dias, dias, deslocamento * dias))
+        titulo = f"{rng.choice(VERBOS)} {rng.choice(OBJETOS)}"
+        yield Tarefa(
+            titulo=titulo[:50],
+            descricao=f"{titulo} {rng.choice(COMPLEMENTOS)} (#{i + 1})",
+            data=hoje + timedelta(days=dia),
+            prioridade=_escolher(rng, PRIORIDADES),
+            status=status,
+            categoria_id=rng.choice(categoria_ids),
+        )
+
+
+def gerar_recorrencias(quantidade, categoria_ids, rng, hoje=None, dias=180):
+    """Itera ``quantidade`` regras (não salvas) iniciadas até ``dias`` atrás; a primeira é diária e sem fim."""
+    hoje = hoje or date.today()
+    for i in range(quantidade):
+        frequencia = "diaria" if i == 0 else _escolher(rng, FREQUENCIAS)
+        titulo = f"{rng.choice(VERBOS)} {rng.choice(OBJETOS)}"
+        yield Recorrencia(
+            titulo=titulo[:50],
+            descricao=f"{titulo} {rng.choice(COMPLEMENTOS)} (recorrente #{i + 1})",
+            prioridade=_escolher(rng, PRIORIDADES),
+            categoria_id=rng.choice(categoria_ids),
+            inicio=hoje - timedelta(days=rng.randrange(dias)),
+            frequencia=frequencia,
+            intervalo=1 if i == 0 else rng.choice((1, 1, 2)),
+            ate=None if i == 0 or rng.random() < 0.5 else hoje + timedelta(days=rng.randrange(dias)),
+        )
+
+
+def semear(categorias=10, tarefas=10000, semente=0, dias=180, lote=2000, recorrencias=5):
+    """Cria as categorias, as tarefas e as recorrências com ``bulk_create``; devolve ``(categorias, tarefas)`` criadas."""
+    rng = random.Random(semente)
+    agora = timezone.now()
+    novas = list(gerar_categorias(categorias, rng))
+    for categoria in novas:
+        categoria.atualizado_em = agora  # bulk_create não passa pelo save()
+    criadas = Categoria.objects.bulk_create(novas)
+    invalidar_categorias()
+    ids = [categoria.id for categoria in criadas]
+    geradas = gerar_tarefas(tarefas, ids, rng, dias=dias)
+    total = 0
+    while True:
+        parte = [tarefa for _, tarefa in zip(range(lote), geradas)]
+        if not parte:
+            break
+        Tarefa.objects.bulk_create(parte, batch_size=lote)
+        total += len(parte)
+    Recorrencia.objects.bulk_create(gerar_recorrencias(recorrencias, ids, rng, dias=dias))
+    invalidar_recorrencias()
+    invalidar_tarefas()
+    return len(criadas), total
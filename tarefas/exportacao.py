@@ -0,0 +1,71 @@
+"""Exportação de tarefas em CSV ou NDJSON, em fluxo.
+
+As linhas são lidas com ``values_list().iterator(chunk_size=...)`` e escritas
+em blocos à medida que chegam, sem montar a exportação inteira na memória
+(nem instâncias de modelo): o consumo fica constante com qualquer quantidade
+de tarefas. Usado pela view ``exportar_tarefas`` e pelo comando de mesmo nome.
+"""
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .consultas import consultar_tarefas
+from .models import Tarefa
+
+
+CAMPOS_EXPORTACAO = ("id", "titulo", "descricao", "data", "prioridade", "status", "categoria", "atualizado_em")
+COLUNAS_EXPORTACAO = (
+    "id", "titulo", "descricao", "data", "prioridade", "status", "categoria__nome", "atualizado_em",
+)
+
+FORMATOS = {
+    "csv": ("text/csv; charset=utf-8", "tarefas.csv"),
+    "ndjson": ("application/x-ndjson", "tarefas.ndjson"),
+}
+
+TAMANHO_LOTE = 2000
+
+
+def linhas_exportacao(status="", busca="", categoria_id=None, using=None, chunk_size=TAMANHO_LOTE):
+    """Itera tuplas com os ``CAMPOS_EXPORTACAO`` das tarefas filtradas, por id."""
+    tarefas, _ = consultar_tarefas(status, busca=busca, categoria_id=categoria_id, tarefas=Tarefa.objects.all())
+    if using:
+        tarefas = tarefas.using(using)
+    return tarefas.order_by("id").values_list(*COLUNAS_EXPORTACAO).iterator(chunk_size=chunk_size)
+
+
+class _Eco:
+    """Arquivo falso: ``csv.writer`` devolve a linha formatada em vez de gravá-la."""
+
+    def write(self, valor):
+        return valor
+
+
+def _em_blocos(pedacos, tamanho):
+    bloco = []
+    for pedaco in pedacos:
+        bloco.append(pedaco)
+        if len(bloco) >= tamanho:
+            yield "".join(bloco)
+            bloco = []
+    if bloco:
+        yield "".join(bloco)
+
+
+def _csv(linhas):
+    escritor = csv.writer(_Eco())
+    yield escritor.writerow(CAMPOS_EXPORTACAO)
+    for linha in linhas:
+        yield escritor.writerow(linha)
+
+
+def _ndjson(linhas):
+    codificador = DjangoJSONEncoder(ensure_ascii=False)
+    for linha in linhas:
+        yield codificador.encode(dict(zip(CAMPOS_EXPORTACAO, linha))) + "\n"
+
+
+def exportar(formato, linhas, tamanho_bloco=TAMANHO_LOTE):
+    """Gera o texto da exportação em blocos de ``tamanho_bloco`` linhas."""
+    gerador = _csv if formato == "csv" else _ndjson
+    return _em_blocos(gerador(linhas), tamanho_bloco)
@@ -1,12 +1,45 @@
 from django import forms
+from django.forms.models import ModelChoiceIterator
 from datetime import date
-from .models import Tarefa, Categoria
+from .cache_categorias import listar_categorias
+from .models import Tarefa, Categoria, Recorrencia
+
+
+class OpcoesCategoriaIterator(ModelChoiceIterator):
+    """Opções do select de categoria lidas de ``listar_categorias``, sem consultar o banco."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for categoria in listar_categorias():
+            yield self.choice(categoria)
+
+    def __len__(self):
+        return len(listar_categorias()) + (1 if self.field.empty_label is not None else 0)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(listar_categorias())
+
+
+class CategoriaChoiceField(forms.ModelChoiceField):
+    """``ModelChoiceField`` de categoria que exibe e valida pelas categorias em cache."""
+
+    iterator = OpcoesCategoriaIterator
+
+    def to_python(self, value):
+        if value not in self.empty_values and not isinstance(value, Categoria):
+            categoria = {str(c.pk): c for c in listar_categorias()}.get(str(value))
+            if categoria is not None:
+                return categoria
+        # Categoria fora do cache (ou valor inválido): a validação padrão decide
+        return super().to_python(value)
 
 
 class TarefaForm(forms.ModelForm):
     class Meta:
         model = Tarefa
         fields = ("titulo", "descricao", "data", "prioridade", "categoria")
+        field_classes = {"categoria": CategoriaChoiceField}
         widgets = {
             'data': forms.DateInput(
                 attrs={
@@ -17,6 +50,33 @@ class TarefaForm(forms.ModelForm):
         }
 
 
+class RecorrenciaForm(forms.ModelForm):
+    class Meta:
+        model = Recorrencia
+        fields = (
+            "titulo", "descricao", "prioridade", "categoria",
+            "inicio", "frequencia", "intervalo", "ate", "quantidade",
+        )
+        field_classes = {"categoria": CategoriaChoiceField}
+        labels = {
+            "inicio": "Primeira ocorrência",
+            "intervalo": "A cada (dias, semanas ou meses)",
+            "ate": "Até",
+            "quantidade": "Número de ocorrências",
+        }
+        widgets = {
+            "inicio": forms.DateInput(attrs={"type": "date"}),
+            "ate": forms.DateInput(attrs={"type": "date"}),
+        }
+
+    def clean(self):
+        dados = super().clean()
+        inicio, ate = dados.get("inicio"), dados.get("ate")
+        if inicio and ate and ate < inicio:
+            self.add_error("ate", "A data final deve ser igual ou posterior à primeira ocorrência.")
+        return dados
+
+
 class CategoriaForm(forms.ModelForm):
     class Meta:
         model = Categoria
@@ -0,0 +1,150 @@
+"""Importação em massa de tarefas a partir de CSV ou NDJSON.
+
+O arquivo é lido em fluxo, registro a registro. Cada registro é validado com
+os campos do ``TarefaForm`` (mais ``status``), instanciados uma única vez,
+sem montar um formulário por linha. As categorias são resolvidas pelo nome
+num dicionário em memória, e só para registros sem outros erros. As tarefas
+válidas são inseridas com ``bulk_create`` em lotes, cada lote em sua própria
+transação, junto com as categorias novas que ele usa: um erro no banco
+descarta o lote inteiro, categorias incluídas.
+"""
+import csv
+import json
+import time
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+
+from .cache_categorias import invalidar_categorias
+from .forms import TarefaForm
+from .models import Categoria, Tarefa
+
+
+TAMANHO_LOTE = 1000
+
+
+def _campos_validacao():
+    campos = {nome: campo for nome, campo in TarefaForm.base_fields.items() if nome != "categoria"}
+    campos["status"] = Tarefa._meta.get_field("status").formfield()
+    return campos
+
+
+class ResultadoImportacao:
+    def __init__(self):
+        self.lidas = 0
+        self.importadas = 0
+        self.categorias_criadas = 0
+        self.erros = []  # (número do registro, mensagem)
+        self.segundos = 0.0
+
+    @property
+    def linhas_por_segundo(self):
+        return self.lidas / self.segundos if self.segundos else 0.0
+
+
+def ler_registros(arquivo, formato):
+    """Itera ``(numero, dict)`` do arquivo; registros ilegíveis vêm como ``(numero, ValueError)``."""
+    if formato == "csv":
+        for numero, registro in enumerate(csv.DictReader(arquivo), start=2):
+            yield numero, registro
+        return
+    for numero, linha in enumerate(arquivo, start=1):
+        if not linha.strip():
+            continue
+        try:
+            registro = json.loads(linha)
+        except ValueError as erro:
+            yield numero, ValueError(f"JSON inválido: {erro}")
+            continue
+        if not isinstance(registro, dict):
+            yield numero, ValueError("O registro deve ser um objeto JSON.")
+            continue
+        yield numero, registro
+
+
+class Importador:
+    def __init__(self, tamanho_lote=TAMANHO_LOTE):
+        self.tamanho_lote = tamanho_lote
+        self.campos = _campos_validacao()
+        self.categorias = {}
+        for id_, nome in Categoria.objects.order_by("-id").values_list("id", "nome"):
+            self.categorias[nome] = id_  # com nomes repetidos, fica a categoria mais antiga
+        self.resultado = ResultadoImportacao()
+
+    def _nome_categoria(self, nome):
+        nome = (nome or "").strip()
+        if not nome:
+            raise ValidationError({"categoria": ["Este campo é obrigatório."]})
+        max_length = Categoria._meta.get_field("nome").max_length
+        if nome not in self.categorias and len(nome) > max_length:
+            raise ValidationError({"categoria": [f"Nome com mais de {max_length} caracteres."]})
+        return nome
+
+    def validar(self, registro):
+        """Devolve a ``Tarefa`` (não salva) do registro ou levanta ``ValidationError``.
+
+        Categorias que ainda não existem vêm como ``Categoria`` não salva;
+        ``_gravar`` as cria com o lote.
+        """
+        dados, erros = {}, {}
+        for nome, campo in self.campos.items():
+            valor = registro.get(nome)
+            if valor in (None, "") and nome in ("prioridade", "status"):
+                valor = Tarefa._meta.get_field(nome).default
+            try:
+                dados[nome] = campo.clean(valor)
+            except ValidationError as erro:
+                erros[nome] = erro.messages
+        try:
+            nome_categoria = self._nome_categoria(registro.get("categoria"))
+        except ValidationError as erro:
+            erros.update(erro.message_dict)
+        if erros:
+            raise ValidationError(erros)
+        if nome_categoria in self.categorias:
+            return Tarefa(categoria_id=self.categorias[nome_categoria], **dados)
+        return Tarefa(categoria=Categoria(nome=nome_categoria), **dados)
+
+    def _gravar(self, lote):
+        numeros = [numero for numero, _ in lote]
+        tarefas = [tarefa for _, tarefa in lote]
+        # Só as tarefas sem categoria_id têm uma Categoria nova (não salva) em cache
+        nomes = list(dict.fromkeys(tarefa.categoria.nome for tarefa in tarefas if tarefa.categoria_id is None))
+        try:
+            with transaction.atomic():
+                criadas = {}
+                if nomes:
+                    novas = Categoria.objects.bulk_create([Categoria(nome=nome) for nome in nomes])
+                    criadas = {categoria.nome: categoria for categoria in novas}
+                    invalidar_categorias()
+                for tarefa in tarefas:
+                    if tarefa.categoria_id is None:
+                        tarefa.categoria = criadas[tarefa.categoria.nome]
+                Tarefa.objects.bulk_create(tarefas, batch_size=self.tamanho_lote)
+        except DatabaseError as erro:
+            self.resultado.erros.append((numeros[0], f"lote até o registro {numeros[-1]} descartado: {erro}"))
+            return
+        self.categorias.update((nome, categoria.id) for nome, categoria in criadas.items())
+        self.resultado.categorias_criadas += len(criadas)
+        self.resultado.importadas += len(lote)
+
+    def importar(self, registros):
+        inicio = time.monotonic()
+        lote = []
+        for numero, registro in registros:
+            self.resultado.lidas += 1
+            if isinstance(registro, Exception):
+                self.resultado.erros.append((numero, str(registro)))
+                continue
+            try:
+                lote.append((numero, self.validar(registro)))
+            except ValidationError as erro:
+                mensagens = "; ".join(f"{campo}: {' '.join(msgs)}" for campo, msgs in erro.message_dict.items())
+                self.resultado.erros.append((numero, mensagens))
+            if len(lote) >= self.tamanho_lote:
+                self._gravar(lote)
+                lote = []
+        if lote:
+            self._gravar(lote)
+        self.resultado.segundos = time.monotonic() - inicio
+        return self.resultado
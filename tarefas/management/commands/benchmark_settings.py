@@ -0,0 +1,103 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+
+AMBIENTES = ("desenvolvimento", "producao")
+
+
+def _urls():
+    return (
+        reverse("tarefas_pendentes_list"),
+        reverse("tarefas_concluidas_list"),
+        reverse("calendario_mensal"),
+        reverse("adicionar_tarefa"),
+    )
+
+
+def _preparar(quantidade):
+    from tarefas.dados_sinteticos import semear
+
+    call_command("migrate", verbosity=0)
+    semear(categorias=5, tarefas=quantidade)
+
+
+def _medir(requisicoes):
+    """Requisições/s e bytes da resposta de cada URL, pelo handler WSGI completo (middlewares incluídos)."""
+    from django.test import Client
+
+    cliente = Client(HTTP_HOST="localhost", HTTP_ACCEPT_ENCODING="gzip")
+    resultado = {}
+    for url in _urls():
+        resposta = cliente.get(url)  # aquecimento: templates, cache e conexão
+        if resposta.status_code != 200:
+            raise CommandError(f"{url} respondeu {resposta.status_code}")
+        inicio = time.perf_counter()
+        for _ in range(requisicoes):
+            cliente.get(url)
+        resultado[url] = {
+            "rps": requisicoes / (time.perf_counter() - inicio),
+            "bytes": len(resposta.content),
+        }
+    return resultado
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara requisições/s das páginas principais com as settings de "
+        "desenvolvimento (settings.py) e de produção (settings_producao.py), "
+        "cada uma num processo próprio, sobre um banco temporário."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requisicoes", type=int, default=200, help="Requisições medidas por URL")
+        parser.add_argument("--tarefas", type=int, default=500, help="Tarefas no banco temporário")
+        # Etapas executadas nos processos filhos
+        parser.add_argument("--etapa", choices=("preparar", "medir"), help=argparse.SUPPRESS)
+
+    def _filho(self, etapa, ambiente, banco, options):
+        env = {**os.environ, "AMBIENTE": ambiente, "DB_NOME": banco}
+        env.pop("DJANGO_SETTINGS_MODULE", None)
+        comando = [
+            sys.executable, str(settings.BASE_DIR / "manage.py"), "benchmark_settings", "--etapa", etapa,
+            "--requisicoes", str(options["requisicoes"]), "--tarefas", str(options["tarefas"]),
+        ]
+        processo = subprocess.run(comando, env=env, capture_output=True, text=True)
+        if processo.returncode != 0:
+            raise CommandError(f"Falha em {etapa} ({ambiente}):\n{processo.stderr}")
+        return processo.stdout
+
+    def handle(self, *args, **options):
+        if options["etapa"] == "preparar":
+            _preparar(options["tarefas"])
+            return
+        if options["etapa"] == "medir":
+            self.stdout.write(json.dumps(_medir(options["requisicoes"])))
+            return
+
+        resultados = {}
+        with tempfile.TemporaryDirectory() as pasta:
+            banco = os.path.join(pasta, "benchmark.sqlite3")
+            self._filho("preparar", "desenvolvimento", banco, options)
+            for ambiente in AMBIENTES:
+                resultados[ambiente] = json.loads(self._filho("medir", ambiente, banco, options).splitlines()[-1])
+
+        self.stdout.write(
+            f"{'URL':<30}" + "".join(f"{ambiente:>24}" for ambiente in AMBIENTES) + f"{'ganho':>9}"
+        )
+        for url in resultados[AMBIENTES[0]]:
+            medidas = [resultados[ambiente][url] for ambiente in AMBIENTES]
+            self.stdout.write(
+                f"{url:<30}"
+                + "".join(f"{m['rps']:>10.1f} r/s {m['bytes'] / 1024:>7.1f} KB" for m in medidas)
+                + f"{medidas[1]['rps'] / medidas[0]['rps']:>8.2f}x"
+            )
@@ -0,0 +1,129 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from tarefas.benchmark import comparar, medir_urls
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede todas as URLs de tarefas/urls.py pelo cliente de testes, num banco "
+        "temporário preenchido como o seed_tarefas: percentis de latência, "
+        "consultas por requisição e pico de memória. Grava o resultado em JSON "
+        "(--saida) e, com --baseline, falha se houver regressões."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tarefas", type=int, default=10000)
+        parser.add_argument("--categorias", type=int, default=10)
+        parser.add_argument("--requisicoes", type=int, default=30, help="Requisições medidas por URL")
+        parser.add_argument("--frio", action="store_true", help="Limpa os caches antes de cada requisição")
+        parser.add_argument("--url", action="append", dest="nomes", help="Só esta URL (nome); pode repetir")
+        parser.add_argument("--saida", help="Arquivo JSON para gravar o resultado")
+        parser.add_argument("--baseline", help="Resultado JSON anterior para comparar")
+        parser.add_argument("--tolerancia", type=float, default=0.25, help="Piora aceita em latência e memória")
+        # Etapa executada no processo filho, com o banco temporário
+        parser.add_argument("--etapa", choices=("medir",), help=argparse.SUPPRESS)
+
+    def _medir(self, options):
+        from django.test import Client
+
+        from tarefas.dados_sinteticos import semear
+
+        call_command("migrate", verbosity=0)
+        semear(options["categorias"], options["tarefas"])
+        try:
+            urls = medir_urls(
+                Client(HTTP_HOST="localhost"), options["requisicoes"],
+                frio=options["frio"], nomes=options["nomes"],
+            )
+        except ValueError as erro:
+            raise CommandError(str(erro))
+        return {
+            "meta": {
+                "data": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "settings": os.environ.get("DJANGO_SETTINGS_MODULE"),
+                "tarefas": options["tarefas"],
+                "categorias": options["categorias"],
+                "requisicoes": options["requisicoes"],
+                "frio": options["frio"],
+                # ru_maxrss vem em KB no Linux
+                "pico_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            },
+            "urls": urls,
+        }
+
+    def _filho(self, options):
+        with tempfile.TemporaryDirectory() as pasta:
+            env = {**os.environ, "DB_NOME": os.path.join(pasta, "benchmark.sqlite3")}
+            env.pop("DJANGO_SETTINGS_MODULE", None)
+            comando = [
+                sys.executable, str(settings.BASE_DIR / "manage.py"), "benchmark_tarefas", "--etapa", "medir",
+                "--tarefas", str(options["tarefas"]), "--categorias", str(options["categorias"]),
+                "--requisicoes", str(options["requisicoes"]),
+            ]
+            if options["frio"]:
+                comando.append("--frio")
+            for nome in options["nomes"] or ():
+                comando += ["--url", nome]
+            processo = subprocess.run(comando, env=env, capture_output=True, text=True)
+        if processo.returncode != 0:
+            raise CommandError(f"Falha no benchmark:\n{processo.stderr}")
+        return json.loads(processo.stdout.splitlines()[-1])
+
+    def handle(self, *args, **options):
+        if options["requisicoes"] < 1:
+            raise CommandError("--requisicoes deve ser ao menos 1.")
+        if options["etapa"] == "medir":
+            self.stdout.write(json.dumps(self._medir(options)))
+            return
+
+        base = None
+        if options["baseline"]:
+            try:
+                with open(options["baseline"], encoding="utf-8") as arquivo:
+                    base = json.load(arquivo)
+            except (OSError, ValueError) as erro:
+                raise CommandError(f"Não foi possível ler {options['baseline']}: {erro}")
+
+        resultado = self._filho(options)
+        if options["saida"]:
+            with open(options["saida"], "w", encoding="utf-8") as arquivo:
+                json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+
+        self.stdout.write(
+            f"{'URL':<24}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'consultas':>11}{'memória KB':>12}  status"
+        )
+        for nome, medidas in resultado["urls"].items():
+            if "erro" in medidas:
+                self.stdout.write(self.style.WARNING(f"{nome:<24}{medidas['erro']}"))
+                continue
+            self.stdout.write(
+                f"{nome:<24}{medidas['p50_ms']:>9.2f}{medidas['p95_ms']:>9.2f}{medidas['p99_ms']:>9.2f}"
+                f"{medidas['consultas']:>11.1f}{medidas['pico_memoria_kb']:>12.1f}  "
+                + ",".join(str(codigo) for codigo in medidas["status"])
+            )
+        self.stdout.write(f"Pico de RSS do processo: {resultado['meta']['pico_rss_kb'] / 1024:.1f} MB")
+
+        if base is None:
+            return
+        regressoes = comparar(resultado["urls"], base["urls"], options["tolerancia"])
+        if not regressoes:
+            self.stdout.write(self.style.SUCCESS("Sem regressões em relação ao baseline."))
+            return
+        for nome, metrica, antes, depois in regressoes:
+            self.stderr.write(f"{nome}: {metrica} {antes} -> {depois}")
+        raise CommandError(f"{len(regressoes)} regressão(ões) em relação ao baseline.")
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from tarefas.cache_respostas import estatisticas_respostas, zerar_estatisticas
+
+
+class Command(BaseCommand):
+    help = (
+        "Mostra os acertos e falhas do cache de páginas das listas e do "
+        "calendário. Com o cache em memória (padrão), os contadores são do "
+        "processo; com CACHE_RESPOSTAS_DIR, de todos os processos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--zerar", action="store_true", help="Zera os contadores depois de mostrar")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'view':<26}{'acertos':>10}{'falhas':>10}{'taxa':>8}")
+        for nome, contadores in estatisticas_respostas().items():
+            total = contadores["acertos"] + contadores["falhas"]
+            taxa = f"{contadores['acertos'] / total:.0%}" if total else "-"
+            self.stdout.write(f"{nome:<26}{contadores['acertos']:>10}{contadores['falhas']:>10}{taxa:>8}")
+        if options["zerar"]:
+            zerar_estatisticas()
+            self.stdout.write(self.style.SUCCESS("Contadores zerados."))
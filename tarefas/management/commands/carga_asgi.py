@@ -0,0 +1,180 @@
+import argparse
+import asyncio
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from .benchmark_settings import _preparar
+
+
+SERVIDORES = {
+    "uvicorn": lambda porta: [
+        "-m", "uvicorn", "dia_organizado.asgi:application",
+        "--port", str(porta), "--log-level", "warning", "--no-access-log",
+    ],
+    "daphne": lambda porta: ["-m", "daphne", "-p", str(porta), "dia_organizado.asgi:application"],
+}
+
+# Valor de TAREFAS_VIEWS_ASSINCRONAS de cada rodada
+MODOS = (("síncronas", "false"), ("assíncronas", "true"))
+
+
+def _urls():
+    return (reverse("tarefas_pendentes_list"), reverse("calendario_mensal"))
+
+
+async def _get(reader, writer, host, caminho):
+    """Um GET HTTP/1.1 numa conexão keep-alive; devolve o status."""
+    writer.write(f"GET {caminho} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    tamanho, em_partes = 0, False
+    while (linha := await reader.readline()) not in (b"\r\n", b""):
+        nome, _, valor = linha.decode("latin-1").partition(":")
+        nome = nome.strip().lower()
+        if nome == "content-length":
+            tamanho = int(valor)
+        elif nome == "transfer-encoding" and "chunked" in valor.lower():
+            em_partes = True
+    if not em_partes:
+        await reader.readexactly(tamanho)
+        return status
+    while True:
+        parte = int((await reader.readline()).split(b";")[0], 16)
+        await reader.readexactly(parte + 2)
+        if not parte:
+            return status
+
+
+async def executar_carga(host, porta, caminho, conexoes, requisicoes):
+    """Faz ``requisicoes`` GETs em ``caminho`` por ``conexoes`` conexões simultâneas.
+
+    Devolve ``(latências em segundos, erros, duração total)``.
+    """
+    latencias, erros = [], []
+    restantes = iter(range(requisicoes))
+
+    async def conexao():
+        reader, writer = await asyncio.open_connection(host, porta)
+        try:
+            for _ in restantes:
+                inicio = time.perf_counter()
+                status = await _get(reader, writer, f"{host}:{porta}", caminho)
+                latencias.append(time.perf_counter() - inicio)
+                if status != 200:
+                    erros.append(status)
+        finally:
+            writer.close()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(conexao() for _ in range(conexoes)))
+    return latencias, erros, time.perf_counter() - inicio
+
+
+def _percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _aguardar_servidor(porta, processo, limite=30):
+    fim = time.monotonic() + limite
+    while time.monotonic() < fim:
+        if processo.poll() is not None:
+            raise CommandError(f"O servidor terminou ao iniciar:\n{processo.stderr.read()}")
+        try:
+            socket.create_connection(("127.0.0.1", porta), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise CommandError("O servidor não respondeu a tempo.")
+
+
+class Command(BaseCommand):
+    help = (
+        "Teste de carga das listas e do calendário sob ASGI: sobe o servidor "
+        "(uvicorn ou daphne) com as settings de produção sobre um banco "
+        "temporário, uma vez com as views síncronas e outra com as assíncronas, "
+        "e mede a latência com muitas conexões simultâneas. Com --url, mede "
+        "um servidor já em execução."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--conexoes", type=int, default=100, help="Conexões simultâneas")
+        parser.add_argument("--requisicoes", type=int, default=2000, help="Requisições por URL")
+        parser.add_argument("--tarefas", type=int, default=500, help="Tarefas no banco temporário")
+        parser.add_argument("--servidor", choices=sorted(SERVIDORES), default="uvicorn")
+        parser.add_argument("--url", help="Servidor já em execução, por exemplo http://127.0.0.1:8000")
+        # Etapa executada num processo filho, com o banco temporário
+        parser.add_argument("--etapa", choices=("preparar",), help=argparse.SUPPRESS)
+
+    def _medir(self, host, porta, rotulo, options):
+        for caminho in _urls():
+            latencias, erros, segundos = asyncio.run(executar_carga(
+                host, porta, caminho, options["conexoes"], options["requisicoes"],
+            ))
+            self.stdout.write(
+                f"{rotulo:<12} {caminho:<24} {len(latencias) / segundos:>8.1f} r/s"
+                f"  p50 {_percentil(latencias, 0.50) * 1000:>7.1f} ms"
+                f"  p95 {_percentil(latencias, 0.95) * 1000:>7.1f} ms"
+                f"  p99 {_percentil(latencias, 0.99) * 1000:>7.1f} ms"
+                f"  máx {max(latencias) * 1000:>7.1f} ms"
+                f"  erros {len(erros)}"
+            )
+
+    def _rodada(self, rotulo, assincronas, banco, options):
+        porta = _porta_livre()
+        env = {
+            **os.environ, "AMBIENTE": "producao", "DB_NOME": banco,
+            "TAREFAS_VIEWS_ASSINCRONAS": assincronas,
+        }
+        env.pop("DJANGO_SETTINGS_MODULE", None)
+        processo = subprocess.Popen(
+            [sys.executable, *SERVIDORES[options["servidor"]](porta)],
+            cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        try:
+            _aguardar_servidor(porta, processo)
+            self._medir("127.0.0.1", porta, rotulo, options)
+        finally:
+            processo.terminate()
+            processo.wait()
+
+    def handle(self, *args, **options):
+        if options["etapa"] == "preparar":
+            _preparar(options["tarefas"])
+            return
+        if options["url"]:
+            destino = urlsplit(options["url"])
+            self._medir(destino.hostname, destino.port or 80, destino.netloc, options)
+            return
+        if importlib.util.find_spec(options["servidor"]) is None:
+            raise CommandError(f"{options['servidor']} não está instalado.")
+
+        with tempfile.TemporaryDirectory() as pasta:
+            banco = os.path.join(pasta, "carga.sqlite3")
+            env = {**os.environ, "DB_NOME": banco}
+            env.pop("DJANGO_SETTINGS_MODULE", None)
+            preparo = subprocess.run(
+                [sys.executable, str(settings.BASE_DIR / "manage.py"), "carga_asgi",
+                 "--etapa", "preparar", "--tarefas", str(options["tarefas"])],
+                env=env, capture_output=True, text=True,
+            )
+            if preparo.returncode != 0:
+                raise CommandError(f"Falha ao preparar o banco:\n{preparo.stderr}")
+            for rotulo, assincronas in MODOS:
+                self._rodada(rotulo, assincronas, banco, options)
@@ -0,0 +1,140 @@
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from tarefas.sqlite import PRAGMAS_PRODUCAO, aplicar_pragmas, timeout_lock
+
+
+# Perfil padrão do SQLite (journal DELETE, synchronous FULL). Os dois perfis
+# esperam pelo lock o mesmo tempo (timeout_lock), para que a comparação meça
+# só o efeito do journal/PRAGMAs
+PRAGMAS_PADRAO = {}
+
+STATUS = ("pendente", "concluído", "adiado")
+
+
+def _conectar(caminho, pragmas):
+    conexao = sqlite3.connect(caminho, timeout=timeout_lock(), isolation_level=None, check_same_thread=False)
+    aplicar_pragmas(conexao.cursor(), pragmas)
+    return conexao
+
+
+def _preparar(caminho, pragmas, linhas):
+    conexao = sqlite3.connect(caminho, isolation_level=None)
+    aplicar_pragmas(conexao.cursor(), pragmas)
+    conexao.executescript("""
+        CREATE TABLE tarefa (
+            id INTEGER PRIMARY KEY, titulo TEXT, data TEXT, prioridade TEXT, status TEXT
+        );
+        CREATE INDEX tarefa_status_data ON tarefa (status, data, prioridade);
+    """)
+    conexao.execute("BEGIN")
+    conexao.executemany(
+        "INSERT INTO tarefa (titulo, data, prioridade, status) VALUES (?, ?, 'média', ?)",
+        ((f"Tarefa {i}", f"2030-01-{1 + i % 28:02d}", STATUS[i % 3]) for i in range(linhas)),
+    )
+    conexao.execute("COMMIT")
+    conexao.close()
+
+
+def executar_carga(pragmas, escritores=4, leitores=8, duracao=3.0, linhas=5000):
+    """Roda escritores e leitores concorrentes num banco temporário.
+
+    Devolve ``{"escritas": n, "leituras": n, "erros": n, "segundos": s}``.
+    """
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "estresse.sqlite3")
+        _preparar(caminho, pragmas, linhas)
+        totais = {"escritas": 0, "leituras": 0, "erros": 0}
+        trava = threading.Lock()
+        fim = time.monotonic() + duracao
+
+        def escrever():
+            conexao = _conectar(caminho, pragmas)
+            n = erros = 0
+            while time.monotonic() < fim:
+                try:
+                    conexao.execute("BEGIN IMMEDIATE")
+                    conexao.execute(
+                        "INSERT INTO tarefa (titulo, data, prioridade, status) "
+                        "VALUES ('Nova', '2030-01-15', 'alta', 'pendente')"
+                    )
+                    conexao.execute(
+                        "UPDATE tarefa SET status = ? WHERE id = ?",
+                        (random.choice(STATUS), random.randint(1, linhas)),
+                    )
+                    conexao.execute("COMMIT")
+                    n += 1
+                except sqlite3.OperationalError:
+                    erros += 1
+                    if conexao.in_transaction:
+                        conexao.execute("ROLLBACK")
+            conexao.close()
+            with trava:
+                totais["escritas"] += n
+                totais["erros"] += erros
+
+        def ler():
+            conexao = _conectar(caminho, pragmas)
+            n = erros = 0
+            while time.monotonic() < fim:
+                try:
+                    conexao.execute(
+                        "SELECT id, titulo, data FROM tarefa WHERE status = ? "
+                        "ORDER BY data, prioridade LIMIT 50",
+                        (random.choice(STATUS),),
+                    ).fetchall()
+                    n += 1
+                except sqlite3.OperationalError:
+                    erros += 1
+            conexao.close()
+            with trava:
+                totais["leituras"] += n
+                totais["erros"] += erros
+
+        threads = [threading.Thread(target=escrever) for _ in range(escritores)]
+        threads += [threading.Thread(target=ler) for _ in range(leitores)]
+        inicio = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        totais["segundos"] = time.monotonic() - inicio
+        return totais
+
+
+def _vazao(resultado):
+    return (resultado["escritas"] + resultado["leituras"]) / resultado["segundos"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara a vazão de leituras/escritas concorrentes no SQLite com o perfil "
+        "padrão e com o perfil de produção (WAL e PRAGMAs de tarefas/sqlite.py)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--escritores", type=int, default=4)
+        parser.add_argument("--leitores", type=int, default=8)
+        parser.add_argument("--duracao", type=float, default=3.0, help="Segundos por perfil")
+        parser.add_argument("--linhas", type=int, default=5000, help="Tarefas iniciais")
+
+    def handle(self, *args, **options):
+        parametros = {chave: options[chave] for chave in ("escritores", "leitores", "duracao", "linhas")}
+        resultados = {}
+        for nome, pragmas in (("padrao", PRAGMAS_PADRAO), ("producao", PRAGMAS_PRODUCAO)):
+            r = executar_carga(pragmas, **parametros)
+            resultados[nome] = r
+            self.stdout.write(
+                f"{nome:<9} escritas/s={r['escritas'] / r['segundos']:>9.1f} "
+                f"leituras/s={r['leituras'] / r['segundos']:>9.1f} erros={r['erros']}"
+            )
+
+        padrao, producao = (_vazao(resultados[nome]) for nome in ("padrao", "producao"))
+        if padrao:
+            self.stdout.write(self.style.SUCCESS(f"Ganho de vazão total: {producao / padrao:.2f}x"))
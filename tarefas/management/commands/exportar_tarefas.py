@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from tarefas.exportacao import FORMATOS, TAMANHO_LOTE, exportar, linhas_exportacao
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta as tarefas (todas, por padrão) em CSV ou NDJSON, em fluxo e "
+        "com memória constante. Aceita os mesmos filtros das listas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--formato", choices=sorted(FORMATOS), default="csv")
+        parser.add_argument("--status", default="", help="pendente, concluído ou adiado")
+        parser.add_argument("--categoria", type=int, help="Id da categoria")
+        parser.add_argument("--q", default="", help="Busca textual")
+        parser.add_argument("--saida", help="Arquivo de destino (padrão: saída padrão)")
+        parser.add_argument("--chunk-size", type=int, default=TAMANHO_LOTE, help="Linhas por leitura no banco")
+
+    def handle(self, *args, **options):
+        linhas = linhas_exportacao(
+            options["status"],
+            busca=" ".join(options["q"].split()),
+            categoria_id=options["categoria"],
+            chunk_size=options["chunk_size"],
+        )
+        blocos = exportar(options["formato"], linhas, options["chunk_size"])
+        if not options["saida"]:
+            for bloco in blocos:
+                self.stdout.write(bloco, ending="")
+            return
+        with open(options["saida"], "w", encoding="utf-8", newline="") as arquivo:
+            for bloco in blocos:
+                arquivo.write(bloco)
+        self.stderr.write(self.style.SUCCESS(f"Exportação gravada em {options['saida']}."))
@@ -0,0 +1,52 @@
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tarefas.importacao import TAMANHO_LOTE, Importador, ler_registros
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa tarefas de um arquivo CSV ou NDJSON (uma tarefa por linha, com "
+        "titulo, descricao, data, prioridade, status e o nome da categoria). "
+        "Categorias inexistentes são criadas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("arquivo", help='Caminho do arquivo, ou "-" para a entrada padrão')
+        parser.add_argument("--formato", choices=("csv", "ndjson"), help="Padrão: pela extensão do arquivo")
+        parser.add_argument("--lote", type=int, default=TAMANHO_LOTE, help="Tarefas por transação")
+
+    def _formato(self, options):
+        if options["formato"]:
+            return options["formato"]
+        extensao = os.path.splitext(options["arquivo"])[1].lower()
+        if extensao == ".csv":
+            return "csv"
+        if extensao in (".ndjson", ".jsonl"):
+            return "ndjson"
+        raise CommandError("Não foi possível deduzir o formato; use --formato csv ou ndjson.")
+
+    def handle(self, *args, **options):
+        formato = self._formato(options)
+        importador = Importador(tamanho_lote=options["lote"])
+        if options["arquivo"] == "-":
+            resultado = importador.importar(ler_registros(sys.stdin, formato))
+        else:
+            try:
+                arquivo = open(options["arquivo"], encoding="utf-8-sig", newline="")
+            except OSError as erro:
+                raise CommandError(f"Não foi possível abrir {options['arquivo']}: {erro}")
+            with arquivo:
+                resultado = importador.importar(ler_registros(arquivo, formato))
+
+        for numero, mensagem in resultado.erros:
+            self.stderr.write(f"registro {numero}: {mensagem}")
+        self.stdout.write(
+            f"{resultado.importadas} de {resultado.lidas} tarefa(s) importada(s), "
+            f"{len(resultado.erros)} erro(s), {resultado.categorias_criadas} categoria(s) criada(s)."
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado.linhas_por_segundo:.0f} linhas/s ({resultado.segundos:.2f}s)"
+        ))
@@ -0,0 +1,46 @@
+import glob
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tarefas.perfil import agregado, ler_gravados
+
+
+class Command(BaseCommand):
+    help = (
+        "Mostra o agregado por URL do perfil das requisições (TAREFAS_PERFIL): "
+        "tempo total, SQL, consultas, duplicadas, templates e Python, das "
+        "últimas requisições gravadas por cada processo do servidor."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--json", action="store_true", help="Saída em JSON")
+        parser.add_argument("--limpar", action="store_true", help="Apaga os agregados gravados")
+
+    def handle(self, *args, **options):
+        if options["limpar"]:
+            arquivos = glob.glob(os.path.join(settings.TAREFAS_PERFIL_DIR, "perfil-*.json"))
+            for caminho in arquivos:
+                os.remove(caminho)
+            self.stdout.write(self.style.SUCCESS(f"{len(arquivos)} arquivo(s) apagado(s)."))
+            return
+
+        resumo = agregado(ler_gravados())
+        if options["json"]:
+            self.stdout.write(json.dumps(resumo, indent=2, ensure_ascii=False))
+            return
+        if not resumo:
+            self.stdout.write(f"Nenhum perfil gravado em {settings.TAREFAS_PERFIL_DIR}.")
+            return
+        self.stdout.write(
+            f"{'URL':<26}{'n':>6}{'total':>9}{'p95':>9}{'sql':>8}{'consultas':>11}"
+            f"{'duplic.':>9}{'templates':>11}{'python':>9}   (ms)"
+        )
+        for url, linha in sorted(resumo.items(), key=lambda item: -item[1]["total_ms_media"]):
+            self.stdout.write(
+                f"{url:<26}{linha['requisicoes']:>6}{linha['total_ms_media']:>9.1f}{linha['total_ms_p95']:>9.1f}"
+                f"{linha['sql_ms_media']:>8.1f}{linha['consultas_media']:>11.1f}{linha['duplicadas_media']:>9.1f}"
+                f"{linha['template_ms_media']:>11.1f}{linha['python_ms_media']:>9.1f}"
+            )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from tarefas.contadores import contagem_por_status, recalcular_contadores
+
+
+class Command(BaseCommand):
+    help = "Reconstrói os contadores de tarefas por status e por categoria"
+
+    def handle(self, *args, **options):
+        contadores = recalcular_contadores()
+        for status, total in sorted(contagem_por_status().items()):
+            self.stdout.write(f"{status}: {total}")
+        self.stdout.write(self.style.SUCCESS(f"{len(contadores)} contadores reconstruídos."))
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from tarefas.dados_sinteticos import semear
+from tarefas.models import Categoria, Tarefa
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera categorias, tarefas e recorrências sintéticas com bulk_create "
+        "(status, datas e prioridades distribuídos como em uso real), para "
+        "testes de carga e benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--categorias", type=int, default=10)
+        parser.add_argument("--tarefas", type=int, default=10000)
+        parser.add_argument("--recorrencias", type=int, default=5, help="Regras de tarefas recorrentes")
+        parser.add_argument("--dias", type=int, default=180, help="Datas entre hoje - dias e hoje + dias")
+        parser.add_argument("--semente", type=int, default=0, help="Mesma semente, mesmos dados")
+        parser.add_argument("--lote", type=int, default=2000, help="Tarefas por bulk_create")
+        parser.add_argument("--limpar", action="store_true", help="Apaga as tarefas e categorias existentes antes")
+
+    def handle(self, *args, **options):
+        if options["categorias"] < 1:
+            raise CommandError("É preciso ao menos uma categoria.")
+        inicio = time.monotonic()
+        with transaction.atomic():
+            if options["limpar"]:
+                Tarefa.objects.all().delete()
+                Categoria.objects.all().delete()
+            categorias, tarefas = semear(
+                options["categorias"], options["tarefas"],
+                semente=options["semente"], dias=options["dias"], lote=options["lote"],
+                recorrencias=options["recorrencias"],
+            )
+        segundos = time.monotonic() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f"{categorias} categoria(s), {tarefas} tarefa(s) e {options['recorrencias']} recorrência(s) "
+            f"criadas em {segundos:.1f}s "
+            f"({tarefas / segundos if segundos else 0:.0f} tarefas/s)."
+        ))
@@ -0,0 +1,43 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from tarefas.replicas import replicas_leitura
+
+
+def copiar_sqlite(origem, caminho):
+    """Copia o banco da conexão ``sqlite3`` ``origem`` para o arquivo ``caminho``.
+
+    Usa a API de backup do SQLite, que copia uma imagem consistente mesmo com
+    o primário em uso.
+    """
+    destino = sqlite3.connect(caminho)
+    try:
+        origem.backup(destino)
+    finally:
+        destino.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Copia o banco SQLite primário para os arquivos das réplicas de leitura "
+        "(DB_REPLICAS), para testar o roteamento localmente. Em bancos com "
+        "replicação própria (PostgreSQL etc.) use a replicação do servidor."
+    )
+
+    def handle(self, *args, **options):
+        replicas = replicas_leitura()
+        if not replicas:
+            self.stdout.write("Nenhuma réplica configurada (DB_REPLICAS).")
+            return
+        primario = connections["default"]
+        for alias in replicas:
+            if primario.vendor != "sqlite" or connections[alias].vendor != "sqlite":
+                raise CommandError("sincronizar_replicas só copia bancos SQLite.")
+            caminho = settings.DATABASES[alias]["NAME"]
+            primario.ensure_connection()
+            copiar_sqlite(primario.connection, caminho)
+            self.stdout.write(f"{alias}: {caminho}")
+        self.stdout.write(self.style.SUCCESS(f"{len(replicas)} réplica(s) sincronizada(s)."))
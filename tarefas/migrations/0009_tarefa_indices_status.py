@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-18 02:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tarefas', '0008_alter_tarefa_categoria'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tarefa',
+            index=models.Index(fields=['status', 'data', 'prioridade'], name='tarefa_status_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarefa',
+            index=models.Index(fields=['status', 'categoria', 'data', 'prioridade'], name='tarefa_status_cat_data_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-18 02:09
+
+from django.db import migrations, models
+
+
+RANK_PRIORIDADE = {"alta": 1, "média": 2, "baixa": 3}
+
+
+def preencher_prioridade_rank(apps, schema_editor):
+    Tarefa = apps.get_model("tarefas", "Tarefa")
+    for prioridade, rank in RANK_PRIORIDADE.items():
+        Tarefa.objects.filter(prioridade=prioridade).update(prioridade_rank=rank)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tarefas', '0009_tarefa_indices_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tarefa',
+            name='prioridade_rank',
+            field=models.PositiveSmallIntegerField(default=2, editable=False),
+        ),
+        migrations.RunPython(preencher_prioridade_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='tarefa',
+            index=models.Index(fields=['status', 'prioridade_rank', 'data'], name='tarefa_status_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,132 @@
+from django.db import migrations, transaction
+from django.db.utils import DatabaseError
+
+
+# SQLite: tabela virtual FTS5 com uma linha por tarefa (rowid = id da tarefa)
+SQLITE_CRIAR = [
+    """
+    CREATE VIRTUAL TABLE tarefas_tarefa_fts USING fts5(
+        titulo, descricao, categoria, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER tarefas_tarefa_fts_insert AFTER INSERT ON tarefas_tarefa BEGIN
+        INSERT INTO tarefas_tarefa_fts (rowid, titulo, descricao, categoria)
+        SELECT NEW.id, NEW.titulo, NEW.descricao, nome
+        FROM tarefas_categoria WHERE id = NEW.categoria_id;
+    END
+    """,
+    """
+    CREATE TRIGGER tarefas_tarefa_fts_update
+    AFTER UPDATE OF titulo, descricao, categoria_id ON tarefas_tarefa BEGIN
+        DELETE FROM tarefas_tarefa_fts WHERE rowid = OLD.id;
+        INSERT INTO tarefas_tarefa_fts (rowid, titulo, descricao, categoria)
+        SELECT NEW.id, NEW.titulo, NEW.descricao, nome
+        FROM tarefas_categoria WHERE id = NEW.categoria_id;
+    END
+    """,
+    """
+    CREATE TRIGGER tarefas_tarefa_fts_delete AFTER DELETE ON tarefas_tarefa BEGIN
+        DELETE FROM tarefas_tarefa_fts WHERE rowid = OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER tarefas_categoria_fts_update AFTER UPDATE OF nome ON tarefas_categoria BEGIN
+        UPDATE tarefas_tarefa_fts SET categoria = NEW.nome
+        WHERE rowid IN (SELECT id FROM tarefas_tarefa WHERE categoria_id = NEW.id);
+    END
+    """,
+    """
+    INSERT INTO tarefas_tarefa_fts (rowid, titulo, descricao, categoria)
+    SELECT t.id, t.titulo, t.descricao, c.nome
+    FROM tarefas_tarefa t JOIN tarefas_categoria c ON c.id = t.categoria_id
+    """,
+]
+
+SQLITE_REMOVER = [
+    "DROP TRIGGER IF EXISTS tarefas_categoria_fts_update",
+    "DROP TRIGGER IF EXISTS tarefas_tarefa_fts_delete",
+    "DROP TRIGGER IF EXISTS tarefas_tarefa_fts_update",
+    "DROP TRIGGER IF EXISTS tarefas_tarefa_fts_insert",
+    "DROP TABLE IF EXISTS tarefas_tarefa_fts",
+]
+
+# PostgreSQL: coluna tsvector (fora do modelo) com índice GIN
+POSTGRES_CRIAR = [
+    "ALTER TABLE tarefas_tarefa ADD COLUMN busca tsvector",
+    """
+    CREATE FUNCTION tarefas_tarefa_busca_atualizar() RETURNS trigger AS $$
+    BEGIN
+        NEW.busca :=
+            setweight(to_tsvector('portuguese', coalesce(NEW.titulo, '')), 'A') ||
+            setweight(to_tsvector('portuguese', coalesce(NEW.descricao, '')), 'B') ||
+            setweight(to_tsvector('portuguese', coalesce(
+                (SELECT nome FROM tarefas_categoria WHERE id = NEW.categoria_id), '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER tarefas_tarefa_busca BEFORE INSERT OR UPDATE OF titulo, descricao, categoria_id
+    ON tarefas_tarefa FOR EACH ROW EXECUTE FUNCTION tarefas_tarefa_busca_atualizar()
+    """,
+    """
+    CREATE FUNCTION tarefas_categoria_busca_atualizar() RETURNS trigger AS $$
+    BEGIN
+        UPDATE tarefas_tarefa SET titulo = titulo WHERE categoria_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER tarefas_categoria_busca AFTER UPDATE OF nome ON tarefas_categoria
+    FOR EACH ROW EXECUTE FUNCTION tarefas_categoria_busca_atualizar()
+    """,
+    "UPDATE tarefas_tarefa SET titulo = titulo",
+    "CREATE INDEX tarefas_tarefa_busca_gin ON tarefas_tarefa USING GIN (busca)",
+]
+
+POSTGRES_REMOVER = [
+    "DROP TRIGGER IF EXISTS tarefas_categoria_busca ON tarefas_categoria",
+    "DROP FUNCTION IF EXISTS tarefas_categoria_busca_atualizar()",
+    "DROP TRIGGER IF EXISTS tarefas_tarefa_busca ON tarefas_tarefa",
+    "DROP FUNCTION IF EXISTS tarefas_tarefa_busca_atualizar()",
+    "ALTER TABLE tarefas_tarefa DROP COLUMN IF EXISTS busca",
+]
+
+
+def _executar(schema_editor, comandos):
+    for sql in comandos:
+        schema_editor.execute(sql, params=None)
+
+
+def criar_indice_busca(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        # Sem FTS5 compilado no SQLite a busca continua no icontains
+        try:
+            with transaction.atomic(using=schema_editor.connection.alias):
+                _executar(schema_editor, SQLITE_CRIAR)
+        except DatabaseError:
+            pass
+    elif vendor == "postgresql":
+        _executar(schema_editor, POSTGRES_CRIAR)
+
+
+def remover_indice_busca(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _executar(schema_editor, SQLITE_REMOVER)
+    elif vendor == "postgresql":
+        _executar(schema_editor, POSTGRES_REMOVER)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tarefas", "0010_tarefa_prioridade_rank"),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indice_busca, remover_indice_busca),
+    ]
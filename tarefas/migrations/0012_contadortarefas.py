@@ -0,0 +1,135 @@
+# Generated by Django 5.2 on 2026-10-18 02:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# SQLite: um trigger por operação; as linhas de total geral (categoria nula)
+# já existem, as de cada categoria são criadas sob demanda
+def _sqlite_somar(sinal, linha):
+    return f"""
+        UPDATE tarefas_contadortarefas SET total = total {sinal} 1
+        WHERE status = {linha}.status AND categoria_id IS NULL;
+        INSERT OR IGNORE INTO tarefas_contadortarefas (status, categoria_id, total)
+        VALUES ({linha}.status, {linha}.categoria_id, 0);
+        UPDATE tarefas_contadortarefas SET total = total {sinal} 1
+        WHERE status = {linha}.status AND categoria_id = {linha}.categoria_id;
+    """
+
+
+SQLITE_CRIAR = [
+    f"""
+    CREATE TRIGGER tarefas_contador_insert AFTER INSERT ON tarefas_tarefa BEGIN
+        {_sqlite_somar("+", "NEW")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER tarefas_contador_delete AFTER DELETE ON tarefas_tarefa BEGIN
+        {_sqlite_somar("-", "OLD")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER tarefas_contador_update AFTER UPDATE OF status, categoria_id ON tarefas_tarefa
+    WHEN OLD.status IS NOT NEW.status OR OLD.categoria_id IS NOT NEW.categoria_id BEGIN
+        {_sqlite_somar("-", "OLD")}
+        {_sqlite_somar("+", "NEW")}
+    END
+    """,
+]
+
+SQLITE_REMOVER = [
+    "DROP TRIGGER IF EXISTS tarefas_contador_update",
+    "DROP TRIGGER IF EXISTS tarefas_contador_delete",
+    "DROP TRIGGER IF EXISTS tarefas_contador_insert",
+]
+
+POSTGRES_CRIAR = [
+    """
+    CREATE FUNCTION tarefas_contador_somar(p_status varchar, p_categoria bigint, p_delta integer)
+    RETURNS void AS $$
+    BEGIN
+        UPDATE tarefas_contadortarefas SET total = total + p_delta
+        WHERE status = p_status AND categoria_id IS NULL;
+        INSERT INTO tarefas_contadortarefas (status, categoria_id, total)
+        VALUES (p_status, p_categoria, p_delta)
+        ON CONFLICT (status, categoria_id) DO UPDATE
+        SET total = tarefas_contadortarefas.total + p_delta;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE FUNCTION tarefas_contador_atualizar() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM tarefas_contador_somar(OLD.status, OLD.categoria_id, -1);
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            PERFORM tarefas_contador_somar(NEW.status, NEW.categoria_id, 1);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER tarefas_contador AFTER INSERT OR DELETE OR UPDATE OF status, categoria_id
+    ON tarefas_tarefa FOR EACH ROW EXECUTE FUNCTION tarefas_contador_atualizar()
+    """,
+]
+
+POSTGRES_REMOVER = [
+    "DROP TRIGGER IF EXISTS tarefas_contador ON tarefas_tarefa",
+    "DROP FUNCTION IF EXISTS tarefas_contador_atualizar()",
+    "DROP FUNCTION IF EXISTS tarefas_contador_somar(varchar, bigint, integer)",
+]
+
+STATUS = ("pendente", "concluído", "adiado")
+
+
+def criar_contadores(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    comandos = {"sqlite": SQLITE_CRIAR, "postgresql": POSTGRES_CRIAR}.get(vendor, [])
+    for sql in comandos:
+        schema_editor.execute(sql, params=None)
+
+    # Carga inicial a partir das tarefas existentes
+    Tarefa = apps.get_model("tarefas", "Tarefa")
+    ContadorTarefas = apps.get_model("tarefas", "ContadorTarefas")
+    totais = dict(Tarefa.objects.values_list("status").annotate(n=Count("id")).order_by())
+    contadores = [ContadorTarefas(status=status, total=totais.get(status, 0)) for status in STATUS]
+    contadores += [
+        ContadorTarefas(status=status, categoria_id=categoria_id, total=n)
+        for categoria_id, status, n in Tarefa.objects.values_list("categoria_id", "status")
+        .annotate(n=Count("id")).order_by()
+    ]
+    ContadorTarefas.objects.bulk_create(contadores)
+
+
+def remover_contadores(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    comandos = {"sqlite": SQLITE_REMOVER, "postgresql": POSTGRES_REMOVER}.get(vendor, [])
+    for sql in comandos:
+        schema_editor.execute(sql, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tarefas', '0011_tarefa_indice_busca'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorTarefas',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('concluído', 'Concluído'), ('pendente', 'Pendente'), ('adiado', 'Adiado')], max_length=25)),
+                ('total', models.IntegerField(default=0)),
+                ('categoria', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='contadores', to='tarefas.categoria')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('status', 'categoria'), name='contador_status_categoria_unico')],
+            },
+        ),
+        migrations.RunPython(criar_contadores, remover_contadores),
+    ]
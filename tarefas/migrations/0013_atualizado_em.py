@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-18 12:40
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def preencher_atualizado_em(apps, schema_editor):
+    agora = timezone.now()
+    for modelo in ("Categoria", "Tarefa"):
+        apps.get_model("tarefas", modelo).objects.update(atualizado_em=agora)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tarefas', '0012_contadortarefas'),
+    ]
+
+    # Colunas anuláveis e sem default: no SQLite viram ALTER TABLE ADD COLUMN
+    # e preservam os triggers de busca e dos contadores
+    operations = [
+        migrations.AddField(
+            model_name='categoria',
+            name='atualizado_em',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='tarefa',
+            name='atualizado_em',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(preencher_atualizado_em, migrations.RunPython.noop),
+    ]
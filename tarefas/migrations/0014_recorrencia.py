@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-18 13:05
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tarefas', '0013_atualizado_em'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Recorrencia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('titulo', models.CharField(max_length=50)),
+                ('descricao', models.CharField(max_length=400)),
+                ('prioridade', models.CharField(choices=[('alta', 'Alta'), ('média', 'Média'), ('baixa', 'Baixa')], default='média', max_length=25)),
+                ('inicio', models.DateField()),
+                ('frequencia', models.CharField(choices=[('diaria', 'Diária'), ('semanal', 'Semanal'), ('mensal', 'Mensal')], default='semanal', max_length=10)),
+                ('intervalo', models.PositiveSmallIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1)])),
+                ('ate', models.DateField(blank=True, null=True)),
+                ('quantidade', models.PositiveIntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(1)])),
+                ('categoria', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recorrencias', to='tarefas.categoria')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='OcorrenciaMaterializada',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.DateField()),
+                ('tarefa', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='tarefas.tarefa')),
+                ('recorrencia', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='materializadas', to='tarefas.recorrencia')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('recorrencia', 'data'), name='ocorrencia_recorrencia_data_unica')],
+            },
+        ),
+    ]
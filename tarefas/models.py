@@ -1,8 +1,79 @@
+from django.core.validators import MinValueValidator
 from django.db import models
+from django.utils import timezone
+
+from .cache_tarefas import invalidar_tarefas
+
+
+# Posição de cada prioridade na ordenação "por prioridade" (menor = mais urgente)
+RANK_PRIORIDADE = {"alta": 1, "média": 2, "baixa": 3}
+
+
+class TarefaQuerySet(models.QuerySet):
+    """Mantém ``prioridade_rank`` e ``atualizado_em`` sincronizados nas operações em massa.
+
+    Essas operações não disparam ``post_save``, então também invalidam o
+    cache das listas diretamente (assim como ``delete()``, ver
+    ``tarefas.signals``).
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        agora = timezone.now()
+        for obj in objs:
+            obj.atualizar_prioridade_rank()
+            obj.atualizado_em = agora
+        criados = super().bulk_create(objs, *args, **kwargs)
+        invalidar_tarefas()
+        return criados
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        fields = list(fields)
+        if "prioridade" in fields:
+            for obj in objs:
+                obj.atualizar_prioridade_rank()
+            if "prioridade_rank" not in fields:
+                fields.append("prioridade_rank")
+        agora = timezone.now()
+        for obj in objs:
+            obj.atualizado_em = agora
+        if "atualizado_em" not in fields:
+            fields.append("atualizado_em")
+        alteradas = super().bulk_update(objs, fields, *args, **kwargs)
+        invalidar_tarefas()
+        return alteradas
+
+    def delete(self):
+        resultado = super().delete()
+        invalidar_tarefas()
+        return resultado
+
+    def update(self, **kwargs):
+        if "prioridade" in kwargs and "prioridade_rank" not in kwargs:
+            kwargs["prioridade_rank"] = RANK_PRIORIDADE[kwargs["prioridade"]]
+        kwargs.setdefault("atualizado_em", timezone.now())
+        alteradas = super().update(**kwargs)
+        invalidar_tarefas()
+        return alteradas
+
+
+def marcar_atualizacao(obj, kwargs_save):
+    """Atualiza ``obj.atualizado_em`` e o inclui em ``update_fields``, se houver."""
+    obj.atualizado_em = timezone.now()
+    update_fields = kwargs_save.get("update_fields")
+    if update_fields is not None:
+        kwargs_save["update_fields"] = {*update_fields, "atualizado_em"}
 
 
 class Categoria(models.Model):
     nome = models.CharField(max_length=50, default="Geral")
+    # Marcador de alteração usado nos ETags da API (ver Tarefa.atualizado_em)
+    atualizado_em = models.DateTimeField(null=True, editable=False)
+
+    def save(self, *args, **kwargs):
+        marcar_atualizacao(self, kwargs)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.nome
@@ -30,6 +101,128 @@ class Tarefa(models.Model):
         on_delete=models.CASCADE,
         related_name="tarefas",
     )
+    # Cópia numérica de ``prioridade`` para ordenar pelo índice
+    prioridade_rank = models.PositiveSmallIntegerField(default=RANK_PRIORIDADE["média"], editable=False)
+    # Última alteração, preenchida pelo save() e pelo TarefaQuerySet; os ETags
+    # da API são calculados a partir do maior valor. Anulável e sem default
+    # para que o SQLite adicione a coluna sem recriar a tabela (e os triggers)
+    atualizado_em = models.DateTimeField(null=True, editable=False)
+
+    objects = TarefaQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Listas e calendário: filtro por status, ordenação por data/prioridade
+            models.Index(fields=["status", "data", "prioridade"], name="tarefa_status_data_idx"),
+            # Filtro por categoria dentro de cada status
+            models.Index(fields=["status", "categoria", "data", "prioridade"], name="tarefa_status_cat_data_idx"),
+            # Ordenação por prioridade dentro de cada status
+            models.Index(fields=["status", "prioridade_rank", "data"], name="tarefa_status_rank_idx"),
+        ]
+
+    def atualizar_prioridade_rank(self):
+        self.prioridade_rank = RANK_PRIORIDADE.get(self.prioridade, RANK_PRIORIDADE["média"])
+
+    def save(self, *args, **kwargs):
+        self.atualizar_prioridade_rank()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "prioridade" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "prioridade_rank"}
+        marcar_atualizacao(self, kwargs)
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        resultado = super().delete(*args, **kwargs)
+        invalidar_tarefas()
+        return resultado
 
     def __str__(self):
         return self.titulo
+
+
+class Recorrencia(models.Model):
+    """Regra de repetição de uma tarefa: a cada ``intervalo`` dias, semanas ou meses.
+
+    As ocorrências não são gravadas: ``tarefas.recorrencias`` calcula as de
+    cada janela pedida e só cria a ``Tarefa`` de uma ocorrência quando ela é
+    concluída, adiada ou editada (ver ``OcorrenciaMaterializada``). A regra termina em ``ate`` ou depois de
+    ``quantidade`` ocorrências, o que vier primeiro; sem os dois, não termina.
+    """
+    OPCOES_FREQUENCIA = (
+        ("diaria", "Diária"),
+        ("semanal", "Semanal"),
+        ("mensal", "Mensal"),
+    )
+
+    titulo = models.CharField(max_length=50)
+    descricao = models.CharField(max_length=400)
+    prioridade = models.CharField(max_length=25, choices=Tarefa.OPCOES_PRIORIDADE, default="média")
+    categoria = models.ForeignKey(
+        'Categoria',
+        on_delete=models.CASCADE,
+        related_name="recorrencias",
+    )
+    # Data da primeira ocorrência; nas mensais, o dia do mês de todas (ou o
+    # último dia, nos meses mais curtos)
+    inicio = models.DateField()
+    frequencia = models.CharField(max_length=10, choices=OPCOES_FREQUENCIA, default="semanal")
+    intervalo = models.PositiveSmallIntegerField(default=1, validators=[MinValueValidator(1)])
+    ate = models.DateField(null=True, blank=True)
+    quantidade = models.PositiveIntegerField(null=True, blank=True, validators=[MinValueValidator(1)])
+
+    def __str__(self):
+        return f"{self.titulo} ({self.get_frequencia_display().lower()})"
+
+
+class OcorrenciaMaterializada(models.Model):
+    """Ocorrência de uma ``Recorrencia`` que já virou ``Tarefa`` e não é mais calculada.
+
+    Fica numa tabela à parte para não alargar ``Tarefa`` (cada coluna a mais
+    pesa nas varreduras e nos ``bulk_create``). ``tarefa`` não tem restrição
+    no banco nem efeito na exclusão: as tarefas continuam sendo apagadas sem
+    carregar as linhas, e a ocorrência de uma tarefa excluída não volta.
+    """
+    recorrencia = models.ForeignKey(
+        'Recorrencia',
+        on_delete=models.CASCADE,
+        related_name="materializadas",
+        db_index=False,  # coberto pela restrição de unicidade (recorrencia, data)
+    )
+    data = models.DateField()
+    tarefa = models.ForeignKey(
+        'Tarefa',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["recorrencia", "data"], name="ocorrencia_recorrencia_data_unica"),
+        ]
+
+
+class ContadorTarefas(models.Model):
+    """Quantidade de tarefas por status, no total (categoria nula) e por categoria.
+
+    Mantido por triggers no banco (migração 0012) a cada INSERT, UPDATE de
+    status/categoria e DELETE em ``Tarefa``; ``manage.py recalcular_contadores``
+    reconstrói a tabela do zero.
+    """
+    status = models.CharField(max_length=25, choices=Tarefa.OPCOES_STATUS)
+    categoria = models.ForeignKey(
+        'Categoria',
+        on_delete=models.CASCADE,
+        null=True,
+        related_name="contadores",
+    )
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["status", "categoria"], name="contador_status_categoria_unico"),
+        ]
+
+    def __str__(self):
+        return f"{self.categoria or 'Total'} / {self.status}: {self.total}"
@@ -0,0 +1,132 @@
+"""Paginação por cursor (keyset) para as listas de tarefas.
+
+Em vez de ``OFFSET``, cada página guarda os valores das chaves de ordenação
+da sua primeira e da sua última linha. A página seguinte é buscada com
+``WHERE (chaves) > (última linha)``, que o banco resolve com uma busca no
+índice; por isso a página N custa o mesmo que a primeira.
+"""
+import base64
+import binascii
+import json
+from datetime import date
+
+from django.conf import settings
+from django.db.models import Q
+
+
+ITENS_POR_PAGINA_PADRAO = 50
+
+
+def itens_por_pagina():
+    return getattr(settings, "TAREFAS_ITENS_POR_PAGINA", ITENS_POR_PAGINA_PADRAO)
+
+
+def codificar_cursor(direcao, valores):
+    valores = [v.isoformat() if isinstance(v, date) else v for v in valores]
+    dados = json.dumps({"d": direcao, "v": valores}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(dados.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor, n_chaves):
+    """Devolve ``(direcao, valores)`` ou ``(None, None)`` se o cursor for inválido."""
+    if not cursor:
+        return None, None
+    try:
+        dados = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        direcao, valores = dados["d"], dados["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        return None, None
+    if direcao not in ("n", "p") or not isinstance(valores, list) or len(valores) != n_chaves:
+        return None, None
+    return direcao, valores
+
+
+def filtro_apos(chaves, valores, maior=True):
+    """Comparação lexicográfica ``(chaves) > (valores)`` (ou ``<``).
+
+    A primeira chave também aparece isolada (``>=``/``<=``) para que o
+    planejador faça uma varredura de intervalo no índice.
+    """
+    op_estrito, op_inclusivo = ("gt", "gte") if maior else ("lt", "lte")
+    condicao = None
+    for i in reversed(range(len(chaves))):
+        atual = Q(**{f"{chaves[i]}__{op_estrito}": valores[i]})
+        if condicao is not None:
+            atual |= Q(**{chaves[i]: valores[i]}) & condicao
+        condicao = atual
+    return Q(**{f"{chaves[0]}__{op_inclusivo}": valores[0]}) & condicao
+
+
+class PaginaKeyset:
+    def __init__(self, itens, cursor_anterior=None, cursor_proximo=None):
+        self.itens = itens
+        self.cursor_anterior = cursor_anterior
+        self.cursor_proximo = cursor_proximo
+
+    @property
+    def tem_anterior(self):
+        return self.cursor_anterior is not None
+
+    @property
+    def tem_proxima(self):
+        return self.cursor_proximo is not None
+
+    def __iter__(self):
+        return iter(self.itens)
+
+    def __len__(self):
+        return len(self.itens)
+
+
+def _valores(obj, chaves):
+    return [getattr(obj, chave) for chave in chaves]
+
+
+def _pagina(itens, chaves, tem_anterior, tem_proxima):
+    cursor_anterior = cursor_proximo = None
+    if itens and tem_anterior:
+        cursor_anterior = codificar_cursor("p", _valores(itens[0], chaves))
+    if itens and tem_proxima:
+        cursor_proximo = codificar_cursor("n", _valores(itens[-1], chaves))
+    return PaginaKeyset(itens, cursor_anterior, cursor_proximo)
+
+
+def _consulta_pagina(queryset, chaves, cursor, tamanho):
+    """Devolve a consulta da página e a função que monta a ``PaginaKeyset`` com as linhas lidas."""
+    tamanho = tamanho or itens_por_pagina()
+    direcao, valores = decodificar_cursor(cursor, len(chaves))
+
+    if direcao == "p":
+        consulta = queryset.filter(filtro_apos(chaves, valores, maior=False))
+
+        def montar(linhas):
+            tem_anterior = len(linhas) > tamanho
+            return _pagina(linhas[:tamanho][::-1], chaves, tem_anterior=tem_anterior, tem_proxima=True)
+        return consulta.order_by(*(f"-{c}" for c in chaves))[:tamanho + 1], montar
+
+    if direcao == "n":
+        queryset = queryset.filter(filtro_apos(chaves, valores))
+
+    def montar(linhas):
+        return _pagina(
+            linhas[:tamanho], chaves,
+            tem_anterior=direcao == "n",
+            tem_proxima=len(linhas) > tamanho,
+        )
+    return queryset.order_by(*chaves)[:tamanho + 1], montar
+
+
+def paginar(queryset, chaves, cursor=None, tamanho=None):
+    """Devolve uma ``PaginaKeyset`` de ``queryset`` ordenado por ``chaves`` (crescente).
+
+    A última chave deve ser única (normalmente ``id``) para que o cursor
+    identifique uma posição exata.
+    """
+    consulta, montar = _consulta_pagina(queryset, chaves, cursor, tamanho)
+    return montar(list(consulta))
+
+
+async def apaginar(queryset, chaves, cursor=None, tamanho=None):
+    """Versão assíncrona de ``paginar``."""
+    consulta, montar = _consulta_pagina(queryset, chaves, cursor, tamanho)
+    return montar([linha async for linha in consulta.aiterator()])
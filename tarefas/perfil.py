@@ -0,0 +1,243 @@
+"""Perfil das requisições: SQL, templates e Python (opcional, ``TAREFAS_PERFIL``).
+
+``PerfilMiddleware`` mede, em cada requisição:
+
+- quantas consultas SQL rodaram, quanto tempo levaram e quantas repetiram
+  outra já feita (mesmo SQL e parâmetros), o sinal típico de N+1;
+- o tempo de renderização dos templates, com os includes e o crispy, sem
+  o SQL disparado de dentro deles (que já entra em "sql");
+- o tempo total; o que sobra é Python (views, middlewares, serialização).
+
+Os números saem no cabeçalho ``Server-Timing`` (aparece no DevTools do
+navegador), numa linha JSON no logger ``tarefas.perfil`` e num agregado em
+memória com as últimas ``TAREFAS_PERFIL_JANELA`` requisições de cada URL.
+Cada processo grava o seu agregado em ``TAREFAS_PERFIL_DIR`` a cada
+``TAREFAS_PERFIL_INTERVALO`` segundos; ``python manage.py perfil_tarefas``
+junta e mostra os arquivos.
+
+O middleware é só síncrono: sob ASGI, as views assíncronas rodam na thread
+dele, o que deixa ver as consultas delas, mas tira a vantagem do modo
+assíncrono enquanto o perfil estiver ligado.
+"""
+import contextlib
+import contextvars
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict, deque
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+
+
+logger = logging.getLogger("tarefas.perfil")
+
+_atual = contextvars.ContextVar("tarefas_perfil", default=None)
+
+
+class Medicao:
+    """Acumula as medidas de uma requisição; também é o ``execute_wrapper`` das conexões."""
+
+    def __init__(self):
+        self.consultas = 0
+        self.sql = 0.0
+        self.sql_em_templates = 0.0
+        self.templates = 0
+        self.tempo_templates = 0.0
+        self.profundidade = 0
+        self._vistas = Counter()
+
+    @property
+    def duplicadas(self):
+        return sum(n - 1 for n in self._vistas.values() if n > 1)
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracao = time.perf_counter() - inicio
+            self.consultas += 1
+            self.sql += duracao
+            if self.profundidade:
+                self.sql_em_templates += duracao
+            self._vistas[(sql, repr(params))] += 1
+
+
+_render_original = None
+
+
+def _instrumentar_templates():
+    """Envolve ``Template.render`` (uma vez por processo) para medir a renderização.
+
+    Fora de uma requisição medida, o custo é uma leitura de ``ContextVar``.
+    Só o template mais externo soma tempo, para que os includes não contem
+    duas vezes.
+    """
+    global _render_original
+    if _render_original is not None:
+        return
+    _render_original = original = Template.render
+
+    def render(self, context):
+        medicao = _atual.get()
+        if medicao is None:
+            return original(self, context)
+        medicao.templates += 1
+        medicao.profundidade += 1
+        inicio = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            medicao.profundidade -= 1
+            if not medicao.profundidade:
+                medicao.tempo_templates += time.perf_counter() - inicio
+
+    Template.render = render
+
+
+def _ms(segundos):
+    return round(segundos * 1000, 3)
+
+
+def server_timing(registro):
+    return ", ".join((
+        f'sql;dur={registro["sql_ms"]};desc="{registro["consultas"]} consultas, '
+        f'{registro["duplicadas"]} duplicadas"',
+        f'tpl;dur={registro["template_ms"]};desc="{registro["templates"]} templates"',
+        f'py;dur={registro["python_ms"]}',
+        f'total;dur={registro["total_ms"]}',
+    ))
+
+
+# Agregado em memória: url_name -> últimos registros
+_janelas = defaultdict(deque)
+_trava = threading.Lock()
+_ultima_gravacao = 0.0
+
+
+def _arquivo_do_processo():
+    return os.path.join(settings.TAREFAS_PERFIL_DIR, f"perfil-{os.getpid()}.json")
+
+
+def _gravar():
+    with _trava:
+        dados = {url: list(janela) for url, janela in _janelas.items()}
+    os.makedirs(settings.TAREFAS_PERFIL_DIR, exist_ok=True)
+    destino = _arquivo_do_processo()
+    temporario = f"{destino}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(dados, arquivo, ensure_ascii=False)
+    os.replace(temporario, destino)
+
+
+def registrar(registro):
+    global _ultima_gravacao
+    with _trava:
+        janela = _janelas[registro["url"]]
+        if janela.maxlen != settings.TAREFAS_PERFIL_JANELA:
+            janela = _janelas[registro["url"]] = deque(janela, maxlen=settings.TAREFAS_PERFIL_JANELA)
+        janela.append(registro)
+    agora = time.monotonic()
+    if agora - _ultima_gravacao >= settings.TAREFAS_PERFIL_INTERVALO:
+        _ultima_gravacao = agora
+        try:
+            _gravar()
+        except OSError:
+            logger.exception("Não foi possível gravar o agregado do perfil")
+
+
+def limpar_agregado():
+    with _trava:
+        _janelas.clear()
+
+
+def ler_gravados(diretorio=None):
+    """Junta os registros gravados por todos os processos: ``{url: [registros]}``."""
+    registros = defaultdict(list)
+    for caminho in glob.glob(os.path.join(diretorio or settings.TAREFAS_PERFIL_DIR, "perfil-*.json")):
+        try:
+            with open(caminho, encoding="utf-8") as arquivo:
+                dados = json.load(arquivo)
+        except (OSError, ValueError):
+            continue
+        for url, lista in dados.items():
+            registros[url].extend(lista)
+    return registros
+
+
+def _media(valores):
+    return round(sum(valores) / len(valores), 3)
+
+
+def agregado(registros=None):
+    """Resumo por URL dos ``registros`` (por padrão, os deste processo)."""
+    if registros is None:
+        with _trava:
+            registros = {url: list(janela) for url, janela in _janelas.items()}
+    resumo = {}
+    for url, lista in registros.items():
+        if not lista:
+            continue
+        totais = sorted(registro["total_ms"] for registro in lista)
+        resumo[url] = {
+            "requisicoes": len(lista),
+            "total_ms_media": _media(totais),
+            "total_ms_p95": totais[min(len(totais) - 1, int(len(totais) * 0.95))],
+            "sql_ms_media": _media([registro["sql_ms"] for registro in lista]),
+            "consultas_media": _media([registro["consultas"] for registro in lista]),
+            "duplicadas_media": _media([registro["duplicadas"] for registro in lista]),
+            "template_ms_media": _media([registro["template_ms"] for registro in lista]),
+            "python_ms_media": _media([registro["python_ms"] for registro in lista]),
+        }
+    return resumo
+
+
+class PerfilMiddleware:
+    """Mede SQL, templates e tempo total de cada requisição (ver o docstring do módulo)."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "TAREFAS_PERFIL", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        _instrumentar_templates()
+
+    def __call__(self, request):
+        medicao = Medicao()
+        token = _atual.set(medicao)
+        inicio = time.perf_counter()
+        try:
+            with contextlib.ExitStack() as pilha:
+                for conexao in connections.all():
+                    pilha.enter_context(conexao.execute_wrapper(medicao))
+                response = self.get_response(request)
+        finally:
+            _atual.reset(token)
+        total = time.perf_counter() - inicio
+
+        template = medicao.tempo_templates - medicao.sql_em_templates
+        match = getattr(request, "resolver_match", None)
+        registro = {
+            "url": match.url_name if match and match.url_name else request.path,
+            "metodo": request.method,
+            "status": response.status_code,
+            "total_ms": _ms(total),
+            "sql_ms": _ms(medicao.sql),
+            "consultas": medicao.consultas,
+            "duplicadas": medicao.duplicadas,
+            "template_ms": _ms(template),
+            "templates": medicao.templates,
+            "python_ms": _ms(total - medicao.sql - template),
+        }
+        timing = server_timing(registro)
+        if response.has_header("Server-Timing"):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response["Server-Timing"] = timing
+        logger.info(json.dumps(registro, ensure_ascii=False))
+        registrar(registro)
+        return response
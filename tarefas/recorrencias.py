@@ -0,0 +1,198 @@
+"""Ocorrências das tarefas recorrentes, calculadas por janela de datas.
+
+Uma ``Recorrencia`` não grava uma ``Tarefa`` por ocorrência: o calendário e
+a lista de pendentes pedem ``ocorrencias(inicio, fim)`` só para as datas que
+exibem, e recebem ``Tarefa`` não salvas (``pk`` nulo, com ``recorrencia_id``
+e ``data_ocorrencia``), que os templates mostram como as demais. As datas de
+cada regra saem da aritmética sobre o número da ocorrência: a primeira e a
+última da janela são calculadas direto e o ``range`` entre elas dá as
+demais, sem percorrer os dias. O custo acompanha as ocorrências da janela,
+não o tamanho dela nem a idade da regra.
+
+``materializar`` cria a ``Tarefa`` de uma ocorrência quando ela é
+concluída, adiada ou editada, e a registra em ``OcorrenciaMaterializada``,
+o que a tira das próximas expansões mesmo que a data da tarefa mude ou que
+ela seja excluída.
+
+As regras ficam em cache numa versão própria (no cache ``versoes``, como a
+das tarefas), trocada só quando uma regra muda; as ocorrências de cada
+janela, na versão das tarefas, que também muda com as regras (ver
+``tarefas.signals``). Sem regras, expandir uma janela não consulta o banco.
+"""
+import calendar
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+
+from .cache_tarefas import incrementar_versao, ler_versao, timeout_cache, versao_tarefas
+from .models import OcorrenciaMaterializada, Recorrencia, Tarefa
+from .replicas import leitura_em_replica
+
+
+CHAVE_VERSAO = "tarefas:recorrencias:versao"
+
+PASSO_EM_DIAS = {"diaria": 1, "semanal": 7}
+
+# Dias à frente com ocorrências na lista de pendentes
+DIAS_NA_LISTA_PADRAO = 14
+
+
+def dias_na_lista():
+    return getattr(settings, "TAREFAS_RECORRENCIAS_DIAS", DIAS_NA_LISTA_PADRAO)
+
+
+def _indice_mes(data):
+    return data.year * 12 + data.month - 1
+
+
+def _no_mes(indice, dia):
+    # Nos meses mais curtos, o último dia
+    ano, mes = divmod(indice, 12)
+    return date(ano, mes + 1, min(dia, calendar.monthrange(ano, mes + 1)[1]))
+
+
+def datas_ocorrencias(regra, inicio, fim):
+    """Datas das ocorrências de ``regra`` entre ``inicio`` e ``fim`` (inclusive), em ordem."""
+    inicio = max(inicio, regra.inicio)
+    if regra.ate:
+        fim = min(fim, regra.ate)
+    if inicio > fim:
+        return []
+    # Ocorrências numeradas a partir de 0: primeira e última dentro da janela
+    if regra.frequencia == "mensal":
+        base = _indice_mes(regra.inicio)
+        primeira = -(-(_indice_mes(inicio) - base) // regra.intervalo)
+        ultima = (_indice_mes(fim) - base) // regra.intervalo
+    else:
+        passo = PASSO_EM_DIAS[regra.frequencia] * regra.intervalo
+        primeira = -(-(inicio - regra.inicio).days // passo)
+        ultima = (fim - regra.inicio).days // passo
+    if regra.quantidade:
+        ultima = min(ultima, regra.quantidade - 1)
+    numeros = range(primeira, ultima + 1)
+    if regra.frequencia == "mensal":
+        # Nos meses das pontas, o dia pode cair antes ou depois da janela
+        datas = (_no_mes(base + n * regra.intervalo, regra.inicio.day) for n in numeros)
+        return [data for data in datas if inicio <= data <= fim]
+    return [regra.inicio + timedelta(days=n * passo) for n in numeros]
+
+
+def ocorrencia(regra, data):
+    """A ``Tarefa`` (não salva) da ocorrência de ``regra`` em ``data``."""
+    tarefa = Tarefa(
+        titulo=regra.titulo,
+        descricao=regra.descricao,
+        data=data,
+        prioridade=regra.prioridade,
+        status="pendente",
+        categoria=regra.categoria,
+    )
+    tarefa.atualizar_prioridade_rank()
+    # Para os links do modal (views.modal_ocorrencia) e os templates
+    tarefa.recorrencia = regra
+    tarefa.recorrencia_id = regra.id
+    tarefa.data_ocorrencia = data
+    return tarefa
+
+
+def versao_recorrencias():
+    return ler_versao(CHAVE_VERSAO)
+
+
+def _incrementar_versao():
+    incrementar_versao(CHAVE_VERSAO)
+
+
+def invalidar_recorrencias():
+    """Descarta as regras em cache, agora e de novo após o commit."""
+    _incrementar_versao()
+    transaction.on_commit(_incrementar_versao)
+
+
+def regras():
+    """Todas as regras de recorrência, com a categoria, por id."""
+    chave = f"tarefas:recorrencias:{versao_recorrencias()}"
+    encontradas = cache.get(chave)
+    if encontradas is None:
+        encontradas = list(Recorrencia.objects.select_related("categoria").order_by("id"))
+        if not leitura_em_replica():
+            cache.set(chave, encontradas, timeout_cache())
+    return encontradas
+
+
+def _expandir(regras, inicio, fim):
+    datas = [(regra, datas_ocorrencias(regra, inicio, fim)) for regra in regras]
+    datas = [(regra, lista) for regra, lista in datas if lista]
+    if not datas:
+        return []
+    materializadas = set(
+        OcorrenciaMaterializada.objects.filter(
+            recorrencia__in=[regra.id for regra, _ in datas], data__range=(inicio, fim),
+        ).values_list("recorrencia_id", "data")
+    )
+    ocorrencias = [
+        ocorrencia(regra, data)
+        for regra, lista in datas for data in lista
+        if (regra.id, data) not in materializadas
+    ]
+    ocorrencias.sort(key=lambda tarefa: (tarefa.data, tarefa.prioridade_rank, tarefa.recorrencia_id))
+    return ocorrencias
+
+
+def ocorrencias(inicio, fim):
+    """Ocorrências entre ``inicio`` e ``fim`` que ainda não viraram ``Tarefa``, por data e prioridade."""
+    chave = f"tarefas:ocorrencias:{versao_tarefas()}:{inicio.isoformat()}:{fim.isoformat()}"
+    encontradas = cache.get(chave)
+    if encontradas is None:
+        encontradas = _expandir(regras(), inicio, fim)
+        if not leitura_em_replica():
+            cache.set(chave, encontradas, timeout_cache())
+    return encontradas
+
+
+def filtrar_ocorrencias(ocorrencias, categoria_id=None, busca=""):
+    """Aplica às ocorrências o filtro de categoria e a busca das listas (todas as palavras)."""
+    palavras = busca.casefold().split()
+    return [
+        tarefa for tarefa in ocorrencias
+        if (not categoria_id or tarefa.categoria_id == categoria_id)
+        and all(palavra in f"{tarefa.titulo} {tarefa.descricao}".casefold() for palavra in palavras)
+    ]
+
+
+def _materializada(regra, data):
+    vinculo = OcorrenciaMaterializada.objects.filter(recorrencia=regra, data=data).first()
+    if vinculo is None:
+        return None
+    tarefa = Tarefa.objects.filter(id=vinculo.tarefa_id).first()
+    if tarefa is None:
+        raise Recorrencia.DoesNotExist(f"A ocorrência de {data} da recorrência {regra.id} foi excluída.")
+    return tarefa
+
+
+def materializar(recorrencia_id, data):
+    """Devolve a ``Tarefa`` da ocorrência de ``data``, criando-a na primeira vez.
+
+    Levanta ``Recorrencia.DoesNotExist`` se a regra não existe, não tem
+    ocorrência nessa data ou se a tarefa da ocorrência foi excluída.
+    """
+    regra = Recorrencia.objects.select_related("categoria").get(id=recorrencia_id)
+    if not datas_ocorrencias(regra, data, data):
+        raise Recorrencia.DoesNotExist(f"A recorrência {recorrencia_id} não tem ocorrência em {data}.")
+    tarefa = _materializada(regra, data)
+    if tarefa is not None:
+        return tarefa
+    modelo = ocorrencia(regra, data)
+    try:
+        with transaction.atomic():
+            tarefa = Tarefa.objects.create(**{
+                campo: getattr(modelo, campo)
+                for campo in ("titulo", "descricao", "data", "prioridade", "status", "categoria")
+            })
+            OcorrenciaMaterializada.objects.create(recorrencia=regra, data=data, tarefa=tarefa)
+    except IntegrityError:
+        # Outra requisição materializou a mesma ocorrência primeiro
+        return _materializada(regra, data)
+    return tarefa
@@ -0,0 +1,162 @@
+"""Leituras em réplicas do banco, escritas sempre no primário (``default``).
+
+Só as views marcadas com ``ler_da_replica`` (listas e calendário) leem de uma
+das réplicas em ``TAREFAS_REPLICAS_LEITURA``; o resto da aplicação continua
+no ``default``. Assim que uma requisição escreve num modelo de ``tarefas``,
+as leituras seguintes dela vão para o primário, e ``PrimarioAposEscritaMiddleware``
+grava um cookie para que as próximas requisições do mesmo navegador (como o
+redirect de volta para a lista) também leiam do primário por
+``TAREFAS_PRIMARIO_APOS_ESCRITA`` segundos, enquanto a réplica alcança.
+
+A réplica é sorteada uma vez por requisição, na primeira leitura, e guardada
+no estado da requisição: os ids de uma página e as linhas ou contagens lidas
+depois vêm todos da mesma réplica, mesmo que as réplicas estejam atrasadas
+em graus diferentes.
+
+O que vem de uma réplica pode estar atrasado, e os caches das listas, das
+linhas, dos fragmentos e das páginas são compartilhados por todos, inclusive
+por quem escreveu e lê do primário: uma leitura atrasada guardada sob a
+versão nova ficaria lá até expirar. Por isso só leituras do primário
+preenchem esses caches (ver ``leitura_em_replica``); em réplicas eles só
+são lidos.
+"""
+import contextlib
+import contextvars
+import functools
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+
+COOKIE_PRIMARIO = "tarefas_primario"
+
+# Estado da requisição atual; um dict mutável para que o roteador possa
+# marcar a escrita e o middleware enxergar a marca no fim da requisição
+_estado = contextvars.ContextVar("tarefas_replicas", default=None)
+
+
+def replicas_leitura():
+    return list(getattr(settings, "TAREFAS_REPLICAS_LEITURA", []))
+
+
+def _le_da_replica(estado):
+    return estado is not None and estado["replica"] and not estado["primario"] and bool(replicas_leitura())
+
+
+def leitura_em_replica():
+    """Se a requisição atual leu ou vai ler de uma réplica; o que ela leu não vai para os caches."""
+    estado = _estado.get()
+    return estado is not None and (estado["alias"] is not None or _le_da_replica(estado))
+
+
+class RoteadorReplicas:
+    """Roteador de banco (``DATABASE_ROUTERS``)."""
+
+    def db_for_read(self, model, **hints):
+        estado = _estado.get()
+        if not _le_da_replica(estado):
+            return "default"
+        replicas = replicas_leitura()
+        if estado["alias"] not in replicas:
+            estado["alias"] = random.choice(replicas)
+        return estado["alias"]
+
+    def db_for_write(self, model, **hints):
+        estado = _estado.get()
+        # Sessões, mensagens etc. não fazem a requisição grudar no primário
+        if estado is not None and model._meta.app_label == "tarefas":
+            estado["primario"] = estado["escreveu"] = True
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplicas têm os mesmos dados do primário
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # O esquema chega às réplicas pela replicação (ou por sincronizar_replicas)
+        return db not in replicas_leitura()
+
+
+@contextlib.contextmanager
+def _em_replica():
+    estado = _estado.get()
+    if estado is None:
+        yield
+        return
+    anterior = estado["replica"]
+    estado["replica"] = True
+    try:
+        yield
+    finally:
+        estado["replica"] = anterior
+
+
+def ler_da_replica(view):
+    """Permite que as leituras da view (síncrona ou assíncrona) vão para uma réplica."""
+    if iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def wrapper_async(request, *args, **kwargs):
+            with _em_replica():
+                return await view(request, *args, **kwargs)
+        return wrapper_async
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with _em_replica():
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+class PrimarioAposEscritaMiddleware:
+    """Mantém no primário as leituras logo após uma escrita do mesmo cliente.
+
+    Funciona nos dois modos, para não obrigar o Django a adaptar as views
+    assíncronas para síncronas sob ASGI. O estado é um dict compartilhado,
+    então as marcas feitas nas threads do ``sync_to_async`` chegam aqui.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        estado = self._estado_inicial(request)
+        token = _estado.set(estado)
+        try:
+            response = self.get_response(request)
+        finally:
+            _estado.reset(token)
+        return self._processar_resposta(response, estado)
+
+    async def __acall__(self, request):
+        estado = self._estado_inicial(request)
+        token = _estado.set(estado)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _estado.reset(token)
+        return self._processar_resposta(response, estado)
+
+    def _estado_inicial(self, request):
+        return {
+            "replica": False,
+            "primario": COOKIE_PRIMARIO in request.COOKIES,
+            "escreveu": False,
+            # Réplica sorteada para a requisição (RoteadorReplicas.db_for_read)
+            "alias": None,
+        }
+
+    def _processar_resposta(self, response, estado):
+        if estado["escreveu"]:
+            response.set_cookie(
+                COOKIE_PRIMARIO, "1",
+                max_age=getattr(settings, "TAREFAS_PRIMARIO_APOS_ESCRITA", 5),
+                httponly=True, samesite="Lax",
+            )
+        return response
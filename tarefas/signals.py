@@ -0,0 +1,31 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache_categorias import invalidar_categorias
+from .cache_tarefas import invalidar_tarefas
+from .models import Categoria, Recorrencia, Tarefa
+from .recorrencias import invalidar_recorrencias
+
+
+# Exclusões de Tarefa invalidam em TarefaQuerySet.delete()/Tarefa.delete():
+# sem receptores de post_delete o Django apaga com um único DELETE, sem
+# carregar as linhas antes
+@receiver(post_save, sender=Tarefa)
+@receiver(post_save, sender=Categoria)
+@receiver(post_delete, sender=Categoria)
+def invalidar_cache_listas(sender, **kwargs):
+    invalidar_tarefas()
+
+
+@receiver(post_save, sender=Categoria)
+@receiver(post_delete, sender=Categoria)
+def invalidar_cache_categorias(sender, **kwargs):
+    invalidar_categorias()
+
+
+# As ocorrências expandidas ficam na versão das tarefas; as regras, na própria
+@receiver(post_save, sender=Recorrencia)
+@receiver(post_delete, sender=Recorrencia)
+def invalidar_cache_recorrencias(sender, **kwargs):
+    invalidar_recorrencias()
+    invalidar_tarefas()
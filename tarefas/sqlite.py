@@ -0,0 +1,40 @@
+"""Perfil de produção do SQLite, aplicado a cada nova conexão.
+
+Com várias instâncias do gunicorn, o journal padrão (DELETE) bloqueia os
+leitores durante cada commit e serializa as escritas, gerando "database is
+locked". Em WAL os leitores não bloqueiam o escritor e vice-versa; os demais
+PRAGMAs reduzem fsyncs e I/O. Ativado por ``TAREFAS_SQLITE_OTIMIZADO``
+(``DB_PERFIL=producao``, ver ``dia_organizado/settings.py``) e conectado em
+``TarefasConfig.ready()``.
+"""
+from django.conf import settings
+
+
+# O busy timeout não entra aqui: é o OPTIONS["timeout"] do banco, que o
+# sqlite3 aplica ao abrir a conexão, antes destes PRAGMAs (ver timeout_lock)
+PRAGMAS_PRODUCAO = {
+    "journal_mode": "WAL",
+    # Em WAL, NORMAL só faz fsync no checkpoint e continua consistente
+    "synchronous": "NORMAL",
+    "cache_size": -64000,  # 64 MiB (valores negativos são KiB)
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+
+
+def timeout_lock(alias="default"):
+    """Segundos de espera pelo lock do banco ``alias``: ``OPTIONS["timeout"]`` ou o padrão do sqlite3."""
+    return settings.DATABASES[alias].get("OPTIONS", {}).get("timeout", 5.0)
+
+
+def aplicar_pragmas(cursor, pragmas):
+    for nome, valor in pragmas.items():
+        cursor.execute(f"PRAGMA {nome} = {valor}")
+
+
+def configurar_conexao_sqlite(sender, connection, **kwargs):
+    """Receptor de ``connection_created``."""
+    if connection.vendor != "sqlite" or not getattr(settings, "TAREFAS_SQLITE_OTIMIZADO", False):
+        return
+    with connection.cursor() as cursor:
+        aplicar_pragmas(cursor, PRAGMAS_PRODUCAO)
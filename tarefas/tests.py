@@ -1,10 +1,127 @@
 
-from django.test import TestCase, Client
-from django.urls import reverse
+import contextlib
+import csv
+import importlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+from collections import Counter
+from io import StringIO
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.db import DatabaseError, connection, connections
+from django.db.models import Count
+from django.http import HttpResponse
+from django.core.exceptions import MiddlewareNotUsed
+from django.template import Context as TemplateContext, Template
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.core.cache import cache, caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.management import CommandError, call_command
+from django.urls import clear_url_caches, resolve, reverse
 from django.contrib.auth.models import User
-from datetime import date, timedelta
-from .models import Tarefa, Categoria
+from datetime import date, datetime, timedelta
+from .models import Tarefa, Categoria, ContadorTarefas, OcorrenciaMaterializada, RANK_PRIORIDADE, Recorrencia
 from .forms import TarefaForm, CategoriaForm
+from .busca import backend_busca, BuscaIcontains, BuscaSQLiteFTS
+from .consultas import consultar_tarefas
+from .views import TarefaListView, TarefaListViewAsync, calendario_mensal_async, tarefas_pendentes_list_async
+from .transicoes import TransicaoInvalida, transicionar
+from .sqlite import PRAGMAS_PRODUCAO
+from . import cache_categorias, cache_tarefas
+from .cache_categorias import alistar_categorias, listar_categorias
+from .cache_tarefas import versao_tarefas
+from .benchmark import comparar, medir_urls
+from .dados_sinteticos import semear
+from .recorrencias import datas_ocorrencias, materializar, ocorrencias, regras
+from .perfil import PerfilMiddleware, agregado, limpar_agregado
+from .replicas import COOKIE_PRIMARIO, PrimarioAposEscritaMiddleware, RoteadorReplicas, _estado, ler_da_replica
+from .management.commands.sincronizar_replicas import copiar_sqlite
+from .contadores import contagem_por_categoria, contagem_por_status, recalcular_contadores
+
+
+# Detector de N+1: cada requisição dos testes de views não pode repetir a
+# mesma forma de SQL (o texto sem os parâmetros) mais que o limite. Pegaria
+# as consultas por dia do calendário e a categoria lida linha a linha.
+LIMITE_CONSULTAS_REPETIDAS = 1
+
+# Listas de placeholders de tamanho variável: IN (%s, %s, ...) e VALUES (...), (...)
+_LISTA_PLACEHOLDERS = re.compile(r"\(\s*%s(?:\s*,\s*%s)*\s*\)(?:\s*,\s*\(\s*%s(?:\s*,\s*%s)*\s*\))*")
+# Literais escritos no próprio SQL (LIMIT 21, strings de RawSQL)
+_LITERAIS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+# Savepoints têm nomes únicos e são controle de transação, não consultas
+_CONTROLE = ("SAVEPOINT", "RELEASE", "ROLLBACK")
+
+
+def forma_sql(sql):
+    """O SQL sem parâmetros nem literais, com as listas de placeholders colapsadas."""
+    sql = _LITERAIS.sub("?", _LISTA_PLACEHOLDERS.sub("(...)", sql))
+    return " ".join(sql.split())
+
+
+class ConsultasPorForma:
+    """``execute_wrapper`` que conta as consultas executadas por forma de SQL."""
+
+    def __init__(self):
+        self.formas = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        if not sql.lstrip().upper().startswith(_CONTROLE):
+            self.formas[forma_sql(sql)] += 1
+        return execute(sql, params, many, context)
+
+    def repetidas(self, limite):
+        return {forma: vezes for forma, vezes in self.formas.items() if vezes > limite}
+
+
+@contextlib.contextmanager
+def sem_consultas_repetidas(limite=LIMITE_CONSULTAS_REPETIDAS):
+    """Falha se, dentro do bloco, alguma forma de SQL rodar mais de ``limite`` vezes."""
+    contagem = ConsultasPorForma()
+    with contextlib.ExitStack() as pilha:
+        for conexao in connections.all():
+            pilha.enter_context(conexao.execute_wrapper(contagem))
+        yield contagem
+    repetidas = contagem.repetidas(limite)
+    if repetidas:
+        detalhes = "\n".join(f"  {vezes}x {forma}" for forma, vezes in sorted(repetidas.items()))
+        raise AssertionError(f"Consultas repetidas (limite {limite} por forma) — possível N+1:\n{detalhes}")
+
+
+class ClienteSemConsultasRepetidas(Client):
+    """Cliente de testes em que cada requisição passa por ``sem_consultas_repetidas``."""
+
+    limite_consultas_repetidas = LIMITE_CONSULTAS_REPETIDAS
+
+    def request(self, **request):
+        with sem_consultas_repetidas(self.limite_consultas_repetidas):
+            return super().request(**request)
+
+
+class SemConsultasRepetidasMixin:
+    """Testes de views: ``self.client`` falha em requisições com consultas repetidas.
+
+    O limite é ``limite_consultas_repetidas`` na classe; um teste que precise
+    de outro valor pode usar ``sem_consultas_repetidas`` diretamente.
+    """
+
+    client_class = ClienteSemConsultasRepetidas
+    limite_consultas_repetidas = LIMITE_CONSULTAS_REPETIDAS
+
+    def _pre_setup(self):
+        super()._pre_setup()
+        self.client.limite_consultas_repetidas = self.limite_consultas_repetidas
+
+    def novo_cliente(self, **kwargs):
+        cliente = self.client_class(**kwargs)
+        cliente.limite_consultas_repetidas = self.limite_consultas_repetidas
+        return cliente
 
 
 class CategoriaModelTest(TestCase):
@@ -102,12 +219,12 @@ class TarefaModelTest(TestCase):
         self.assertIn(tarefa, self.categoria.tarefas.all())
 
 
-class TarefaViewsTest(TestCase):
+class TarefaViewsTest(SemConsultasRepetidasMixin, TestCase):
     """Testes para as views de Tarefa"""
     
     def setUp(self):
         """Configura dados iniciais para os testes"""
-        self.client = Client()
+        self.client = self.novo_cliente()
         self.categoria = Categoria.objects.create(nome="Teste")
         self.tarefa_pendente = Tarefa.objects.create(
             titulo="Tarefa Pendente",
@@ -342,12 +459,12 @@ class CategoriaFormTest(TestCase):
         self.assertEqual(categoria.nome, 'Categoria Salva')
 
 
-class IntegrationTest(TestCase):
+class IntegrationTest(SemConsultasRepetidasMixin, TestCase):
     """Testes de integração"""
     
     def setUp(self):
         """Configura dados iniciais para os testes"""
-        self.client = Client()
+        self.client = self.novo_cliente()
         self.categoria = Categoria.objects.create(nome="Integração")
     
     def test_fluxo_completo_tarefa(self):
@@ -389,7 +506,7 @@ class IntegrationTest(TestCase):
 
 
 # Testes das funcionalidades existentes (buscas e filtros)
-class ListasBuscaTests(TestCase):
+class ListasBuscaTests(SemConsultasRepetidasMixin, TestCase):
     def setUp(self):
         hoje     = date.today()
         amanha   = hoje + timedelta(days=1)
@@ -427,7 +544,7 @@ class ListasBuscaTests(TestCase):
         resp = self.client.get(url)
         self.assertContains(resp, "Enviar email urgente")
         self.assertNotContains(resp, "Planejar férias")  # termo não aparece
-        self.assertEqual(resp.context["tarefas_pendentes"].count(), 1)
+        self.assertEqual(len(resp.context["tarefas_pendentes"]), 1)
 
     # 2 ─ Filtro por categoria em pendentes
     def test_filtro_categoria(self):
@@ -449,4 +566,1983 @@ class ListasBuscaTests(TestCase):
     def test_busca_vazia(self):
         url = reverse("tarefas_pendentes_list")  # sem q=
         resp = self.client.get(url)
-        self.assertEqual(resp.context["tarefas_pendentes"].count(), 2)
\ No newline at end of file
+        self.assertEqual(len(resp.context["tarefas_pendentes"]), 2)
+
+class CalendarioMensalQueriesTest(SemConsultasRepetidasMixin, TestCase):
+    """Garante que o calendário mensal usa um número constante de consultas"""
+
+    def setUp(self):
+        self.categoria = Categoria.objects.create(nome="Calendário")
+        self.url = reverse("calendario_mensal") + "?year=2030&month=3"
+
+    def _criar_tarefas(self, dias, por_dia):
+        Tarefa.objects.bulk_create([
+            Tarefa(
+                titulo=f"Tarefa {dia}-{n}",
+                descricao="Calendário",
+                data=date(2030, 3, dia),
+                status="pendente",
+                categoria=self.categoria,
+            )
+            for dia in range(1, dias + 1)
+            for n in range(por_dia)
+        ])
+
+    def test_calendario_sem_tarefas(self):
+        """Mês vazio executa uma única consulta"""
+        contagem_por_status()  # badges da navbar já em cache, medidos em ContadoresTarefasTest
+        listar_categorias()  # filtro de categorias em cache, medido em CategoriasEmCacheTest
+        regras()  # regras de recorrência (nenhuma) em cache, medidas em RecorrenciasTest
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_calendario_com_muitas_tarefas(self):
+        """Mais tarefas e mais dias não aumentam o número de consultas"""
+        self._criar_tarefas(dias=31, por_dia=3)
+        contagem_por_status()
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertContains(response, "Tarefa 31-2")
+
+    def test_calendario_agrupa_tarefas_por_dia(self):
+        """Cada célula recebe apenas as tarefas pendentes do seu dia"""
+        self._criar_tarefas(dias=2, por_dia=2)
+        Tarefa.objects.create(
+            titulo="Concluída", descricao="Fora do calendário",
+            data=date(2030, 3, 1), status="concluído", categoria=self.categoria,
+        )
+        response = self.client.get(self.url)
+        dias = {
+            celula["day"]: celula["pendentes"]
+            for semana in response.context["calendar_data"]
+            for celula in semana
+        }
+        self.assertEqual(len(dias[date(2030, 3, 1)]), 2)
+        self.assertEqual(len(dias[date(2030, 3, 2)]), 2)
+        self.assertEqual(dias[date(2030, 3, 3)], [])
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN é específico do SQLite")
+class IndicesTarefaTest(SemConsultasRepetidasMixin, TestCase):
+    """Verifica que as consultas principais das views usam índice e não ordenam em memória"""
+
+    def setUp(self):
+        self.categoria = Categoria.objects.create(nome="Índices")
+        Tarefa.objects.create(
+            titulo="Indexada", descricao="Plano de consulta",
+            data=date.today(), categoria=self.categoria,
+        )
+
+    def _planos(self, url, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url, params or {})
+        consultas = [q["sql"] for q in ctx.captured_queries
+                     if 'FROM "tarefas_tarefa"' in q["sql"]]
+        self.assertTrue(consultas)
+        planos = []
+        with connection.cursor() as cursor:
+            for sql in consultas:
+                cursor.execute("EXPLAIN QUERY PLAN " + sql)
+                planos.append(" | ".join(linha[-1] for linha in cursor.fetchall()))
+        return planos
+
+    def _assert_usa_indice(self, url, params=None):
+        for plano in self._planos(url, params):
+            self.assertIn("USING INDEX tarefa_status_", plano)
+            self.assertNotIn("TEMP B-TREE", plano)
+
+    def test_listas_usam_indice(self):
+        """Listas por status usam o índice (status, data, prioridade)"""
+        for nome in ("tarefas_pendentes_list", "tarefas_concluidas_list", "tarefas_adiadas_list"):
+            with self.subTest(view=nome):
+                self._assert_usa_indice(reverse(nome))
+
+    def test_filtro_categoria_usa_indice(self):
+        """Filtro por categoria usa o índice (status, categoria, data, prioridade)"""
+        for nome in ("tarefas_pendentes_list", "tarefas_concluidas_list", "tarefas_adiadas_list"):
+            with self.subTest(view=nome):
+                self._assert_usa_indice(reverse(nome), {"categoria": self.categoria.id})
+
+    def test_ordenacao_prioridade_usa_indice(self):
+        """Ordenar por prioridade percorre o índice (status, prioridade_rank, data)"""
+        for nome in ("tarefas_pendentes_list", "tarefas_concluidas_list", "tarefas_adiadas_list"):
+            with self.subTest(view=nome):
+                self._assert_usa_indice(reverse(nome), {"ordenar_por": "prioridade"})
+
+    def test_calendario_usa_indice(self):
+        """Calendário faz uma varredura de intervalo no índice"""
+        self._assert_usa_indice(reverse("calendario_mensal"))
+
+
+class PrioridadeRankTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes da coluna materializada prioridade_rank"""
+
+    def setUp(self):
+        self.categoria = Categoria.objects.create(nome="Rank")
+
+    def _nova(self, prioridade, **kwargs):
+        return Tarefa(descricao="Rank", data=date.today(), prioridade=prioridade,
+                      categoria=self.categoria, **kwargs)
+
+    def test_save_sincroniza_rank(self):
+        """save() recalcula o rank a partir da prioridade"""
+        tarefa = self._nova("alta")
+        tarefa.save()
+        self.assertEqual(tarefa.prioridade_rank, RANK_PRIORIDADE["alta"])
+
+        tarefa.prioridade = "baixa"
+        tarefa.save(update_fields=["prioridade"])
+        tarefa.refresh_from_db()
+        self.assertEqual(tarefa.prioridade_rank, RANK_PRIORIDADE["baixa"])
+
+    def test_operacoes_em_massa_sincronizam_rank(self):
+        """bulk_create, bulk_update e update mantêm o rank coerente"""
+        alta, baixa = Tarefa.objects.bulk_create([self._nova("alta"), self._nova("baixa")])
+        self.assertEqual(
+            sorted(Tarefa.objects.values_list("prioridade_rank", flat=True)),
+            [RANK_PRIORIDADE["alta"], RANK_PRIORIDADE["baixa"]],
+        )
+
+        alta.prioridade = "média"
+        Tarefa.objects.bulk_update([alta], ["prioridade"])
+        alta.refresh_from_db()
+        self.assertEqual(alta.prioridade_rank, RANK_PRIORIDADE["média"])
+
+        Tarefa.objects.filter(pk=baixa.pk).update(prioridade="alta")
+        baixa.refresh_from_db()
+        self.assertEqual(baixa.prioridade_rank, RANK_PRIORIDADE["alta"])
+
+    def test_ordenacao_por_prioridade(self):
+        """A lista ordena alta, média e baixa, desempatando pela data"""
+        amanha = date.today() + timedelta(days=1)
+        for prioridade, data in (("baixa", date.today()), ("alta", amanha),
+                                 ("média", date.today()), ("alta", date.today())):
+            tarefa = self._nova(prioridade)
+            tarefa.data = data
+            tarefa.save()
+        resp = self.client.get(reverse("tarefas_pendentes_list"), {"ordenar_por": "prioridade"})
+        ordem = [(t.prioridade, t.data) for t in resp.context["tarefas_pendentes"]]
+        self.assertEqual(ordem, [("alta", date.today()), ("alta", amanha),
+                                 ("média", date.today()), ("baixa", date.today())])
+
+
+@override_settings(TAREFAS_ITENS_POR_PAGINA=2)
+class PaginacaoKeysetTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes da paginação por cursor nas listas"""
+
+    def setUp(self):
+        categoria = Categoria.objects.create(nome="Páginas")
+        hoje = date.today()
+        prioridades = ["baixa", "alta", "média", "alta", "baixa"]
+        self.tarefas = [
+            Tarefa.objects.create(
+                titulo=f"Tarefa {i}", descricao="Paginação",
+                data=hoje + timedelta(days=i % 3), prioridade=prioridade,
+                categoria=categoria,
+            )
+            for i, prioridade in enumerate(prioridades)
+        ]
+        self.url = reverse("tarefas_pendentes_list")
+
+    def _percorrer(self, params):
+        ids, cursor, paginas = [], None, []
+        while True:
+            resp = self.client.get(self.url, {**params, **({"cursor": cursor} if cursor else {})})
+            pagina = resp.context["pagina"]
+            paginas.append(pagina)
+            ids += [t.id for t in resp.context["tarefas_pendentes"]]
+            cursor = pagina.cursor_proximo
+            if not cursor:
+                return ids, paginas
+
+    def test_percorre_todas_as_paginas_na_ordem(self):
+        """Avançar pelos cursores devolve a mesma ordem da lista completa"""
+        for ordenar_por, chaves in (("data", ("data", "prioridade", "id")),
+                                    ("prioridade", ("prioridade_rank", "data", "id"))):
+            with self.subTest(ordenar_por=ordenar_por):
+                ids, paginas = self._percorrer({"ordenar_por": ordenar_por})
+                esperado = list(Tarefa.objects.order_by(*chaves).values_list("id", flat=True))
+                self.assertEqual(ids, esperado)
+                self.assertEqual([len(p) for p in paginas], [2, 2, 1])
+
+    def test_volta_para_pagina_anterior(self):
+        """O cursor "anterior" devolve exatamente a página anterior"""
+        primeira = self.client.get(self.url).context["pagina"]
+        segunda = self.client.get(self.url, {"cursor": primeira.cursor_proximo}).context["pagina"]
+        self.assertTrue(segunda.tem_anterior)
+        volta = self.client.get(self.url, {"cursor": segunda.cursor_anterior}).context["pagina"]
+        self.assertEqual([t.id for t in volta], [t.id for t in primeira])
+        self.assertFalse(volta.tem_anterior)
+
+    def test_links_preservam_filtros(self):
+        """Os links de navegação mantêm ordenação e trocam apenas o cursor"""
+        resp = self.client.get(self.url, {"ordenar_por": "prioridade"})
+        self.assertContains(resp, "ordenar_por=prioridade&amp;cursor=")
+
+    def test_cursor_invalido_volta_para_primeira_pagina(self):
+        """Um cursor corrompido é ignorado"""
+        resp = self.client.get(self.url, {"cursor": "lixo!"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse(resp.context["pagina"].tem_anterior)
+        self.assertEqual(len(resp.context["tarefas_pendentes"]), 2)
+
+    def test_paginas_seguintes_nao_usam_offset(self):
+        """Páginas seguintes filtram pelo cursor em vez de usar OFFSET"""
+        primeira = self.client.get(self.url).context["pagina"]
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.url, {"cursor": primeira.cursor_proximo})
+        sql = [q["sql"] for q in ctx.captured_queries if 'FROM "tarefas_tarefa"' in q["sql"]]
+        self.assertEqual(len(sql), 1)
+        self.assertNotIn("OFFSET", sql[0])
+
+
+@skipUnless(connection.vendor == "sqlite", "Índice FTS5 específico do SQLite")
+class BuscaTextualTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes da busca textual com índice FTS5"""
+
+    def setUp(self):
+        self.trabalho = Categoria.objects.create(nome="Trabalho")
+        self.reuniao = Tarefa.objects.create(
+            titulo="Reunião de planejamento", descricao="Sala 3",
+            data=date.today(), categoria=self.trabalho,
+        )
+        self.relatorio = Tarefa.objects.create(
+            titulo="Relatório", descricao="Levar notas da reunião",
+            data=date.today() - timedelta(days=1), categoria=self.trabalho,
+        )
+        self.url = reverse("tarefas_pendentes_list")
+
+    def _ids(self, q, **params):
+        resp = self.client.get(self.url, {"q": q, **params})
+        return [t.id for t in resp.context["tarefas_pendentes"]]
+
+    def test_usa_backend_fts(self):
+        """Com a tabela FTS5 criada pela migração, o backend textual é escolhido"""
+        self.assertIsInstance(backend_busca("reunião"), BuscaSQLiteFTS)
+
+    def test_prefixo_e_acentos(self):
+        """Busca por prefixo e ignora acentos e maiúsculas"""
+        self.assertEqual(set(self._ids("REUNI")), {self.reuniao.id, self.relatorio.id})
+        self.assertEqual(self._ids("relatorio"), [self.relatorio.id])
+
+    def test_ordena_por_relevancia(self):
+        """Título pesa mais que descrição quando não há ordenação explícita"""
+        self.assertEqual(self._ids("reuniao"), [self.reuniao.id, self.relatorio.id])
+        self.assertEqual(self._ids("reuniao", ordenar_por="data"),
+                         [self.relatorio.id, self.reuniao.id])
+
+    def test_indice_acompanha_escritas(self):
+        """Triggers mantêm o índice em dia em updates, deletes e renomeações"""
+        self.reuniao.titulo = "Daily"
+        self.reuniao.save()
+        self.assertEqual(self._ids("daily"), [self.reuniao.id])
+
+        self.trabalho.nome = "Escritório"
+        self.trabalho.save()
+        self.assertEqual(len(self._ids("escritorio")), 2)
+
+        self.relatorio.delete()
+        self.assertEqual(self._ids("escritorio"), [self.reuniao.id])
+
+    def test_indice_verificado_no_banco_da_consulta(self):
+        """O índice é procurado no banco em que a consulta roda, que pode ser uma réplica"""
+        with mock.patch("tarefas.busca._tem_indice_textual", return_value=False) as tem_indice:
+            tarefas, ordenar_por = consultar_tarefas("pendente", "reunião", tarefas=Tarefa.objects.using("replica_1"))
+        tem_indice.assert_called_once_with("replica_1")
+        self.assertEqual(ordenar_por, "data")
+
+    @override_settings(TAREFAS_BUSCA="icontains")
+    def test_fallback_icontains(self):
+        """Com TAREFAS_BUSCA="icontains" a busca volta ao LIKE original"""
+        self.assertIsInstance(backend_busca("reunião"), BuscaIcontains)
+        self.assertEqual(self._ids("planejamento"), [self.reuniao.id])
+
+    def test_paginacao_por_relevancia(self):
+        """Os cursores também funcionam com a ordenação por relevância"""
+        with self.settings(TAREFAS_ITENS_POR_PAGINA=1):
+            resp = self.client.get(self.url, {"q": "reuniao"})
+            cursor = resp.context["pagina"].cursor_proximo
+            resp = self.client.get(self.url, {"q": "reuniao", "cursor": cursor})
+        self.assertEqual([t.id for t in resp.context["tarefas_pendentes"]], [self.relatorio.id])
+
+
+@override_settings(TAREFAS_ITENS_POR_PAGINA=1000)
+class ConsultasSemNMais1Test(SemConsultasRepetidasMixin, TestCase):
+    """Cada view executa um número fixo de consultas, seja qual for o volume de tarefas"""
+
+    # Lista: tarefas (com categoria), já que as do filtro vêm do cache; calendário: tarefas do mês
+    CONSULTAS = {
+        "tarefas_pendentes_list": 1,
+        "tarefas_concluidas_list": 1,
+        "tarefas_adiadas_list": 1,
+        "calendario_mensal": 1,
+    }
+
+    def _popular(self, quantidade):
+        categorias = [Categoria.objects.create(nome=f"Categoria {i}") for i in range(5)]
+        status = ["pendente", "concluído", "adiado"]
+        Tarefa.objects.bulk_create([
+            Tarefa(
+                titulo=f"Tarefa {i}", descricao="Volume",
+                data=date(2030, 3, 1 + i % 28), status=status[i % 3],
+                categoria=categorias[i % 5],
+            )
+            for i in range(quantidade)
+        ])
+
+    def _verificar(self, quantidade):
+        self._popular(quantidade)
+        contagem_por_status()  # badges da navbar já em cache, medidos em ContadoresTarefasTest
+        listar_categorias()  # filtro de categorias em cache, medido em CategoriasEmCacheTest
+        for nome, consultas in self.CONSULTAS.items():
+            with self.subTest(view=nome, tarefas=quantidade):
+                with self.assertNumQueries(consultas):
+                    response = self.client.get(reverse(nome), {"year": 2030, "month": 3})
+                self.assertEqual(response.status_code, 200)
+        # As linhas exibem a categoria sem consultas extras
+        self.assertContains(self.client.get(reverse("tarefas_pendentes_list")), "Categoria 0")
+
+    def test_uma_tarefa(self):
+        self._verificar(1)
+
+    def test_cem_tarefas(self):
+        self._verificar(100)
+
+    def test_mil_tarefas(self):
+        self._verificar(1000)
+
+    def test_colunas_nao_usadas_sao_adiadas(self):
+        """A consulta da lista junta a categoria e não carrega colunas dispensáveis"""
+        self._popular(1)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("tarefas_pendentes_list"))
+        sql = next(q["sql"] for q in ctx.captured_queries if 'FROM "tarefas_tarefa"' in q["sql"])
+        self.assertIn('JOIN "tarefas_categoria"', sql)
+        self.assertNotIn('"tarefas_tarefa"."status",', sql.split("FROM")[0])
+
+
+class TarefaListViewCacheTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes do cache de ids das listas e da sua invalidação"""
+
+    def setUp(self):
+        cache.clear()
+        self.categoria = Categoria.objects.create(nome="Cache")
+        self.tarefa = Tarefa.objects.create(
+            titulo="Em cache", descricao="Lista", data=date.today(), categoria=self.categoria,
+        )
+        self.url = reverse("tarefas_pendentes_list")
+
+    def _titulos(self, **params):
+        resp = self.client.get(self.url, params)
+        return [t.titulo for t in resp.context["tarefas_pendentes"]]
+
+    def test_recarga_identica_nao_consulta_tarefas(self):
+        """A segunda carga da mesma lista só consulta as categorias do filtro"""
+        self.client.get(self.url, {"q": "Cache"})
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.url, {"q": "  Cache "})
+        self.assertFalse([q for q in ctx.captured_queries if "tarefas_tarefa" in q["sql"]])
+        self.assertContains(resp, "Em cache")
+
+    def test_salvar_tarefa_invalida(self):
+        """save() e delete() de Tarefa descartam as listas em cache"""
+        self.assertEqual(self._titulos(), ["Em cache"])
+        self.tarefa.titulo = "Renomeada"
+        self.tarefa.save()
+        self.assertEqual(self._titulos(), ["Renomeada"])
+        self.tarefa.delete()
+        self.assertEqual(self._titulos(), [])
+
+    def test_operacoes_em_massa_invalidam(self):
+        """update() e bulk_create() também invalidam, mesmo sem sinais"""
+        self.assertEqual(self._titulos(), ["Em cache"])
+        Tarefa.objects.filter(pk=self.tarefa.pk).update(status="concluído")
+        self.assertEqual(self._titulos(), [])
+        Tarefa.objects.bulk_create([
+            Tarefa(titulo="Nova", descricao="Lista", data=date.today(), categoria=self.categoria),
+        ])
+        self.assertEqual(self._titulos(), ["Nova"])
+
+    def test_alterar_categoria_invalida(self):
+        """Renomear a categoria atualiza as linhas em cache"""
+        self.client.get(self.url)
+        self.categoria.nome = "Renomeada"
+        self.categoria.save()
+        self.assertContains(self.client.get(self.url), "Renomeada")
+
+    def test_escrita_em_outro_processo_invalida(self):
+        """Com as versões em arquivos, a escrita de outro processo descarta as listas deste"""
+        with tempfile.TemporaryDirectory() as pasta, override_settings(CACHES={
+            **settings.CACHES,
+            "versoes": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                        "LOCATION": pasta, "TIMEOUT": None},
+        }):
+            self.assertEqual(self._titulos(), ["Em cache"])
+            # O outro processo lê o mesmo diretório, mas não os caches deste
+            outro_processo = FileBasedCache(pasta, {"TIMEOUT": None})
+            with connection.cursor() as cursor:
+                cursor.execute("UPDATE tarefas_tarefa SET titulo = %s", ["De outro processo"])
+            outro_processo.incr(cache_tarefas.CHAVE_VERSAO)
+            self.assertEqual(self._titulos(), ["De outro processo"])
+
+    def test_views_compartilham_o_motor(self):
+        """As três listas são instâncias do mesmo TarefaListView"""
+        for nome, status in (("tarefas_pendentes_list", "pendente"),
+                             ("tarefas_concluidas_list", "concluído"),
+                             ("tarefas_adiadas_list", "adiado")):
+            view = resolve(reverse(nome)).func
+            self.assertIs(view.view_class, TarefaListView)
+            self.assertEqual(view.view_initkwargs["status"], status)
+
+
+class ContadoresTarefasTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes dos contadores por status e por categoria"""
+
+    def setUp(self):
+        cache.clear()
+        self.trabalho = Categoria.objects.create(nome="Trabalho")
+        self.lazer = Categoria.objects.create(nome="Lazer")
+        self.tarefa = Tarefa.objects.create(
+            titulo="Contada", descricao="Contador", data=date.today(), categoria=self.trabalho,
+        )
+
+    def _totais(self):
+        return {status: contagem_por_status().get(status, 0)
+                for status in ("pendente", "concluído", "adiado")}
+
+    def _esperado_por_count(self):
+        return {status: Tarefa.objects.filter(status=status).count()
+                for status in ("pendente", "concluído", "adiado")}
+
+    def test_transicoes_atualizam_contadores(self):
+        """Criar, concluir, mover, adiar e excluir mantêm os totais corretos"""
+        self.assertEqual(self._totais(), {"pendente": 1, "concluído": 0, "adiado": 0})
+        passos = [
+            ("concluir_tarefa", {"pendente": 0, "concluído": 1, "adiado": 0}),
+            ("mover_para_tarefas", {"pendente": 1, "concluído": 0, "adiado": 0}),
+            ("adiar_tarefa", {"pendente": 0, "concluído": 0, "adiado": 1}),
+            ("excluir_tarefa", {"pendente": 0, "concluído": 0, "adiado": 0}),
+        ]
+        for nome, esperado in passos:
+            with self.subTest(view=nome):
+                self.client.get(reverse(nome, kwargs={"tarefa_id": self.tarefa.id}))
+                self.assertEqual(self._totais(), esperado)
+                self.assertEqual(self._totais(), self._esperado_por_count())
+
+    def test_contadores_por_categoria(self):
+        """Criar pelo formulário e trocar de categoria ajustam os totais por categoria"""
+        self.client.post(reverse("adicionar_tarefa"), {
+            "titulo": "Nova", "descricao": "Contador", "data": date.today().strftime("%Y-%m-%d"),
+            "prioridade": "alta", "categoria": self.lazer.id,
+        })
+        self.assertEqual(contagem_por_categoria("pendente"), {self.trabalho.id: 1, self.lazer.id: 1})
+        self.tarefa.categoria = self.lazer
+        self.tarefa.save()
+        self.assertEqual(contagem_por_categoria("pendente"), {self.trabalho.id: 0, self.lazer.id: 2})
+
+    def test_badges_na_navbar(self):
+        """A navbar mostra os totais e, em cache, não consulta o banco"""
+        Tarefa.objects.create(titulo="Adiada", descricao="Contador", data=date.today(),
+                              status="adiado", categoria=self.lazer)
+        resp = self.client.get(reverse("adicionar_tarefa"))
+        self.assertContains(resp, 'Adiadas <span class="badge bg-secondary">1</span>', html=False)
+        with self.assertNumQueries(0):  # as categorias do formulário também vêm do cache
+            self.client.get(reverse("adicionar_tarefa"))
+
+    def test_recalcular_contadores(self):
+        """O comando reconstrói os totais depois de uma divergência"""
+        ContadorTarefas.objects.update(total=99)
+        out = StringIO()
+        call_command("recalcular_contadores", stdout=out)
+        self.assertEqual(self._totais(), self._esperado_por_count())
+        self.assertIn("pendente: 1", out.getvalue())
+
+
+class AcaoEmMassaTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes do endpoint de ações em massa"""
+
+    def setUp(self):
+        self.categoria = Categoria.objects.create(nome="Massa")
+        Tarefa.objects.bulk_create([
+            Tarefa(titulo=f"Lote {i}", descricao="Em massa", data=date.today(), categoria=self.categoria)
+            for i in range(500)
+        ])
+        self.ids = list(Tarefa.objects.values_list("id", flat=True))
+        self.url = reverse("acao_em_massa")
+
+    def _post(self, acao, ids, **extra):
+        return self.client.post(self.url, {"acao": acao, "ids": ids}, **extra)
+
+    def test_concluir_500_tarefas_com_poucas_consultas(self):
+        """Uma única instrução UPDATE conclui todo o lote"""
+        with self.assertNumQueries(3):  # SAVEPOINT + UPDATE + RELEASE
+            resp = self._post("concluir", self.ids, HTTP_ACCEPT="application/json")
+        self.assertEqual(resp.json(), {"acao": "concluir", "afetadas": 500})
+        self.assertEqual(Tarefa.objects.filter(status="concluído").count(), 500)
+        self.assertEqual(contagem_por_status()["concluído"], 500)
+
+    def test_conta_apenas_linhas_alteradas(self):
+        """Tarefas que já estão no status de destino não são contadas"""
+        self._post("adiar", self.ids[:10])
+        resp = self._post("adiar", self.ids[:20], HTTP_ACCEPT="application/json")
+        self.assertEqual(resp.json()["afetadas"], 10)
+        resp = self._post("mover", self.ids[:20], HTTP_ACCEPT="application/json")
+        self.assertEqual(resp.json()["afetadas"], 20)
+
+    def test_excluir_em_massa(self):
+        """Excluir remove as tarefas selecionadas e mantém as demais"""
+        with self.assertNumQueries(3):  # SAVEPOINT + DELETE + RELEASE
+            resp = self._post("excluir", self.ids[:300], HTTP_ACCEPT="application/json")
+        self.assertEqual(resp.json()["afetadas"], 300)
+        self.assertEqual(Tarefa.objects.count(), 200)
+        self.assertEqual(contagem_por_status()["pendente"], 200)
+
+    def test_formulario_html_redireciona_com_mensagem(self):
+        """Envio pelo formulário volta para a lista com uma mensagem"""
+        origem = reverse("tarefas_pendentes_list") + "?ordenar_por=prioridade"
+        resp = self.client.post(self.url, {"acao": "concluir", "ids": self.ids[:2], "next": origem},
+                                follow=True)
+        self.assertRedirects(resp, origem)
+        self.assertContains(resp, "2 tarefa(s) atualizada(s).")
+
+    def test_redirecionamento_externo_e_ignorado(self):
+        """Um next externo cai na lista de pendentes"""
+        resp = self.client.post(self.url, {"acao": "concluir", "ids": self.ids[:1],
+                                           "next": "https://exemplo.com/"})
+        self.assertRedirects(resp, reverse("tarefas_pendentes_list"))
+
+    def test_entrada_invalida(self):
+        """Ação desconhecida, seleção vazia ou GET são rejeitados"""
+        self.assertEqual(self._post("apagar", self.ids[:1]).status_code, 400)
+        self.assertEqual(self._post("concluir", []).status_code, 400)
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+    def test_listas_exibem_checkboxes(self):
+        """As listas trazem a seleção e as ações adequadas ao status"""
+        resp = self.client.get(reverse("tarefas_pendentes_list"))
+        self.assertContains(resp, f'name="ids" value="{self.ids[0]}"')
+        self.assertContains(resp, '<option value="concluir">')
+        resp = self.client.get(reverse("tarefas_adiadas_list"))
+        self.assertContains(resp, '<option value="mover">')
+        self.assertNotContains(resp, '<option value="adiar">')
+
+
+class TransicoesTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes do serviço de transições condicionais"""
+
+    def setUp(self):
+        self.categoria = Categoria.objects.create(nome="Transições")
+        self.tarefa = Tarefa.objects.create(
+            titulo="Transição", descricao="Status", data=date.today(), categoria=self.categoria,
+        )
+
+    def _url(self, nome, tarefa_id=None):
+        return reverse(nome, kwargs={"tarefa_id": tarefa_id or self.tarefa.id})
+
+    def test_transicao_e_um_unico_update(self):
+        """Concluir executa só o UPDATE condicional, sem SELECT prévio"""
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self._url("concluir_tarefa"))
+        queries = ctx.captured_queries
+        self.assertRedirects(resp, reverse("tarefas_pendentes_list"))
+        self.assertEqual(len(queries), 1)
+        sql = queries[0]["sql"]
+        self.assertTrue(sql.startswith('UPDATE "tarefas_tarefa" SET "status"'))
+        self.assertIn('"tarefas_tarefa"."status" IN', sql)
+
+    def test_exclusao_e_um_unico_delete(self):
+        """Excluir apaga com um único DELETE"""
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self._url("excluir_tarefa"))
+        self.assertEqual([q["sql"].split()[0] for q in ctx.captured_queries], ["DELETE"])
+        self.assertFalse(Tarefa.objects.filter(id=self.tarefa.id).exists())
+
+    def test_conflito_de_status(self):
+        """Transição a partir de um status inválido responde 409 e não altera a tarefa"""
+        self.client.get(self._url("concluir_tarefa"))
+        for nome in ("concluir_tarefa", "adiar_tarefa"):
+            with self.subTest(view=nome):
+                self.assertEqual(self.client.get(self._url(nome)).status_code, 409)
+        self.tarefa.refresh_from_db()
+        self.assertEqual(self.tarefa.status, "concluído")
+        self.client.get(self._url("mover_para_tarefas"))
+        self.assertEqual(self.client.get(self._url("mover_para_tarefas")).status_code, 409)
+
+    def test_tarefa_inexistente(self):
+        """Tarefa inexistente responde 404 em todas as transições"""
+        for nome in ("concluir_tarefa", "adiar_tarefa", "mover_para_tarefas", "excluir_tarefa"):
+            with self.subTest(view=nome):
+                self.assertEqual(self.client.get(self._url(nome, 99999)).status_code, 404)
+
+    def test_servico_levanta_excecoes(self):
+        """O serviço distingue tarefa inexistente de transição inválida"""
+        with self.assertRaises(Tarefa.DoesNotExist):
+            transicionar(99999, "adiar")
+        transicionar(self.tarefa.id, "adiar")
+        with self.assertRaises(TransicaoInvalida):
+            transicionar(self.tarefa.id, "adiar")
+
+
+class PerfilSQLiteTest(SimpleTestCase):
+    """Testes do perfil de produção do SQLite"""
+
+    def _conexao_em_arquivo(self, pasta, **opcoes):
+        config = {**connection.settings_dict, "NAME": os.path.join(pasta, "perfil.sqlite3"), "OPTIONS": opcoes}
+        return connections["default"].__class__(config, alias="perfil_sqlite")
+
+    def _pragma(self, conexao, nome):
+        with conexao.cursor() as cursor:
+            cursor.execute(f"PRAGMA {nome}")
+            return cursor.fetchone()[0]
+
+    @skipUnless(connection.vendor == "sqlite", "Perfil específico do SQLite")
+    @override_settings(TAREFAS_SQLITE_OTIMIZADO=True)
+    def test_connection_created_aplica_pragmas(self):
+        """Cada nova conexão recebe WAL, synchronous=NORMAL e os demais PRAGMAs"""
+        with tempfile.TemporaryDirectory() as pasta:
+            conexao = self._conexao_em_arquivo(pasta, timeout=20)
+            try:
+                self.assertEqual(self._pragma(conexao, "journal_mode"), "wal")
+                self.assertEqual(self._pragma(conexao, "synchronous"), 1)  # NORMAL
+                self.assertEqual(self._pragma(conexao, "temp_store"), 2)  # MEMORY
+                # O busy timeout é o OPTIONS["timeout"], sem PRAGMA que o sobrescreva
+                self.assertEqual(self._pragma(conexao, "busy_timeout"), 20000)
+                self.assertEqual(self._pragma(conexao, "cache_size"), PRAGMAS_PRODUCAO["cache_size"])
+            finally:
+                conexao.close()
+
+    @skipUnless(connection.vendor == "sqlite", "Perfil específico do SQLite")
+    @override_settings(TAREFAS_SQLITE_OTIMIZADO=False)
+    def test_perfil_desligado_mantem_padrao(self):
+        """Sem o perfil, o journal continua no modo padrão"""
+        with tempfile.TemporaryDirectory() as pasta:
+            conexao = self._conexao_em_arquivo(pasta)
+            try:
+                self.assertEqual(self._pragma(conexao, "journal_mode"), "delete")
+            finally:
+                conexao.close()
+
+    def test_estresse_concorrente(self):
+        """O teste de estresse roda os dois perfis e o de produção não trava"""
+        out = StringIO()
+        call_command("estresse_sqlite", duracao=0.3, escritores=2, leitores=4, linhas=200, stdout=out)
+        saida = out.getvalue()
+        self.assertIn("padrao", saida)
+        self.assertRegex(saida, r"producao .* erros=0")
+        self.assertIn("Ganho de vazão total", saida)
+
+
+@override_settings(TAREFAS_REPLICAS_LEITURA=["default"])
+class ReplicasLeituraTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes do roteamento de leituras para réplicas"""
+
+    def setUp(self):
+        cache.clear()
+        categoria = Categoria.objects.create(nome="Réplicas")
+        self.tarefa = Tarefa.objects.create(
+            titulo="Réplica", descricao="Roteada", data=date.today(), categoria=categoria,
+        )
+        # A "réplica" dos testes espelha o default; registra quando o roteador a escolhe
+        self.escolhas = []
+        patcher = mock.patch(
+            "tarefas.replicas.random.choice",
+            side_effect=lambda replicas: self.escolhas.append(replicas) or replicas[0],
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_listas_e_calendario_leem_da_replica(self):
+        """As views de leitura mandam as consultas para a réplica"""
+        for nome in ("tarefas_pendentes_list", "tarefas_concluidas_list", "calendario_mensal"):
+            self.escolhas.clear()
+            self.client.get(reverse(nome))
+            self.assertTrue(self.escolhas, nome)
+
+    def test_uma_replica_por_requisicao(self):
+        """Todas as leituras de uma requisição vão para a réplica sorteada na primeira"""
+        roteador = RoteadorReplicas()
+        with override_settings(TAREFAS_REPLICAS_LEITURA=["replica_1", "replica_2", "replica_3"]):
+            token = _estado.set({"replica": True, "primario": False, "escreveu": False, "alias": None})
+            try:
+                self.escolhas.clear()
+                aliases = {roteador.db_for_read(Tarefa) for _ in range(20)}
+            finally:
+                _estado.reset(token)
+        self.assertEqual(aliases, {"replica_1"})
+        self.assertEqual(len(self.escolhas), 1)
+
+    def test_demais_views_usam_o_primario(self):
+        """Fora das views de leitura, tudo vai para o primário"""
+        self.client.get(reverse("editar_tarefa", args=[self.tarefa.id]))
+        self.assertEqual(self.escolhas, [])
+
+    def test_redirect_apos_escrita_le_do_primario(self):
+        """Depois de uma escrita, o redirect para a lista não lê da réplica"""
+        resp = self.client.get(reverse("concluir_tarefa", args=[self.tarefa.id]), follow=True)
+        self.assertIn(COOKIE_PRIMARIO, self.client.cookies)
+        self.assertEqual(resp.redirect_chain[-1][0], reverse("tarefas_pendentes_list"))
+        self.assertEqual(self.escolhas, [])
+        self.assertNotIn(self.tarefa, resp.context["tarefas_pendentes"])
+
+    def test_leitura_sem_escrita_nao_grava_cookie(self):
+        """Só escritas em tarefas fazem o cliente grudar no primário"""
+        resp = self.client.get(reverse("tarefas_pendentes_list"))
+        self.assertNotIn(COOKIE_PRIMARIO, resp.cookies)
+
+    def test_cookie_expirado_volta_para_replica(self):
+        """Sem o cookie, as leituras voltam para a réplica"""
+        self.client.get(reverse("concluir_tarefa", args=[self.tarefa.id]))
+        self.client.cookies.pop(COOKIE_PRIMARIO)
+        self.client.get(reverse("tarefas_concluidas_list"))
+        self.assertTrue(self.escolhas)
+
+
+class ReplicaAtrasadaTest(TestCase):
+    """Uma réplica SQLite de verdade (arquivo próprio, sem MIRROR) que ainda não recebeu uma escrita"""
+
+    # Registrada só depois do setUpClass: o runner não cria um banco de teste
+    # para ela (o arquivo é a réplica) e a classe passa a permitir consultas nela
+    ALIAS = "replica_atrasada"
+
+    @classmethod
+    def setUpClass(cls):
+        # A réplica é uma cópia do primário vazio, que recebe a tarefa ainda "Antes"
+        cls.pasta = tempfile.TemporaryDirectory()
+        caminho = os.path.join(cls.pasta.name, "replica.sqlite3")
+        connection.ensure_connection()
+        copiar_sqlite(connection.connection, caminho)
+        super().setUpClass()
+        connections.settings[cls.ALIAS] = {**connection.settings_dict, "NAME": caminho}
+        cls.databases = {*cls.databases, cls.ALIAS}
+        categoria = Categoria.objects.using(cls.ALIAS).create(id=9001, nome="Réplica atrasada")
+        Tarefa.objects.using(cls.ALIAS).create(
+            id=9001, titulo="Antes", descricao="x", data=date.today(), categoria=categoria,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        connections[cls.ALIAS].close()
+        del connections[cls.ALIAS]
+        del connections.settings[cls.ALIAS]
+        del cls.databases
+        cls.pasta.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        caches["respostas"].clear()
+        categoria = Categoria.objects.create(id=9001, nome="Réplica atrasada")
+        self.tarefa = Tarefa.objects.create(
+            id=9001, titulo="Antes", descricao="x", data=date.today(), categoria=categoria,
+        )
+        # A escrita que a réplica ainda não recebeu
+        self.tarefa.titulo = "Depois"
+        self.tarefa.save()
+
+    @override_settings(TAREFAS_CACHE_RESPOSTAS=True)
+    def test_leitura_da_replica_nao_preenche_os_caches(self):
+        """O que veio da réplica atrasada não é servido a quem lê do primário"""
+        urls = [
+            reverse("tarefas_pendentes_list"),
+            reverse("modal_tarefa", args=[self.tarefa.id]),
+            reverse("calendario_mensal"),
+        ]
+        with override_settings(TAREFAS_REPLICAS_LEITURA=[self.ALIAS]):
+            for url in urls:
+                for _ in range(2):
+                    resp = self.client.get(url)
+                    self.assertContains(resp, "Antes")
+            self.client.cookies[COOKIE_PRIMARIO] = "1"
+            for url in urls:
+                with self.subTest(url=url):
+                    resp = self.client.get(url)
+                    self.assertContains(resp, "Depois")
+                    self.assertNotContains(resp, "Antes")
+
+
+class SincronizarReplicasTest(SimpleTestCase):
+    """Testes da cópia do primário para réplicas SQLite locais"""
+
+    def test_copia_banco_para_arquivo_de_replica(self):
+        """O arquivo da réplica recebe as tabelas e os dados do primário"""
+        with tempfile.TemporaryDirectory() as pasta:
+            primario = sqlite3.connect(os.path.join(pasta, "primario.sqlite3"))
+            primario.executescript(
+                "CREATE TABLE tarefa (titulo TEXT); INSERT INTO tarefa VALUES ('Réplica');"
+            )
+            caminho = os.path.join(pasta, "replica.sqlite3")
+            copiar_sqlite(primario, caminho)
+            primario.close()
+            replica = sqlite3.connect(caminho)
+            try:
+                titulos = replica.execute("SELECT titulo FROM tarefa").fetchall()
+            finally:
+                replica.close()
+        self.assertEqual(titulos, [("Réplica",)])
+
+    def test_sem_replicas_configuradas(self):
+        """Sem DB_REPLICAS o comando só avisa"""
+        out = StringIO()
+        with override_settings(TAREFAS_REPLICAS_LEITURA=[]):
+            call_command("sincronizar_replicas", stdout=out)
+        self.assertIn("Nenhuma réplica configurada", out.getvalue())
+
+
+class ApiTarefasTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes da API JSON"""
+
+    def setUp(self):
+        self.categoria = Categoria.objects.create(nome="API")
+        self.tarefas = [
+            Tarefa.objects.create(
+                titulo=f"Tarefa API {i}", descricao="Integração", data=date.today() + timedelta(days=i),
+                prioridade="alta" if i == 2 else "baixa", categoria=self.categoria,
+            )
+            for i in range(3)
+        ]
+        self.url = reverse("api_tarefas")
+
+    def _json(self, url, metodo="post", dados=None, **extra):
+        return getattr(self.client, metodo)(
+            url, json.dumps(dados or {}), content_type="application/json", **extra,
+        )
+
+    def test_lista_com_filtros_das_views(self):
+        """A lista aceita status, categoria e ordenar_por como as páginas HTML"""
+        Tarefa.objects.filter(id=self.tarefas[0].id).update(status="concluído")
+        resp = self.client.get(self.url, {"status": "pendente", "ordenar_por": "prioridade",
+                                          "categoria": self.categoria.id})
+        self.assertEqual(resp.status_code, 200)
+        titulos = [t["titulo"] for t in resp.json()["resultados"]]
+        self.assertEqual(titulos, ["Tarefa API 2", "Tarefa API 1"])
+        self.assertEqual(resp.json()["ordenar_por"], "prioridade")
+
+    def test_busca_textual(self):
+        """O parâmetro q usa o mesmo backend de busca das listas"""
+        Tarefa.objects.create(titulo="Relatório anual", descricao="Finanças", data=date.today(),
+                              categoria=self.categoria)
+        resp = self.client.get(self.url, {"q": "relatorio"})
+        self.assertEqual([t["titulo"] for t in resp.json()["resultados"]], ["Relatório anual"])
+
+    def test_fields_limita_campos_e_colunas(self):
+        """?fields= devolve só os campos pedidos e não lê as demais colunas"""
+        with CaptureQueriesContext(connection) as consultas:
+            resp = self.client.get(self.url, {"fields": "id,titulo"})
+        self.assertEqual(set(resp.json()["resultados"][0]), {"id", "titulo"})
+        sql = consultas.captured_queries[-1]["sql"]
+        self.assertNotIn('"descricao"', sql)
+        self.assertNotIn("tarefas_categoria", sql)
+
+    def test_fields_desconhecido(self):
+        """Campo inexistente em ?fields= é erro 400"""
+        resp = self.client.get(self.url, {"fields": "id,senha"})
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("senha", resp.json()["erro"])
+
+    def test_etag_304_sem_carregar_linhas(self):
+        """Coleção inalterada responde 304 com uma única consulta agregada"""
+        resp = self.client.get(self.url)
+        etag = resp["ETag"]
+        self.assertTrue(etag.startswith('"'))  # ETag forte
+        with self.assertNumQueries(1):
+            resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.content, b"")
+
+    def test_etag_muda_com_alteracoes(self):
+        """Edição, exclusão e renomear a categoria trocam o ETag"""
+        etags = [self.client.get(self.url)["ETag"]]
+        alteracoes = [
+            lambda: Tarefa.objects.filter(id=self.tarefas[0].id).update(titulo="Editada"),
+            lambda: self.tarefas[1].delete(),
+            lambda: Categoria.objects.get(id=self.categoria.id).save(),
+        ]
+        for alterar in alteracoes:
+            alterar()
+            etags.append(self.client.get(self.url, HTTP_IF_NONE_MATCH=etags[-1])["ETag"])
+        self.assertEqual(len(set(etags)), 4)
+        self.assertNotEqual(etags[0], self.client.get(self.url, {"fields": "id"})["ETag"])
+
+    def test_criar_tarefa(self):
+        """POST com JSON cria a tarefa e responde 201"""
+        resp = self._json(self.url, dados={
+            "titulo": "Nova", "descricao": "Pela API", "data": "2030-01-01",
+            "prioridade": "alta", "categoria": self.categoria.id,
+        })
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.json()["categoria"], {"id": self.categoria.id, "nome": "API"})
+        self.assertEqual(resp["Location"], reverse("api_tarefa", args=[resp.json()["id"]]))
+        self.assertEqual(Tarefa.objects.get(id=resp.json()["id"]).prioridade_rank, RANK_PRIORIDADE["alta"])
+
+    def test_criar_tarefa_invalida(self):
+        """Erros de validação e corpo que não é JSON"""
+        resp = self._json(self.url, dados={"titulo": "Sem data"})
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("data", resp.json()["erros"])
+        resp = self.client.post(self.url, {"titulo": "Formulário"})
+        self.assertEqual(resp.status_code, 415)
+
+    def test_detalhe_patch_e_if_match(self):
+        """PATCH altera só os campos enviados; If-Match desatualizado dá 412"""
+        url = reverse("api_tarefa", args=[self.tarefas[0].id])
+        etag = self.client.get(url)["ETag"]
+        resp = self._json(url, "patch", {"titulo": "Renomeada"}, HTTP_IF_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["titulo"], "Renomeada")
+        self.assertEqual(resp.json()["descricao"], "Integração")
+        resp = self._json(url, "patch", {"titulo": "Conflito"}, HTTP_IF_MATCH=etag)
+        self.assertEqual(resp.status_code, 412)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_detalhe_fields_e_exclusao(self):
+        """Detalhe com ?fields= e exclusão por DELETE"""
+        url = reverse("api_tarefa", args=[self.tarefas[0].id])
+        self.assertEqual(self.client.get(url, {"fields": "status"}).json(), {"status": "pendente"})
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_transicoes(self):
+        """Concluir/adiar/mover pela API, com 409 quando o status não permite"""
+        tarefa = self.tarefas[0]
+        url = reverse("api_transicao_tarefa", args=[tarefa.id, "concluir"])
+        self.assertEqual(self._json(url).json()["status"], "concluído")
+        self.assertEqual(self._json(url).status_code, 409)
+        url = reverse("api_transicao_tarefa", args=[tarefa.id, "mover"])
+        self.assertEqual(self._json(url).json()["status"], "pendente")
+        url = reverse("api_transicao_tarefa", args=[tarefa.id, "excluir"])
+        self.assertEqual(self._json(url).status_code, 404)
+
+    def test_transicao_por_formulario_exige_json(self):
+        """Sem token CSRF, um POST de formulário (de outro site) não altera a tarefa"""
+        tarefa = self.tarefas[0]
+        cliente = self.novo_cliente(enforce_csrf_checks=True)
+        for acao in ("concluir", "adiar"):
+            with self.subTest(acao=acao):
+                resp = cliente.post(reverse("api_transicao_tarefa", args=[tarefa.id, acao]), {"x": "1"})
+                self.assertEqual(resp.status_code, 415)
+        tarefa.refresh_from_db()
+        self.assertEqual(tarefa.status, "pendente")
+
+    def test_categorias(self):
+        """Lista com ETag, criação e edição de categorias"""
+        url = reverse("api_categorias")
+        resp = self.client.get(url)
+        self.assertEqual(resp.json()["resultados"][0]["nome"], "API")
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=resp["ETag"]).status_code, 304)
+        criada = self._json(url, dados={"nome": "Nova"})
+        self.assertEqual(criada.status_code, 201)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=resp["ETag"]).status_code, 200)
+        detalhe = reverse("api_categoria", args=[criada.json()["id"]])
+        self.assertEqual(self._json(detalhe, "put", {"nome": "Renomeada"}).json()["nome"], "Renomeada")
+
+
+class ExportacaoTarefasTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes da exportação em fluxo (view e comando)"""
+
+    def setUp(self):
+        self.casa = Categoria.objects.create(nome="Casa")
+        trabalho = Categoria.objects.create(nome="Trabalho")
+        Tarefa.objects.create(titulo="Lavar louça", descricao='Com "detergente", ok', data=date.today(),
+                              categoria=self.casa)
+        Tarefa.objects.create(titulo="Relatório", descricao="Mensal", data=date.today(),
+                              status="concluído", categoria=trabalho)
+        self.url = reverse("exportar_tarefas")
+
+    def _conteudo(self, resp):
+        return b"".join(resp.streaming_content).decode()
+
+    def test_csv_em_fluxo_com_todas_as_tarefas(self):
+        """Por padrão exporta tudo, inclusive concluídas, como CSV em fluxo"""
+        resp = self.client.get(self.url)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(resp["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn('filename="tarefas.csv"', resp["Content-Disposition"])
+        linhas = list(csv.reader(StringIO(self._conteudo(resp))))
+        self.assertEqual(linhas[0][:3], ["id", "titulo", "descricao"])
+        self.assertEqual([l[1] for l in linhas[1:]], ["Lavar louça", "Relatório"])
+        self.assertEqual(linhas[1][2], 'Com "detergente", ok')
+        self.assertEqual(linhas[2][6], "Trabalho")
+
+    def test_ndjson_com_filtros_das_listas(self):
+        """NDJSON respeita status, categoria e q"""
+        resp = self.client.get(self.url, {"formato": "ndjson", "status": "pendente", "categoria": self.casa.id})
+        self.assertEqual(resp["Content-Type"], "application/x-ndjson")
+        registros = [json.loads(l) for l in self._conteudo(resp).splitlines()]
+        self.assertEqual(len(registros), 1)
+        self.assertEqual(registros[0]["categoria"], "Casa")
+        self.assertEqual(registros[0]["data"], date.today().isoformat())
+        resp = self.client.get(self.url, {"formato": "ndjson", "q": "relatorio"})
+        self.assertEqual([json.loads(l)["titulo"] for l in self._conteudo(resp).splitlines()], ["Relatório"])
+
+    def test_formato_invalido(self):
+        """Formato desconhecido é erro 400"""
+        self.assertEqual(self.client.get(self.url, {"formato": "xml"}).status_code, 400)
+
+    def test_linhas_lidas_em_lotes(self):
+        """Com chunk_size menor que o total, todas as linhas saem, lote a lote"""
+        Tarefa.objects.bulk_create([
+            Tarefa(titulo=f"Lote {i}", descricao="x", data=date.today(), categoria=self.casa)
+            for i in range(25)
+        ])
+        out = StringIO()
+        call_command("exportar_tarefas", formato="ndjson", chunk_size=10, stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 27)
+
+    def test_comando_grava_arquivo(self):
+        """--saida grava a exportação num arquivo"""
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, "tarefas.csv")
+            call_command("exportar_tarefas", status="concluído", saida=caminho, stderr=StringIO())
+            with open(caminho, encoding="utf-8", newline="") as arquivo:
+                linhas = list(csv.reader(arquivo))
+        self.assertEqual([l[1] for l in linhas[1:]], ["Relatório"])
+
+
+class ImportacaoTarefasTest(TestCase):
+    """Testes do comando import_tarefas"""
+
+    def _importar(self, conteudo, extensao, *args):
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, f"tarefas{extensao}")
+            with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+                arquivo.write(conteudo)
+            out, err = StringIO(), StringIO()
+            call_command("import_tarefas", caminho, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_csv_cria_categorias_pelo_nome(self):
+        """Categorias existentes são reaproveitadas e as novas, criadas uma vez"""
+        casa = Categoria.objects.create(nome="Casa")
+        conteudo = (
+            "titulo,descricao,data,prioridade,status,categoria\n"
+            "Lavar louça,Cozinha,2030-01-01,alta,,Casa\n"
+            "Relatório,Mensal,2030-01-02,,concluído,Trabalho\n"
+            "Reunião,Semanal,2030-01-03,baixa,pendente,Trabalho\n"
+        )
+        out, err = self._importar(conteudo, ".csv")
+        self.assertEqual(err, "")
+        self.assertIn("3 de 3 tarefa(s) importada(s)", out)
+        self.assertIn("1 categoria(s) criada(s)", out)
+        self.assertIn("linhas/s", out)
+        self.assertEqual(Categoria.objects.filter(nome="Trabalho").count(), 1)
+        lavar = Tarefa.objects.get(titulo="Lavar louça")
+        self.assertEqual((lavar.categoria, lavar.status, lavar.prioridade_rank), (casa, "pendente", 1))
+        self.assertEqual(Tarefa.objects.get(titulo="Relatório").prioridade, "média")
+        self.assertEqual(contagem_por_status()["concluído"], 1)
+
+    def test_ndjson_com_erros_por_registro(self):
+        """Registros inválidos são relatados com o número e não impedem os demais"""
+        registros = [
+            {"titulo": "Válida", "descricao": "ok", "data": "2030-01-01", "categoria": "Geral"},
+            {"titulo": "Sem data", "descricao": "x", "categoria": "Geral"},
+            {"titulo": "Prioridade ruim", "descricao": "x", "data": "2030-01-01",
+             "prioridade": "urgente", "categoria": "Geral"},
+            {"titulo": "x" * 51, "descricao": "x", "data": "2030-01-01", "categoria": ""},
+        ]
+        conteudo = "\n".join(json.dumps(r) for r in registros) + "\n{quebrado\n"
+        out, err = self._importar(conteudo, ".ndjson", "--lote", "2")
+        self.assertIn("1 de 5 tarefa(s) importada(s), 4 erro(s)", out)
+        self.assertIn("registro 2: data:", err)
+        self.assertIn("registro 3: prioridade:", err)
+        self.assertRegex(err, r"registro 4: titulo: .*; categoria:")
+        self.assertIn("registro 5: JSON inválido", err)
+        self.assertEqual(list(Tarefa.objects.values_list("titulo", flat=True)), ["Válida"])
+
+    def test_registros_e_lotes_descartados_nao_criam_categorias(self):
+        """Só registros válidos criam categorias, e um lote desfeito desfaz as suas"""
+        registros = [
+            {"titulo": "Sem data", "descricao": "x", "categoria": "Órfã"},
+            {"titulo": "Válida", "descricao": "ok", "data": "2030-01-01", "categoria": "Do lote"},
+        ]
+        conteudo = "\n".join(json.dumps(r) for r in registros) + "\n"
+        with mock.patch.object(Tarefa.objects, "bulk_create", side_effect=DatabaseError("falhou")):
+            out, err = self._importar(conteudo, ".ndjson")
+        self.assertIn("0 de 2 tarefa(s) importada(s), 2 erro(s), 0 categoria(s) criada(s)", out)
+        self.assertIn("lote até o registro 2 descartado", err)
+        self.assertFalse(Categoria.objects.exists())
+        out, _ = self._importar(conteudo, ".ndjson")
+        self.assertIn("1 categoria(s) criada(s)", out)
+        self.assertEqual(list(Categoria.objects.values_list("nome", flat=True)), ["Do lote"])
+
+    def test_reimporta_exportacao(self):
+        """O CSV da exportação pode ser importado de volta"""
+        categoria = Categoria.objects.create(nome="Ida e volta")
+        Tarefa.objects.create(titulo="Exportada", descricao="Volta", data=date.today(),
+                              status="adiado", categoria=categoria)
+        exportado = StringIO()
+        call_command("exportar_tarefas", stdout=exportado)
+        Tarefa.objects.all().delete()
+        self._importar(exportado.getvalue(), ".csv")
+        tarefa = Tarefa.objects.get()
+        self.assertEqual((tarefa.titulo, tarefa.status, tarefa.categoria), ("Exportada", "adiado", categoria))
+
+    def test_lotes_em_poucas_consultas(self):
+        """As tarefas são inseridas em lotes, não uma a uma"""
+        Categoria.objects.create(nome="Geral")
+        conteudo = "".join(
+            json.dumps({"titulo": f"T{i}", "descricao": "x", "data": "2030-01-01", "categoria": "Geral"}) + "\n"
+            for i in range(300)
+        )
+        with CaptureQueriesContext(connection) as consultas:
+            self._importar(conteudo, ".ndjson", "--lote", "100")
+        inserts = [q for q in consultas.captured_queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(Tarefa.objects.count(), 300)
+
+    def test_formato_nao_deduzido(self):
+        """Sem extensão conhecida nem --formato o comando falha"""
+        with self.assertRaises(CommandError):
+            self._importar("", ".txt")
+
+
+class CalendarioFragmentosCacheTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes do cache de fragmentos do calendário"""
+
+    def setUp(self):
+        cache.clear()
+        self.categoria = Categoria.objects.create(nome="Fragmentos")
+        self.tarefa = Tarefa.objects.create(
+            titulo="Em cache", descricao="Calendário", data=date(2030, 3, 10), categoria=self.categoria,
+        )
+        self.url = reverse("calendario_mensal") + "?year=2030&month=3"
+        contagem_por_status()
+
+    def test_mes_inalterado_nao_consulta_o_banco(self):
+        """Repetir um mês sem alterações só lê o cache"""
+        primeira = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            segunda = self.client.get(self.url)
+        self.assertEqual(primeira.content, segunda.content)
+        self.assertContains(segunda, reverse("modal_dia", args=[2030, 3, 10]))
+
+    def test_salvar_tarefa_troca_a_versao(self):
+        """Editar ou excluir uma tarefa descarta as células em cache"""
+        self.client.get(self.url)
+        self.tarefa.titulo = "Renomeada"
+        self.tarefa.save()
+        contagem_por_status()
+        with self.assertNumQueries(1):
+            resp = self.client.get(self.url)
+        self.assertContains(resp, "Renomeada")
+        self.assertNotContains(resp, "Em cache")
+        self.tarefa.delete()
+        self.assertNotContains(self.client.get(self.url), "Renomeada")
+
+    def test_fragmentos_por_dia(self):
+        """Chaves por (dia, versão), separadas por mês da grade e pelo dia de hoje"""
+        self.client.get(self.url)
+        versao = versao_tarefas()
+        # 31/03 aparece no fim de março e no começo da grade de abril, com células próprias
+        dia = date(2030, 3, 31)
+        self.assertIsNotNone(cache.get(make_template_fragment_key(
+            "calendario_dia", [dia, versao, True, False],
+        )))
+        self.assertIsNone(cache.get(make_template_fragment_key(
+            "calendario_dia", [dia, versao, False, False],
+        )))
+        self.client.get(reverse("calendario_mensal") + "?year=2030&month=4")
+        self.assertIsNotNone(cache.get(make_template_fragment_key(
+            "calendario_dia", [dia, versao, False, False],
+        )))
+
+
+class ModaisSobDemandaTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes dos modais carregados sob demanda"""
+
+    def setUp(self):
+        cache.clear()
+        self.categoria = Categoria.objects.create(nome="Modais")
+        self.pendente = Tarefa.objects.create(
+            titulo="Pendente", descricao="Descrição só no modal", data=date(2030, 3, 10),
+            prioridade="alta", categoria=self.categoria,
+        )
+        self.concluida = Tarefa.objects.create(
+            titulo="Feita", descricao="Já foi", data=date(2030, 3, 10),
+            status="concluído", categoria=self.categoria,
+        )
+
+    def test_listas_nao_embutem_modais(self):
+        """As páginas levam só as linhas, com a URL do modal de cada uma"""
+        resp = self.client.get(reverse("tarefas_pendentes_list"))
+        self.assertContains(resp, 'data-modal-url="%s"' % reverse("modal_tarefa", args=[self.pendente.id]))
+        self.assertNotContains(resp, "Descrição só no modal")
+        self.assertContains(resp, 'id="modalRemoto"', count=1)
+        resp = self.client.get(reverse("calendario_mensal") + "?year=2030&month=3")
+        self.assertContains(resp, 'data-modal-url="%s"' % reverse("modal_dia", args=[2030, 3, 10]))
+        self.assertNotContains(resp, "Descrição só no modal")
+
+    def test_modal_da_tarefa_pelo_status(self):
+        """Pendentes têm concluir/adiar; as demais, mover para pendentes"""
+        resp = self.client.get(reverse("modal_tarefa", args=[self.pendente.id]))
+        self.assertContains(resp, "Descrição só no modal")
+        self.assertContains(resp, reverse("concluir_tarefa", args=[self.pendente.id]))
+        self.assertNotContains(resp, "<html")
+        resp = self.client.get(reverse("modal_tarefa", args=[self.concluida.id]))
+        self.assertContains(resp, reverse("mover_para_tarefas", args=[self.concluida.id]))
+        self.assertEqual(self.client.get(reverse("modal_tarefa", args=[9999])).status_code, 404)
+
+    def test_modal_do_dia(self):
+        """O modal do dia lista só as pendentes daquele dia"""
+        resp = self.client.get(reverse("modal_dia", args=[2030, 3, 10]))
+        self.assertContains(resp, "Tarefas de 10/03/2030")
+        self.assertContains(resp, reverse("modal_tarefa", args=[self.pendente.id]))
+        self.assertNotContains(resp, "Feita")
+        self.assertContains(self.client.get(reverse("modal_dia", args=[2030, 3, 11])), "Nenhuma tarefa neste dia")
+        self.assertEqual(self.client.get(reverse("modal_dia", args=[2030, 2, 30])).status_code, 404)
+
+    def test_modal_em_cache_ate_a_proxima_alteracao(self):
+        """O fragmento fica em cache por (tarefa, versão)"""
+        url = reverse("modal_tarefa", args=[self.pendente.id])
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        Tarefa.objects.filter(id=self.pendente.id).update(descricao="Nova descrição")
+        self.assertContains(self.client.get(url), "Nova descrição")
+
+
+class SettingsProducaoTest(SimpleTestCase):
+    """Testes do módulo de settings de produção e da escolha pelo ambiente"""
+
+    def test_escolha_pelo_ambiente(self):
+        """AMBIENTE=producao escolhe settings_producao; o resto, settings"""
+        from dia_organizado import ambiente
+        with mock.patch.dict(os.environ, {"AMBIENTE": "producao"}):
+            self.assertEqual(ambiente.modulo_settings(), "dia_organizado.settings_producao")
+        with mock.patch.dict(os.environ, {"AMBIENTE": "qualquer"}):
+            self.assertEqual(ambiente.modulo_settings(), "dia_organizado.settings")
+
+    def test_ajustes_de_producao(self):
+        """Sem debug, cached loader, conexões persistentes, GZip e ConditionalGet"""
+        producao = importlib.import_module("dia_organizado.settings_producao")
+        self.assertFalse(producao.DEBUG)
+        opcoes = producao.TEMPLATES[0]["OPTIONS"]
+        self.assertFalse(producao.TEMPLATES[0]["APP_DIRS"])
+        self.assertEqual(opcoes["loaders"][0][0], "django.template.loaders.cached.Loader")
+        self.assertNotIn("django.template.context_processors.debug", opcoes["context_processors"])
+        self.assertTrue(producao.DATABASES["default"]["CONN_HEALTH_CHECKS"])
+        self.assertGreater(producao.DATABASES["default"]["CONN_MAX_AGE"], 0)
+        posicao = producao.MIDDLEWARE.index("django.middleware.security.SecurityMiddleware") + 1
+        self.assertEqual(producao.MIDDLEWARE[posicao:posicao + 2], [
+            "django.middleware.gzip.GZipMiddleware",
+            "django.middleware.http.ConditionalGetMiddleware",
+        ])
+        self.assertTrue(producao.TAREFAS_CACHE_FORMULARIOS)
+        # Versões dos caches visíveis para todos os processos
+        self.assertEqual(producao.CACHES["versoes"]["BACKEND"],
+                         "django.core.cache.backends.filebased.FileBasedCache")
+        # As settings de desenvolvimento continuam intactas
+        self.assertTrue(settings.TEMPLATES[0]["APP_DIRS"])
+        self.assertNotIn("django.middleware.gzip.GZipMiddleware", settings.MIDDLEWARE)
+
+
+@override_settings(TAREFAS_CACHE_FORMULARIOS=True)
+class FormularioEmCacheTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes do cache do HTML do crispy nos formulários de tarefa"""
+
+    def setUp(self):
+        cache.clear()
+        self.categoria = Categoria.objects.create(nome="Formulário")
+        contagem_por_status()
+
+    def test_formulario_vazio_vem_do_cache(self):
+        """O segundo GET não consulta as categorias nem renderiza o crispy"""
+        url = reverse("adicionar_tarefa")
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            segunda = self.client.get(url)
+        self.assertContains(segunda, 'name="titulo"')
+        self.assertContains(segunda, "Formulário")
+
+    def test_nova_categoria_aparece_no_formulario(self):
+        """Criar uma categoria troca a versão e o formulário é refeito"""
+        url = reverse("adicionar_tarefa")
+        self.client.get(url)
+        Categoria.objects.create(nome="Recém-criada")
+        self.assertContains(self.client.get(url), "Recém-criada")
+
+    def test_data_inicial_invalida_nao_vai_para_o_cache(self):
+        """?data= que não é uma data renderiza sem cache"""
+        resp = self.client.get(reverse("adicionar_tarefa"), {"data": "x" * 20})
+        self.assertIsNone(resp.context["chave_formulario"])
+        resp = self.client.get(reverse("adicionar_tarefa"), {"data": "2030-01-01"})
+        self.assertIsNotNone(resp.context["chave_formulario"])
+
+    def test_formulario_com_erros_nao_usa_cache(self):
+        """Um POST inválido mostra os erros, sem cache"""
+        resp = self.client.post(reverse("adicionar_tarefa"), {"titulo": ""})
+        self.assertIsNone(resp.context["chave_formulario"])
+        self.assertContains(resp, "is-invalid")
+
+
+class ViewsAssincronasTest(TestCase):
+    """Testes das variantes assíncronas das listas e do calendário"""
+
+    def setUp(self):
+        cache.clear()
+        self.categoria = Categoria.objects.create(nome="Assíncrona")
+        self.tarefas = [
+            Tarefa.objects.create(
+                titulo=f"Async {i}", descricao="ASGI", data=date.today() + timedelta(days=i),
+                categoria=self.categoria,
+            )
+            for i in range(3)
+        ]
+        contagem_por_status()  # a barra de navegação não consulta o banco
+        regras()  # nem as regras de recorrência
+        self.factory = AsyncRequestFactory()
+
+    def _lista(self, **parametros):
+        with sem_consultas_repetidas():
+            return async_to_sync(tarefas_pendentes_list_async)(self.factory.get("/tarefas/", parametros))
+
+    def _calendario(self):
+        with sem_consultas_repetidas():
+            return async_to_sync(calendario_mensal_async)(self.factory.get("/tarefas/calendario/"))
+
+    def test_lista_assincrona_mostra_as_tarefas_em_ordem(self):
+        """A lista assíncrona traz as tarefas na ordem da lista síncrona, e as categorias do filtro"""
+        resp = self._lista()
+        self.assertEqual(resp.status_code, 200)
+        html = resp.content.decode()
+        posicoes = [html.index(tarefa.titulo) for tarefa in self.tarefas]
+        self.assertEqual(posicoes, sorted(posicoes))
+        self.assertIn("Assíncrona", html)
+
+    def test_lista_assincrona_usa_o_cache_das_listas(self):
+        """Na segunda vez, nem as tarefas nem as categorias são consultadas"""
+        self._lista()
+        with self.assertNumQueries(0):
+            self._lista()
+
+    def test_lista_assincrona_com_busca(self):
+        """A busca passa pelo mesmo backend das listas síncronas"""
+        html = self._lista(q="Async 1").content.decode()
+        self.assertIn("Async 1", html)
+        self.assertNotIn("Async 2", html)
+
+    def test_calendario_so_le_tarefas_sem_fragmentos(self):
+        """O calendário assíncrono só consulta as tarefas se faltar alguma célula no cache"""
+        with self.assertNumQueries(1):
+            resp = self._calendario()
+        self.assertIn("Async 0", resp.content.decode())
+        with self.assertNumQueries(0):
+            self.assertEqual(self._calendario().content, resp.content)
+
+    def test_celula_expirada_e_refeita_com_as_tarefas(self):
+        """Uma célula que sai do cache entre duas cargas volta com as tarefas do dia, não vazia"""
+        self._calendario()
+        hoje = date.today()
+        cache.delete(make_template_fragment_key("calendario_dia", [hoje, versao_tarefas(), True, True]))
+        with self.assertNumQueries(1):
+            self.assertIn("Async 0", self._calendario().content.decode())
+        with self.assertNumQueries(0):
+            self.assertIn("Async 0", self._calendario().content.decode())
+
+    def test_ler_da_replica_em_view_assincrona(self):
+        """O decorator mantém a leitura na réplica enquanto a corrotina roda"""
+        vistos = []
+
+        @ler_da_replica
+        async def view(request):
+            vistos.append(_estado.get()["replica"])
+            return HttpResponse()
+
+        self.assertTrue(iscoroutinefunction(view))
+        token = _estado.set({"replica": False, "primario": False, "escreveu": False, "alias": None})
+        try:
+            async_to_sync(view)(None)
+        finally:
+            _estado.reset(token)
+        self.assertEqual(vistos, [True])
+
+    def test_middleware_assincrono_grava_cookie_apos_escrita(self):
+        """O middleware das réplicas roda em modo assíncrono e vê a escrita feita na thread do ORM"""
+        async def get_response(request):
+            await Categoria.objects.acreate(nome="Escrita assíncrona")
+            return HttpResponse()
+
+        middleware = PrimarioAposEscritaMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        resp = async_to_sync(middleware)(self.factory.get("/"))
+        self.assertIn(COOKIE_PRIMARIO, resp.cookies)
+
+    def test_urls_usam_as_views_assincronas_quando_ligadas(self):
+        """TAREFAS_VIEWS_ASSINCRONAS troca as listas e o calendário pelas variantes assíncronas"""
+        import dia_organizado.urls
+        import tarefas.urls
+
+        def recarregar():
+            importlib.reload(tarefas.urls)
+            importlib.reload(dia_organizado.urls)
+            clear_url_caches()
+
+        try:
+            with override_settings(TAREFAS_VIEWS_ASSINCRONAS=True):
+                recarregar()
+                self.assertIs(resolve(reverse("calendario_mensal")).func, calendario_mensal_async)
+                lista = resolve(reverse("tarefas_adiadas_list")).func
+                self.assertIs(lista.view_class, TarefaListViewAsync)
+                self.assertEqual(lista.view_initkwargs["status"], "adiado")
+        finally:
+            recarregar()
+        self.assertIs(resolve(reverse("tarefas_adiadas_list")).func.view_class, TarefaListView)
+
+
+@override_settings(TAREFAS_CACHE_RESPOSTAS=True)
+class CacheRespostasTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes do cache de páginas inteiras das listas e do calendário"""
+
+    def setUp(self):
+        cache.clear()
+        caches["respostas"].clear()
+        self.categoria = Categoria.objects.create(nome="Respostas")
+        self.tarefa = Tarefa.objects.create(
+            titulo="Em cache", descricao="Página", data=date.today(), categoria=self.categoria,
+        )
+        self.url = reverse("tarefas_pendentes_list")
+        # A primeira visita cria o cookie do CSRF; essa resposta não é guardada
+        self.client.get(self.url)
+
+    def test_recarregar_a_lista_vem_do_cache(self):
+        """Com o cookie do CSRF, a segunda visita guarda e a terceira não consulta o banco"""
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            resp = self.client.get(self.url)
+        self.assertEqual(resp["X-Cache"], "HIT")
+        self.assertContains(resp, "Em cache")
+        self.assertContains(resp, "csrfmiddlewaretoken")
+
+    def test_pagina_sem_token_e_guardada_na_primeira_visita(self):
+        """O calendário não usa o token do CSRF; vale para qualquer navegador"""
+        url = reverse("calendario_mensal")
+        self.assertEqual(self.novo_cliente().get(url)["X-Cache"], "MISS")
+        self.assertEqual(self.novo_cliente().get(url)["X-Cache"], "HIT")
+
+    def test_alterar_tarefa_ou_categoria_invalida(self):
+        """Tarefas e categorias novas ou alteradas trocam a versão das páginas"""
+        self.client.get(self.url)
+        Tarefa.objects.create(titulo="Nova", descricao="x", data=date.today(), categoria=self.categoria)
+        resp = self.client.get(self.url)
+        self.assertEqual(resp["X-Cache"], "MISS")
+        self.assertContains(resp, "Nova")
+        self.categoria.nome = "Renomeada"
+        self.categoria.save()
+        resp = self.client.get(self.url)
+        self.assertEqual(resp["X-Cache"], "MISS")
+        self.assertContains(resp, "Renomeada")
+
+    def test_querystring_normalizada(self):
+        """Ordem dos parâmetros, espaços e parâmetros vazios não criam entradas novas"""
+        self.client.get(self.url, {"q": "em  cache", "categoria": "", "ordenar_por": "data"})
+        resp = self.client.get(f"{self.url}?ordenar_por=data&q=em+cache")
+        self.assertEqual(resp["X-Cache"], "HIT")
+        self.assertEqual(self.client.get(self.url, {"q": "outra"})["X-Cache"], "MISS")
+
+    def test_entradas_viram_a_meia_noite(self):
+        """O dia faz parte da chave, e a validade não passa da meia-noite"""
+        from tarefas import cache_respostas
+
+        class Amanha(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime.now(tz) + timedelta(days=1)
+
+        self.client.get(self.url)
+        with mock.patch.object(cache_respostas, "datetime", Amanha):
+            self.assertEqual(self.client.get(self.url)["X-Cache"], "MISS")
+        self.assertEqual(cache_respostas._timeout(datetime(2030, 1, 1, 23, 59, 30)), 30)
+        self.assertEqual(cache_respostas._timeout(datetime(2030, 1, 1, 8, 0)), settings.TAREFAS_CACHE_TIMEOUT)
+
+    def test_mensagens_pendentes_nao_usam_o_cache(self):
+        """Depois de uma ação em massa, a mensagem aparece em vez da página guardada"""
+        self.client.get(self.url)
+        self.client.get(self.url)
+        resp = self.client.post(
+            reverse("acao_em_massa"), {"acao": "adiar", "ids": [self.tarefa.id]}, follow=True,
+        )
+        self.assertContains(resp, "1 tarefa(s) atualizada(s).")
+        self.assertNotIn("X-Cache", resp)
+
+    def test_contadores_de_acertos_e_falhas(self):
+        """Acertos e falhas por view, lidos pela função e pelo comando"""
+        from tarefas.cache_respostas import estatisticas_respostas
+
+        caches["respostas"].clear()
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.assertEqual(estatisticas_respostas()["tarefas_pendentes_list"], {"acertos": 2, "falhas": 1})
+        saida = StringIO()
+        call_command("cache_respostas", "--zerar", stdout=saida)
+        self.assertIn("67%", saida.getvalue())
+        self.assertEqual(estatisticas_respostas()["tarefas_pendentes_list"], {"acertos": 0, "falhas": 0})
+
+    def test_desligado_por_padrao(self):
+        """Sem TAREFAS_CACHE_RESPOSTAS, as páginas são sempre renderizadas"""
+        with override_settings(TAREFAS_CACHE_RESPOSTAS=False):
+            self.assertNotIn("X-Cache", self.client.get(self.url))
+
+    def test_escrita_em_outro_processo_invalida_as_paginas(self):
+        """Páginas em arquivos e versões em arquivos: a escrita de outro processo gera MISS"""
+        with tempfile.TemporaryDirectory() as pasta, override_settings(CACHES={
+            **settings.CACHES,
+            "respostas": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": pasta},
+            "versoes": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                        "LOCATION": os.path.join(pasta, "versoes"), "TIMEOUT": None},
+        }):
+            self.client.get(self.url)
+            self.assertEqual(self.client.get(self.url)["X-Cache"], "HIT")
+            with connection.cursor() as cursor:
+                cursor.execute("UPDATE tarefas_tarefa SET titulo = %s", ["De outro processo"])
+            FileBasedCache(os.path.join(pasta, "versoes"), {"TIMEOUT": None}).incr(cache_tarefas.CHAVE_VERSAO)
+            resp = self.client.get(self.url)
+        self.assertEqual(resp["X-Cache"], "MISS")
+        self.assertContains(resp, "De outro processo")
+
+    def test_settings_guarda_versoes_com_as_paginas(self):
+        """Com CACHE_RESPOSTAS_DIR, as versões vão para arquivos no mesmo diretório"""
+        from dia_organizado import settings as modulo
+
+        with mock.patch.dict(os.environ, {"CACHE_RESPOSTAS_DIR": "/tmp/respostas"}):
+            self.addCleanup(importlib.reload, modulo)
+            importlib.reload(modulo)
+        self.assertEqual(modulo.CACHES["versoes"]["BACKEND"], "django.core.cache.backends.filebased.FileBasedCache")
+        self.assertEqual(modulo.CACHES["versoes"]["LOCATION"], os.path.join("/tmp/respostas", "versoes"))
+
+    def test_view_assincrona(self):
+        """O calendário assíncrono usa o mesmo cache"""
+        factory = AsyncRequestFactory()
+        view = async_to_sync(calendario_mensal_async)
+        self.assertEqual(view(factory.get("/tarefas/calendario/"))["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            resp = view(factory.get("/tarefas/calendario/"))
+        self.assertEqual(resp["X-Cache"], "HIT")
+        self.assertIn("Em cache", resp.content.decode())
+
+
+class SeedTarefasTest(TestCase):
+    """Testes do gerador de dados sintéticos (seed_tarefas)"""
+
+    def test_gera_categorias_e_tarefas(self):
+        """Cria a quantidade pedida, com os três status e os contadores em dia"""
+        saida = StringIO()
+        call_command("seed_tarefas", "--categorias", "3", "--tarefas", "300", "--lote", "70", stdout=saida)
+        self.assertIn("3 categoria(s), 300 tarefa(s) e 5 recorrência(s)", saida.getvalue())
+        self.assertEqual(Categoria.objects.count(), 3)
+        por_status = dict(Tarefa.objects.values_list("status").annotate(n=Count("id")).order_by())
+        self.assertEqual(set(por_status), {"pendente", "concluído", "adiado"})
+        self.assertEqual(contagem_por_status(), por_status)
+        self.assertFalse(Tarefa.objects.filter(categoria__isnull=True).exists())
+
+    def test_mesma_semente_mesmos_dados(self):
+        """Com --limpar e a mesma semente, os dados gerados se repetem"""
+        def titulos():
+            return list(Tarefa.objects.order_by("id").values_list("titulo", "data", "status"))
+
+        call_command("seed_tarefas", "--tarefas", "50", "--semente", "7", stdout=StringIO())
+        primeiros = titulos()
+        call_command("seed_tarefas", "--tarefas", "50", "--semente", "7", "--limpar", stdout=StringIO())
+        self.assertEqual(titulos(), primeiros)
+        self.assertEqual(Categoria.objects.count(), 10)
+
+
+class BenchmarkTarefasTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes do benchmark das URLs de tarefas"""
+
+    def setUp(self):
+        cache.clear()
+        semear(categorias=2, tarefas=300, semente=3)
+
+    def test_todas_as_urls_tem_cenario(self):
+        """Cada URL de tarefas/urls.py é medida, com status de sucesso"""
+        from tarefas import urls
+
+        resultados = medir_urls(self.novo_cliente(), requisicoes=2)
+        self.assertEqual(set(resultados), {padrao.name for padrao in urls.urlpatterns})
+        for nome, medidas in resultados.items():
+            self.assertNotIn("erro", medidas, nome)
+            self.assertTrue(all(codigo < 400 for codigo in medidas["status"]), (nome, medidas["status"]))
+            self.assertLessEqual(medidas["p50_ms"], medidas["p99_ms"])
+            self.assertGreater(medidas["pico_memoria_kb"], 0)
+        self.assertEqual(resultados["concluir_tarefa"]["status"], [302])
+        self.assertEqual(resultados["calendario_mensal"]["metodo"], "GET")
+
+    def test_comparar_aponta_regressoes(self):
+        """Mediana e memória com tolerância; consultas e status sem tolerância"""
+        base = {
+            "lista": {"p50_ms": 10.0, "consultas": 2.0, "pico_memoria_kb": 100.0, "status": [200]},
+            "nova": {"erro": "sem cenário"},
+        }
+        igual = {"lista": {**base["lista"], "p50_ms": 12.0}, "nova": {"erro": "sem cenário"}}
+        self.assertEqual(comparar(igual, base), [])
+        pior = {"lista": {"p50_ms": 20.0, "consultas": 3.0, "pico_memoria_kb": 1000.0, "status": [500]}}
+        self.assertEqual(
+            [metrica for _, metrica, _, _ in comparar(pior, base)],
+            ["p50_ms", "consultas", "pico_memoria_kb", "status"],
+        )
+
+
+@override_settings(TAREFAS_PERFIL=True, TAREFAS_PERFIL_INTERVALO=0)
+class PerfilRequisicoesTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes do middleware de perfil (SQL, templates, Server-Timing e agregado)"""
+
+    def setUp(self):
+        cache.clear()
+        limpar_agregado()
+        pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(pasta.cleanup)
+        self.settings_perfil = override_settings(TAREFAS_PERFIL_DIR=pasta.name)
+        self.settings_perfil.enable()
+        self.addCleanup(self.settings_perfil.disable)
+        self.categoria = Categoria.objects.create(nome="Perfil")
+        Tarefa.objects.create(titulo="Medida", descricao="x", data=date.today(), categoria=self.categoria)
+        self.client = self.novo_cliente()
+
+    def _timing(self, resp):
+        return {
+            parte.split(";")[0]: parte for parte in re.split(r",\s*(?=\w+;dur=)", resp["Server-Timing"])
+        }
+
+    def test_server_timing_e_log(self):
+        """A resposta traz sql, tpl, py e total; o log traz o mesmo registro em JSON"""
+        with self.assertLogs("tarefas.perfil", "INFO") as logs, CaptureQueriesContext(connection) as consultas:
+            resp = self.client.get(reverse("tarefas_pendentes_list"))
+        self.assertEqual(set(self._timing(resp)), {"sql", "tpl", "py", "total"})
+        registro = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(registro["url"], "tarefas_pendentes_list")
+        self.assertEqual(registro["status"], 200)
+        self.assertEqual(registro["consultas"], len(consultas))
+        self.assertGreater(registro["templates"], 1)
+        self.assertGreater(registro["template_ms"], 0)
+        self.assertIn(f'desc="{len(consultas)} consultas', self._timing(resp)["sql"])
+
+    def test_consultas_duplicadas(self):
+        """Consultas repetidas com os mesmos parâmetros são contadas como duplicadas"""
+        def get_response(request):
+            for _ in range(3):
+                list(Categoria.objects.filter(id=self.categoria.id))
+            list(Categoria.objects.filter(id=0))
+            return HttpResponse()
+
+        with self.assertLogs("tarefas.perfil", "INFO") as logs:
+            resp = PerfilMiddleware(get_response)(RequestFactory().get("/qualquer/"))
+        registro = json.loads(logs.records[-1].getMessage())
+        self.assertEqual((registro["consultas"], registro["duplicadas"]), (4, 2))
+        self.assertEqual(registro["url"], "/qualquer/")
+        self.assertIn('"4 consultas, 2 duplicadas"', resp["Server-Timing"])
+
+    def test_sql_dentro_do_template_nao_conta_como_template(self):
+        """Consultas feitas durante a renderização entram em sql, não em tpl"""
+        def get_response(request):
+            return HttpResponse(Template("{% for c in categorias %}{{ c }}{% endfor %}").render(
+                TemplateContext({"categorias": Categoria.objects.all()})
+            ))
+
+        with self.assertLogs("tarefas.perfil", "INFO") as logs:
+            PerfilMiddleware(get_response)(RequestFactory().get("/"))
+        registro = json.loads(logs.records[-1].getMessage())
+        self.assertEqual((registro["consultas"], registro["templates"]), (1, 1))
+        self.assertLess(registro["template_ms"], registro["total_ms"] - registro["sql_ms"] + 0.001)
+
+    def test_agregado_por_url_e_comando(self):
+        """O agregado em memória é gravado e lido pelo perfil_tarefas"""
+        with self.assertLogs("tarefas.perfil", "INFO"):
+            for _ in range(3):
+                self.client.get(reverse("calendario_mensal"))
+        self.assertEqual(agregado()["calendario_mensal"]["requisicoes"], 3)
+        saida = StringIO()
+        call_command("perfil_tarefas", "--json", stdout=saida)
+        self.assertEqual(json.loads(saida.getvalue())["calendario_mensal"]["requisicoes"], 3)
+        call_command("perfil_tarefas", "--limpar", stdout=StringIO())
+        saida = StringIO()
+        call_command("perfil_tarefas", stdout=saida)
+        self.assertIn("Nenhum perfil gravado", saida.getvalue())
+
+    def test_janela_guarda_so_as_ultimas(self):
+        """Cada URL guarda só as últimas TAREFAS_PERFIL_JANELA requisições"""
+        with override_settings(TAREFAS_PERFIL_JANELA=2), self.assertLogs("tarefas.perfil", "INFO"):
+            for _ in range(4):
+                self.client.get(reverse("modal_tarefa", args=[Tarefa.objects.get().id]))
+        self.assertEqual(agregado()["modal_tarefa"]["requisicoes"], 2)
+
+    def test_desligado_por_padrao(self):
+        """Sem TAREFAS_PERFIL o middleware sai da cadeia"""
+        with override_settings(TAREFAS_PERFIL=False):
+            with self.assertRaises(MiddlewareNotUsed):
+                PerfilMiddleware(lambda request: HttpResponse())
+            self.assertNotIn("Server-Timing", self.novo_cliente().get(reverse("tarefas_pendentes_list")))
+
+
+class CategoriasEmCacheTest(TestCase):
+    """Testes das categorias em cache (filtro das listas e TarefaForm)"""
+
+    def setUp(self):
+        cache.clear()
+        self.casa = Categoria.objects.create(nome="Casa")
+        self.trabalho = Categoria.objects.create(nome="Trabalho")
+
+    def test_consulta_uma_vez_por_versao(self):
+        """A primeira leitura consulta o banco; as seguintes, nem o cache compartilhado"""
+        with self.assertNumQueries(1):
+            self.assertEqual([c.nome for c in listar_categorias()], ["Casa", "Trabalho"])
+        cache.delete(f"tarefas:categorias:{cache_categorias.versao_categorias()}")
+        with self.assertNumQueries(0):
+            listar_categorias()
+
+    def test_outro_processo_le_do_cache_compartilhado(self):
+        """Sem a cópia local, a lista vem do cache do Django"""
+        listar_categorias()
+        with mock.patch.object(cache_categorias, "_local", (None, ())), self.assertNumQueries(0):
+            self.assertEqual(len(listar_categorias()), 2)
+
+    def test_categoria_criada_em_outro_processo(self):
+        """A cópia em memória é descartada quando outro processo troca a versão compartilhada"""
+        with tempfile.TemporaryDirectory() as pasta, override_settings(CACHES={
+            **settings.CACHES,
+            "versoes": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                        "LOCATION": pasta, "TIMEOUT": None},
+        }):
+            listar_categorias()
+            # O outro processo grava e troca a versão, sem passar pela memória deste
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO tarefas_categoria (nome, atualizado_em) VALUES (%s, %s)", ["Lazer", datetime.now()],
+                )
+            FileBasedCache(pasta, {"TIMEOUT": None}).incr(cache_categorias.CHAVE_VERSAO)
+            self.assertEqual([c.nome for c in listar_categorias()], ["Casa", "Trabalho", "Lazer"])
+            self.assertIn("Lazer", str(TarefaForm()["categoria"]))
+
+    def test_sinais_invalidam(self):
+        """Criar, renomear e excluir categorias troca a versão"""
+        listar_categorias()
+        lazer = Categoria.objects.create(nome="Lazer")
+        self.assertIn("Lazer", [c.nome for c in listar_categorias()])
+        lazer.nome = "Férias"
+        lazer.save()
+        self.assertIn("Férias", [c.nome for c in listar_categorias()])
+        lazer.delete()
+        self.assertEqual([c.nome for c in listar_categorias()], ["Casa", "Trabalho"])
+
+    def test_versao_assincrona(self):
+        """alistar_categorias compartilha as camadas com a versão síncrona"""
+        self.assertEqual(len(async_to_sync(alistar_categorias)()), 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(listar_categorias(), async_to_sync(alistar_categorias)())
+
+    def test_formulario_sem_consultas(self):
+        """As opções do TarefaForm vêm do cache; a validação só confere se a categoria ainda existe"""
+        listar_categorias()
+        with self.assertNumQueries(0):
+            html = str(TarefaForm()["categoria"])
+        form = TarefaForm(data={
+            "titulo": "Cache", "descricao": "x", "data": date.today(),
+            "prioridade": "alta", "categoria": self.trabalho.id,
+        })
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual([q["sql"].startswith('SELECT 1 AS "a"') for q in ctx.captured_queries], [True])
+        self.assertIn(f'<option value="{self.casa.id}">Casa</option>', html)
+        self.assertEqual(form.cleaned_data["categoria"], self.trabalho)
+
+    def test_formulario_recusa_categoria_inexistente(self):
+        """Um id fora do cache ainda passa pela validação padrão"""
+        form = TarefaForm(data={
+            "titulo": "Cache", "descricao": "x", "data": date.today(),
+            "prioridade": "alta", "categoria": 999,
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn("categoria", form.errors)
+
+
+class RecorrenciasTest(SemConsultasRepetidasMixin, TestCase):
+    """Testes das tarefas recorrentes: expansão por janela e materialização"""
+
+    def setUp(self):
+        cache.clear()
+        self.categoria = Categoria.objects.create(nome="Rotina")
+        self.outra = Categoria.objects.create(nome="Outra")
+        self.hoje = date.today()
+        self.semanal = Recorrencia.objects.create(
+            titulo="Reunião semanal", descricao="Com a equipe", categoria=self.categoria,
+            inicio=self.hoje, frequencia="semanal",
+        )
+        contagem_por_status()
+
+    def _regra(self, **campos):
+        return Recorrencia(titulo="Regra", descricao="x", categoria=self.categoria, **campos)
+
+    def test_datas_diarias_semanais_e_mensais(self):
+        """Intervalo, fim por data e por quantidade, e meses mais curtos"""
+        diaria = self._regra(inicio=date(2030, 1, 1), frequencia="diaria", intervalo=2, ate=date(2030, 1, 9))
+        self.assertEqual(
+            datas_ocorrencias(diaria, date(2029, 12, 1), date(2030, 2, 1)),
+            [date(2030, 1, d) for d in (1, 3, 5, 7, 9)],
+        )
+        semanal = self._regra(inicio=date(2030, 1, 2), frequencia="semanal", quantidade=3)
+        self.assertEqual(
+            datas_ocorrencias(semanal, date(2030, 1, 5), date(2030, 12, 31)),
+            [date(2030, 1, 9), date(2030, 1, 16)],
+        )
+        mensal = self._regra(inicio=date(2030, 1, 31), frequencia="mensal")
+        self.assertEqual(
+            datas_ocorrencias(mensal, date(2030, 2, 1), date(2030, 4, 30)),
+            [date(2030, 2, 28), date(2030, 3, 31), date(2030, 4, 30)],
+        )
+        self.assertEqual(datas_ocorrencias(mensal, date(2030, 2, 1), date(2030, 2, 27)), [])
+
+    def test_regra_antiga_numa_janela_curta(self):
+        """A janela é calculada direto, sem passar pelos dias desde o início da regra"""
+        diaria = self._regra(inicio=date(1900, 1, 1), frequencia="diaria", intervalo=3)
+        datas = datas_ocorrencias(diaria, date(2030, 3, 1), date(2030, 3, 9))
+        self.assertEqual(len(datas), 3)
+        self.assertTrue(all((data - date(1900, 1, 1)).days % 3 == 0 for data in datas))
+
+    def test_ocorrencias_nao_gravam_tarefas(self):
+        """O calendário mostra as ocorrências do mês sem criar linhas em Tarefa"""
+        proximo = (self.hoje.replace(day=1) + timedelta(days=32)).replace(day=1)
+        resp = self.client.get(reverse("calendario_mensal"), {"year": proximo.year, "month": proximo.month})
+        self.assertGreaterEqual(resp.content.decode().count("Reunião semanal"), 4)
+        self.assertFalse(Tarefa.objects.exists())
+
+    def test_views_assincronas(self):
+        """A lista e o calendário assíncronos também expandem as ocorrências"""
+        fabrica = AsyncRequestFactory()
+        lista = async_to_sync(tarefas_pendentes_list_async)(fabrica.get("/tarefas/"))
+        calendario = async_to_sync(calendario_mensal_async)(fabrica.get("/tarefas/calendario/"))
+        for resp in (lista, calendario):
+            self.assertIn("Reunião semanal", resp.content.decode())
+
+    def test_expansao_em_cache(self):
+        """Com as regras em cache, uma janela nova consulta só as materializadas, uma vez"""
+        regras()
+        fim = self.hoje + timedelta(days=30)
+        with self.assertNumQueries(1):
+            self.assertEqual(len(ocorrencias(self.hoje, fim)), 5)
+        with self.assertNumQueries(0):
+            ocorrencias(self.hoje, fim)
+
+    def test_lista_mostra_proximas_com_filtros(self):
+        """A lista de pendentes traz as próximas ocorrências, com o filtro de categoria e a busca"""
+        url = reverse("tarefas_pendentes_list")
+        resp = self.client.get(url)
+        self.assertContains(resp, "Próximas recorrentes")
+        self.assertContains(resp, reverse("modal_ocorrencia", args=[self.semanal.id, self.hoje.isoformat()]))
+        self.assertNotContains(self.client.get(url, {"categoria": self.outra.id}), "Reunião semanal")
+        self.assertNotContains(self.client.get(url, {"q": "dentista"}), "Reunião semanal")
+        self.assertContains(self.client.get(url, {"q": "equipe"}), "Reunião semanal")
+        self.assertNotContains(self.client.get(reverse("tarefas_concluidas_list")), "Reunião semanal")
+
+    def test_concluir_materializa_a_ocorrencia(self):
+        """Concluir cria a tarefa da ocorrência, que sai da expansão"""
+        resp = self.client.get(reverse("ocorrencia_tarefa", args=[self.semanal.id, self.hoje.isoformat(), "concluir"]))
+        self.assertEqual(resp.status_code, 302)
+        tarefa = Tarefa.objects.get()
+        self.assertEqual((tarefa.titulo, tarefa.status, tarefa.data), ("Reunião semanal", "concluído", self.hoje))
+        self.assertNotIn(self.hoje, [t.data for t in ocorrencias(self.hoje, self.hoje + timedelta(days=7))])
+        self.assertEqual(contagem_por_status().get("concluído"), 1)
+
+    def test_editar_e_excluir_nao_trazem_a_ocorrencia_de_volta(self):
+        """A ocorrência editada para outra data, ou excluída depois, não reaparece"""
+        data = (self.hoje + timedelta(days=7)).isoformat()
+        resp = self.client.get(reverse("ocorrencia_tarefa", args=[self.semanal.id, data, "editar"]))
+        tarefa = Tarefa.objects.get()
+        self.assertRedirects(resp, reverse("editar_tarefa", args=[tarefa.id]))
+        self.client.post(reverse("editar_tarefa", args=[tarefa.id]), {
+            "titulo": "Reunião remarcada", "descricao": "x", "data": self.hoje + timedelta(days=8),
+            "prioridade": "alta", "categoria": self.categoria.id,
+        })
+        janela = (self.hoje, self.hoje + timedelta(days=14))
+        self.assertEqual([t.data for t in ocorrencias(*janela)], [self.hoje, self.hoje + timedelta(days=14)])
+        self.client.get(reverse("excluir_tarefa", args=[tarefa.id]))
+        self.assertEqual(len(ocorrencias(*janela)), 2)
+        resp = self.client.get(reverse("ocorrencia_tarefa", args=[self.semanal.id, data, "concluir"]))
+        self.assertEqual(resp.status_code, 404)
+
+    def test_materializar_duas_vezes_devolve_a_mesma_tarefa(self):
+        """A segunda materialização da mesma ocorrência não cria outra tarefa"""
+        primeira = materializar(self.semanal.id, self.hoje)
+        self.assertEqual(materializar(self.semanal.id, self.hoje), primeira)
+        self.assertEqual(OcorrenciaMaterializada.objects.get().tarefa_id, primeira.id)
+
+    def test_data_sem_ocorrencia_e_invalida(self):
+        """Datas fora da regra, malformadas ou ações desconhecidas dão 404"""
+        amanha = (self.hoje + timedelta(days=1)).isoformat()
+        for args in (
+            [self.semanal.id, amanha, "concluir"],
+            [self.semanal.id, "2030-02-30", "concluir"],
+            [self.semanal.id, self.hoje.isoformat(), "excluir"],
+            [999, self.hoje.isoformat(), "adiar"],
+        ):
+            with self.subTest(args=args):
+                self.assertEqual(self.client.get(reverse("ocorrencia_tarefa", args=args)).status_code, 404)
+        self.assertEqual(self.client.get(reverse("modal_ocorrencia", args=[self.semanal.id, amanha])).status_code, 404)
+        self.assertFalse(Tarefa.objects.exists())
+
+    def test_modal_da_ocorrencia(self):
+        """O modal mostra a ocorrência com as ações que a materializam"""
+        resp = self.client.get(reverse("modal_ocorrencia", args=[self.semanal.id, self.hoje.isoformat()]))
+        self.assertContains(resp, "Com a equipe")
+        self.assertContains(resp, reverse("ocorrencia_tarefa", args=[self.semanal.id, self.hoje.isoformat(), "adiar"]))
+
+    def test_adicionar_recorrencia(self):
+        """O formulário cria a regra e recusa um fim antes do início"""
+        url = reverse("adicionar_recorrencia")
+        dados = {
+            "titulo": "Pagar aluguel", "descricao": "Todo dia 5", "prioridade": "alta",
+            "categoria": self.categoria.id, "inicio": date(2030, 1, 5), "frequencia": "mensal",
+            "intervalo": 1, "ate": date(2029, 1, 1),
+        }
+        self.assertContains(self.client.post(url, dados), "igual ou posterior")
+        dados["ate"] = ""
+        self.assertRedirects(self.client.post(url, dados), reverse("tarefas_pendentes_list"))
+        self.assertEqual(Recorrencia.objects.get(titulo="Pagar aluguel").frequencia, "mensal")
+
+
+class ConsultasRepetidasTest(TestCase):
+    """Testes do detector de N+1 usado nos testes de views"""
+
+    def setUp(self):
+        self.categorias = [Categoria.objects.create(nome=f"Detector {i}") for i in range(3)]
+        for categoria in self.categorias:
+            Tarefa.objects.create(titulo="Linha", descricao="x", data=date.today(), categoria=categoria)
+
+    def test_forma_ignora_parametros_e_tamanho_das_listas(self):
+        """Parâmetros, literais e listas de placeholders não mudam a forma"""
+        self.assertEqual(
+            forma_sql('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) LIMIT 21'),
+            forma_sql('SELECT *  FROM "t" WHERE "id" IN (%s) LIMIT 5'),
+        )
+        self.assertEqual(
+            forma_sql('INSERT INTO "t" ("a", "b") VALUES (%s, %s), (%s, %s)'),
+            forma_sql('INSERT INTO "t" ("a", "b") VALUES (%s, %s)'),
+        )
+        self.assertEqual(forma_sql("SELECT 'a' FROM \"T3\""), "SELECT ? FROM \"T3\"")
+
+    def test_categoria_lida_por_linha_falha(self):
+        """Ler a categoria de cada tarefa sem select_related é acusado"""
+        with self.assertRaisesMessage(AssertionError, "3x"):
+            with sem_consultas_repetidas():
+                [tarefa.categoria.nome for tarefa in Tarefa.objects.all()]
+        with sem_consultas_repetidas():
+            [tarefa.categoria.nome for tarefa in Tarefa.objects.select_related("categoria")]
+
+    def test_limite_configuravel(self):
+        """Até o limite as repetições passam"""
+        with sem_consultas_repetidas(limite=3) as contagem:
+            for categoria in self.categorias:
+                list(categoria.tarefas.all())
+        self.assertEqual(max(contagem.formas.values()), 3)
+
+    def test_cliente_checa_cada_requisicao(self):
+        """O cliente do mixin conta cada requisição separadamente e falha na que repete consultas"""
+        cliente = ClienteSemConsultasRepetidas()
+        for _ in range(2):
+            self.assertEqual(cliente.get(reverse("tarefas_pendentes_list")).status_code, 200)
+
+        def por_linha(request):
+            return HttpResponse(", ".join(tarefa.categoria.nome for tarefa in Tarefa.objects.all()))
+
+        with mock.patch("tarefas.views.TarefaListView.get", lambda self, request, *a, **k: por_linha(request)):
+            with self.assertRaisesMessage(AssertionError, "possível N+1"):
+                cliente.get(reverse("tarefas_pendentes_list"))
@@ -0,0 +1,67 @@
+"""Mudanças de status (concluir, adiar, mover para pendentes) e exclusão de tarefas.
+
+As operações agem direto no banco, com ``UPDATE``/``DELETE`` condicionais,
+sem carregar as linhas antes: ``UPDATE ... SET status = destino WHERE id = ?
+AND status IN (origens)``. O número de linhas afetadas diz se a transição
+aconteceu. Contadores e índice de busca são mantidos pelos triggers do banco,
+e o cache das listas pelo ``TarefaQuerySet``.
+"""
+from django.db import transaction
+
+from .models import Tarefa
+
+
+# Ação -> status de destino (None = excluir)
+ACOES = {
+    "concluir": "concluído",
+    "adiar": "adiado",
+    "mover": "pendente",
+    "excluir": None,
+}
+
+# Ação -> status de onde a tarefa pode sair
+ORIGENS = {
+    "concluir": ("pendente",),
+    "adiar": ("pendente",),
+    "mover": ("concluído", "adiado"),
+}
+
+LIMITE_EM_MASSA = 5000
+
+
+class TransicaoInvalida(Exception):
+    """A tarefa existe, mas não está num status que permite a ação."""
+
+
+def _aplicar(acao, tarefas):
+    if acao not in ACOES:
+        raise ValueError(f"Ação desconhecida: {acao!r}")
+    destino = ACOES[acao]
+    if destino is None:
+        _, por_modelo = tarefas.delete()
+        return por_modelo.get(Tarefa._meta.label, 0)
+    return tarefas.filter(status__in=ORIGENS[acao]).update(status=destino)
+
+
+def transicionar(tarefa_id, acao):
+    """Aplica ``acao`` a uma tarefa com uma única instrução condicional.
+
+    Levanta ``Tarefa.DoesNotExist`` se a tarefa não existe e
+    ``TransicaoInvalida`` se ela não está num status de origem válido.
+    """
+    tarefas = Tarefa.objects.filter(id=tarefa_id)
+    if _aplicar(acao, tarefas):
+        return
+    # Nenhuma linha afetada: só agora consulta para distinguir 404 de conflito
+    if tarefas.exists():
+        raise TransicaoInvalida(f"Não é possível {acao} a tarefa {tarefa_id} no status atual.")
+    raise Tarefa.DoesNotExist(f"Tarefa {tarefa_id} não encontrada.")
+
+
+def aplicar_em_massa(acao, ids):
+    """Aplica ``acao`` às tarefas de ``ids`` numa única instrução; devolve as linhas afetadas.
+
+    Tarefas fora dos status de origem da ação são ignoradas e não contam.
+    """
+    with transaction.atomic():
+        return _aplicar(acao, Tarefa.objects.filter(id__in=ids))
@@ -1,17 +1,43 @@
+from django.conf import settings
 from django.urls import path
-from .import views
+from .import api, views
 
 
+# Sob ASGI (TAREFAS_VIEWS_ASSINCRONAS), listas e calendário não passam pela
+# thread de adaptação das views síncronas
+if settings.TAREFAS_VIEWS_ASSINCRONAS:
+    pendentes, concluidas, adiadas, calendario = (
+        views.tarefas_pendentes_list_async, views.tarefas_concluidas_list_async,
+        views.tarefas_adiadas_list_async, views.calendario_mensal_async,
+    )
+else:
+    pendentes, concluidas, adiadas, calendario = (
+        views.tarefas_pendentes_list, views.tarefas_concluidas_list,
+        views.tarefas_adiadas_list, views.calendario_mensal,
+    )
+
 urlpatterns = [
-    path("", views.tarefas_pendentes_list, name="tarefas_pendentes_list"),
+    path("", pendentes, name="tarefas_pendentes_list"),
     path("<int:tarefa_id>/concluir/", views.concluir_tarefa, name="concluir_tarefa"),
     path("<int:tarefa_id>/excluir/", views.excluir_tarefa, name="excluir_tarefa"),
     path("<int:tarefa_id>/adiar/", views.adiar_tarefa, name="adiar_tarefa"),
     path("adicionar_tarefa/", views.adicionar_tarefa, name="adicionar_tarefa"),
     path("<int:tarefa_id>/editar", views.editar_tarefa, name="editar_tarefa"),
     path("criar_categoria/", views.criar_categoria, name="criar_categoria"),
-    path("concluidas/", views.tarefas_concluidas_list, name="tarefas_concluidas_list"),
-    path("adiadas/", views.tarefas_adiadas_list, name="tarefas_adiadas_list"),
+    path("concluidas/", concluidas, name="tarefas_concluidas_list"),
+    path("adiadas/", adiadas, name="tarefas_adiadas_list"),
+    path("<int:tarefa_id>/modal/", views.modal_tarefa, name="modal_tarefa"),
     path("<int:tarefa_id>/mover-para-lista-de-tarefas/", views.mover_para_tarefas, name="mover_para_tarefas"),
-    path("calendario/", views.calendario_mensal, name="calendario_mensal"),
+    path("acoes-em-massa/", views.acao_em_massa, name="acao_em_massa"),
+    path("recorrencias/adicionar/", views.adicionar_recorrencia, name="adicionar_recorrencia"),
+    path("recorrencias/<int:recorrencia_id>/<str:data>/modal/", views.modal_ocorrencia, name="modal_ocorrencia"),
+    path("recorrencias/<int:recorrencia_id>/<str:data>/<str:acao>/", views.ocorrencia_tarefa, name="ocorrencia_tarefa"),
+    path("exportar/", views.exportar_tarefas, name="exportar_tarefas"),
+    path("calendario/", calendario, name="calendario_mensal"),
+    path("calendario/<int:ano>/<int:mes>/<int:dia>/", views.modal_dia, name="modal_dia"),
+    path("api/tarefas/", api.tarefas_api, name="api_tarefas"),
+    path("api/tarefas/<int:tarefa_id>/", api.tarefa_api, name="api_tarefa"),
+    path("api/tarefas/<int:tarefa_id>/<str:acao>/", api.transicao_tarefa_api, name="api_transicao_tarefa"),
+    path("api/categorias/", api.categorias_api, name="api_categorias"),
+    path("api/categorias/<int:categoria_id>/", api.categoria_api, name="api_categoria"),
 ]
\ No newline at end of file
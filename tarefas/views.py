@@ -1,47 +1,189 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.db import router
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
+from django.core.cache import cache
 from django.shortcuts import render, redirect, get_object_or_404
-from .models import Tarefa, Categoria
-from .forms import TarefaForm, CategoriaForm
+from django.template.loader import render_to_string
+from django.utils.http import url_has_allowed_host_and_scheme
+from .models import Recorrencia, Tarefa
+from .forms import CategoriaForm, RecorrenciaForm, TarefaForm
+from .consultas import CHAVES_ORDENACAO, consultar_tarefas, filtros_da_requisicao, tarefas_para_listagem
+from .exportacao import FORMATOS, exportar, linhas_exportacao
+from .cache_tarefas import (
+    achave_lista, aguardar_lista, aobter_linhas, aobter_lista, aversao_tarefas,
+    chave_lista, guardar_lista, obter_linhas, obter_lista, timeout_cache, versao_tarefas,
+)
+from .transicoes import ACOES, LIMITE_EM_MASSA, TransicaoInvalida, aplicar_em_massa, transicionar
+from .paginacao import PaginaKeyset, apaginar, itens_por_pagina, paginar
+from .replicas import leitura_em_replica, ler_da_replica
+from .cache_respostas import cache_resposta
+from .cache_categorias import alistar_categorias, listar_categorias
+from .recorrencias import datas_ocorrencias, dias_na_lista, filtrar_ocorrencias, materializar, ocorrencia, ocorrencias
 from datetime import date, timedelta
-from django.db.models import Case, When, Value, IntegerField, Q
+from django.utils.decorators import method_decorator
+from django.utils.functional import SimpleLazyObject
+from django.views import View
 from django.views.decorators.http import require_http_methods
+import asyncio
 import calendar
+from collections import defaultdict
+from functools import partial
+from itertools import chain
 
 
-def tarefas_pendentes_list(request):
-    busca = request.GET.get("q", "").strip()
-    categoria_id = request.GET.get('categoria')
-    ordenar_por = request.GET.get('ordenar_por', 'data')
-    tarefas_pendentes = Tarefa.objects.filter(status="pendente")
-    if busca:
-        tarefas_pendentes = tarefas_pendentes.filter(
-            Q(titulo__icontains=busca) |
-            Q(descricao__icontains=busca) |
-            Q(categoria__nome__icontains=busca)
+@method_decorator(cache_resposta, name="dispatch")
+@method_decorator(ler_da_replica, name="dispatch")
+class TarefaListView(View):
+    """Lista de tarefas de um status, com busca, filtro, ordenação e paginação.
+
+    Os ids de cada página ficam em cache, indexados pelos parâmetros
+    normalizados; recarregar a mesma lista não consulta as tarefas no banco.
+    """
+    status = None
+    template_name = None
+    nome_contexto = None
+    acoes_em_massa = ()
+
+    def _parametros(self, request):
+        busca = " ".join(request.GET.get("q", "").split())
+        categoria_id = request.GET.get('categoria')
+        return {
+            'busca': busca,
+            'categoria_id': categoria_id,
+            'categoria_filtro': int(categoria_id) if categoria_id and categoria_id.isdigit() else None,
+            'ordenar_por': request.GET.get('ordenar_por', ''),
+            'cursor': request.GET.get('cursor') or None,
+            'tamanho': itens_por_pagina(),
+        }
+
+    def _chave(self, p):
+        return dict(
+            status=self.status, busca=p['busca'], categoria=p['categoria_filtro'],
+            ordenar_por=p['ordenar_por'], cursor=p['cursor'], tamanho=p['tamanho'],
         )
-    if categoria_id:
-        tarefas_pendentes = tarefas_pendentes.filter(categoria_id=categoria_id)
-    if ordenar_por == 'prioridade':
-        tarefas_pendentes = tarefas_pendentes.annotate(
-            prioridade_order=Case(
-                When(prioridade='alta', then=Value(1)),
-                When(prioridade='média', then=Value(2)),
-                When(prioridade='baixa', then=Value(3)),
-                output_field=IntegerField(),
+
+    def _ocorrencias(self, p):
+        # As tarefas recorrentes dos próximos dias, acima da primeira página
+        if self.status != 'pendente' or p['cursor']:
+            return []
+        hoje = date.today()
+        return filtrar_ocorrencias(
+            ocorrencias(hoje, hoje + timedelta(days=dias_na_lista())), p['categoria_filtro'], p['busca'],
+        )
+
+    def _contexto(self, p, pagina, ordenar_por, categorias, ocorrencias):
+        return {
+            self.nome_contexto: pagina.itens,
+            'pagina': pagina,
+            'ocorrencias': ocorrencias,
+            'acoes_em_massa': self.acoes_em_massa,
+            'categorias': categorias,
+            'categoria_selecionada': p['categoria_id'],
+            'ordenar_por': ordenar_por,
+            'today': date.today(),
+            'q': p['busca'],
+        }
+
+    def get(self, request):
+        p = self._parametros(request)
+        chave = chave_lista(**self._chave(p))
+        entrada = obter_lista(chave)
+        if entrada is None:
+            tarefas, ordenar_por = consultar_tarefas(
+                self.status, busca=p['busca'], categoria_id=p['categoria_filtro'], ordenar_por=p['ordenar_por'],
             )
-        ).order_by('prioridade_order', 'data')
-    else:
-        tarefas_pendentes = tarefas_pendentes.order_by('data', 'prioridade')
-
-    categorias = Categoria.objects.all()
-    context = {
-        'tarefas_pendentes': tarefas_pendentes,
-        'categorias': categorias,
-        'categoria_selecionada': categoria_id,
-        'ordenar_por': ordenar_por,
-        'today': date.today(),
-        'q': busca,
-    }
-    return render(request, "tarefas/tarefas_pendentes.html", context)
+            pagina = paginar(tarefas, CHAVES_ORDENACAO[ordenar_por], p['cursor'], p['tamanho'])
+            guardar_lista(chave, pagina, ordenar_por)
+        else:
+            ordenar_por = entrada['ordenar_por']
+            pagina = PaginaKeyset(
+                obter_linhas(entrada['ids'], tarefas_para_listagem()),
+                entrada['cursor_anterior'], entrada['cursor_proximo'],
+            )
+
+        contexto = self._contexto(p, pagina, ordenar_por, listar_categorias(), self._ocorrencias(p))
+        return render(request, self.template_name, contexto)
+
+
+class TarefaListViewAsync(TarefaListView):
+    """Variante assíncrona de ``TarefaListView``, usada sob ASGI (ver ``urls.py``).
+
+    A página de tarefas e as categorias do filtro (``alistar_categorias``)
+    são lidas ao mesmo tempo; o template continua síncrono, renderizado numa
+    thread porque o contador da barra de navegação pode consultar o banco.
+    """
+
+    # O dispatch herdado devolveria a corrotina antes de ela rodar, fora da réplica
+    @method_decorator(cache_resposta)
+    @method_decorator(ler_da_replica)
+    async def dispatch(self, request, *args, **kwargs):
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def _pagina(self, p):
+        chave = await achave_lista(**self._chave(p))
+        entrada = await aobter_lista(chave)
+        if entrada is not None:
+            linhas = await aobter_linhas(entrada['ids'], tarefas_para_listagem())
+            pagina = PaginaKeyset(linhas, entrada['cursor_anterior'], entrada['cursor_proximo'])
+            return pagina, entrada['ordenar_por']
+        # O backend de busca pode inspecionar o banco na primeira vez
+        tarefas, ordenar_por = await sync_to_async(consultar_tarefas)(
+            self.status, busca=p['busca'], categoria_id=p['categoria_filtro'], ordenar_por=p['ordenar_por'],
+        )
+        pagina = await apaginar(tarefas, CHAVES_ORDENACAO[ordenar_por], p['cursor'], p['tamanho'])
+        await aguardar_lista(chave, pagina, ordenar_por)
+        return pagina, ordenar_por
+
+    async def get(self, request):
+        p = self._parametros(request)
+        (pagina, ordenar_por), categorias, ocorrencias = await asyncio.gather(
+            self._pagina(p),
+            alistar_categorias(),
+            sync_to_async(self._ocorrencias)(p),
+        )
+        return await sync_to_async(render)(
+            request, self.template_name, self._contexto(p, pagina, ordenar_por, categorias, ocorrencias),
+        )
+
+
+tarefas_pendentes_list = TarefaListView.as_view(
+    status="pendente",
+    template_name="tarefas/tarefas_pendentes.html",
+    nome_contexto="tarefas_pendentes",
+    acoes_em_massa=(("concluir", "Concluir"), ("adiar", "Adiar"), ("excluir", "Excluir")),
+)
+tarefas_concluidas_list = TarefaListView.as_view(
+    status="concluído",
+    template_name="tarefas/tarefas_concluidas.html",
+    nome_contexto="tarefas_concluidas",
+    acoes_em_massa=(("mover", 'Mover para "Tarefas Pendentes"'), ("excluir", "Excluir")),
+)
+tarefas_adiadas_list = TarefaListView.as_view(
+    status="adiado",
+    template_name="tarefas/tarefas_adiadas.html",
+    nome_contexto="tarefas_adiadas",
+    acoes_em_massa=(("mover", 'Mover para "Tarefas Pendentes"'), ("excluir", "Excluir")),
+)
+tarefas_pendentes_list_async = TarefaListViewAsync.as_view(**tarefas_pendentes_list.view_initkwargs)
+tarefas_concluidas_list_async = TarefaListViewAsync.as_view(**tarefas_concluidas_list.view_initkwargs)
+tarefas_adiadas_list_async = TarefaListViewAsync.as_view(**tarefas_adiadas_list.view_initkwargs)
+
+
+def _contexto_formulario(form, *chave):
+    """Contexto do partial ``formulario.html``.
+
+    Um formulário ainda não enviado depende só de ``chave``, das categorias e
+    do dia (``min`` da data), então o HTML do crispy pode vir do cache; a
+    versão das tarefas também muda quando as categorias mudam. Sem ``chave``,
+    renderiza sempre.
+    """
+    contexto = {"form": form, "chave_formulario": None, "cache_timeout": timeout_cache()}
+    if chave and getattr(settings, "TAREFAS_CACHE_FORMULARIOS", False) and not form.is_bound:
+        contexto["chave_formulario"] = ":".join(str(parte) for parte in (versao_tarefas(), date.today(), *chave))
+    return contexto
+
 
 def adicionar_tarefa(request):
     data_inicial = request.GET.get('data')
@@ -57,7 +199,12 @@ def adicionar_tarefa(request):
             form.fields["data"].initial = data_inicial
             form.fields["data"].widget = form.fields["data"].hidden_widget()
 
-    return render(request, "tarefas/adicionar_tarefa.html", {"form": form})
+    # Um ?data= qualquer não ganha entrada própria no cache
+    try:
+        chave = ("adicionar", date.fromisoformat(data_inicial) if data_inicial else "")
+    except ValueError:
+        chave = ()
+    return render(request, "tarefas/adicionar_tarefa.html", _contexto_formulario(form, *chave))
 
 def criar_categoria(request):
     if request.method == "POST":
@@ -72,22 +219,23 @@ def criar_categoria(request):
     return render(request, "categorias/criar_categoria.html",
                   {"form": form})
 
-def concluir_tarefa(request, tarefa_id):
-    tarefa = get_object_or_404(Tarefa, id=tarefa_id)
-    tarefa.status = "concluído"
-    tarefa.save()
+def _transicionar(tarefa_id, acao):
+    try:
+        transicionar(tarefa_id, acao)
+    except Tarefa.DoesNotExist:
+        raise Http404("Tarefa não encontrada.")
+    except TransicaoInvalida as erro:
+        return HttpResponse(str(erro), status=409)
     return redirect("tarefas_pendentes_list")
 
+def concluir_tarefa(request, tarefa_id):
+    return _transicionar(tarefa_id, "concluir")
+
 def excluir_tarefa(request, tarefa_id):
-    tarefa = get_object_or_404(Tarefa, id=tarefa_id)
-    tarefa.delete()
-    return redirect("tarefas_pendentes_list")
+    return _transicionar(tarefa_id, "excluir")
 
 def adiar_tarefa(request, tarefa_id):
-    tarefa = get_object_or_404(Tarefa, id=tarefa_id)
-    tarefa.status = "adiado"
-    tarefa.save()
-    return redirect("tarefas_pendentes_list")
+    return _transicionar(tarefa_id, "adiar")
 
 
 def editar_tarefa(request, tarefa_id):
@@ -100,96 +248,162 @@ def editar_tarefa(request, tarefa_id):
     else:
         form = TarefaForm(instance=tarefa)  # Preenche o formulário com os valores atuais
 
-    return render(request, "tarefas/editar_tarefa.html", {"tarefa": tarefa, "form": form})
-
-def tarefas_concluidas_list(request):
-    busca = request.GET.get("q", "").strip()
-    categoria_id = request.GET.get('categoria')
-    ordenar_por = request.GET.get('ordenar_por', 'data')
-    tarefas_concluidas = Tarefa.objects.filter(status="concluído")
-    if busca:
-        tarefas_concluidas = tarefas_concluidas.filter(
-            Q(titulo__icontains=busca) |
-            Q(descricao__icontains=busca) |
-            Q(categoria__nome__icontains=busca)
-        )
-    
-    if categoria_id:
-        tarefas_concluidas = tarefas_concluidas.filter(categoria_id=categoria_id)
-    if ordenar_por == 'prioridade':
-        tarefas_concluidas = tarefas_concluidas.annotate(
-            prioridade_order=Case(
-                When(prioridade='alta', then=Value(1)),
-                When(prioridade='média', then=Value(2)),
-                When(prioridade='baixa', then=Value(3)),
-                output_field=IntegerField(),
-            )
-        ).order_by('prioridade_order', 'data')
-    else:
-        tarefas_concluidas = tarefas_concluidas.order_by('data', 'prioridade')
-
-    categorias = Categoria.objects.all()
-    context = {
-        'tarefas_concluidas': tarefas_concluidas,
-        'categorias': categorias,
-        'categoria_selecionada': categoria_id,
-        'ordenar_por': ordenar_por,
-        'today': date.today(),
-        'q': busca,
-    }
-    return render(request, "tarefas/tarefas_concluidas.html", context)
-
-
-def tarefas_adiadas_list(request):
-    busca = request.GET.get("q", "").strip()
-    categoria_id = request.GET.get('categoria')
-    ordenar_por = request.GET.get('ordenar_por', 'data')
-    tarefas_adiadas = Tarefa.objects.filter(status="adiado")
-    if busca:
-        tarefas_adiadas = tarefas_adiadas.filter(
-            Q(titulo__icontains=busca) |
-            Q(descricao__icontains=busca) |
-            Q(categoria__nome__icontains=busca)
-        )
-    if categoria_id:
-        tarefas_adiadas = tarefas_adiadas.filter(categoria_id=categoria_id)
-    if ordenar_por == 'prioridade':
-        tarefas_adiadas = tarefas_adiadas.annotate(
-            prioridade_order=Case(
-                When(prioridade='alta', then=Value(1)),
-                When(prioridade='média', then=Value(2)),
-                When(prioridade='baixa', then=Value(3)),
-                output_field=IntegerField(),
-            )
-        ).order_by('prioridade_order', 'data')
-    else:
-        tarefas_adiadas = tarefas_adiadas.order_by('data', 'prioridade')
-
-    categorias = Categoria.objects.all()
-    context = {
-        'tarefas_adiadas': tarefas_adiadas,
-        'categorias': categorias,
-        'categoria_selecionada': categoria_id,
-        'ordenar_por': ordenar_por,
-        'today': date.today(),
-        'q': busca,
-    }
-    return render(request, "tarefas/tarefas_adiadas.html", context)
+    contexto = _contexto_formulario(form, "editar", tarefa.id)
+    contexto["tarefa"] = tarefa
+    return render(request, "tarefas/editar_tarefa.html", contexto)
+
 
 
 def mover_para_tarefas(request, tarefa_id):
-    tarefa = get_object_or_404(Tarefa, id=tarefa_id)
-    tarefa.status = "pendente"
-    tarefa.save()
+    return _transicionar(tarefa_id, "mover")
 
-    return redirect("tarefas_pendentes_list")
 
-#view de calendário que exiba as tarefas pendentes em um calendário mensal
+def adicionar_recorrencia(request):
+    if request.method == "POST":
+        form = RecorrenciaForm(data=request.POST)
+        if form.is_valid():
+            form.save()
+            return redirect("tarefas_pendentes_list")
+    else:
+        form = RecorrenciaForm(initial={"inicio": date.today()})
+
+    return render(request, "tarefas/adicionar_recorrencia.html", {"form": form})
+
+
+def _data_ocorrencia(texto):
+    try:
+        return date.fromisoformat(texto)
+    except ValueError:
+        raise Http404("Data inválida.")
+
+
+# Ações de uma ocorrência ainda não materializada: todas criam a tarefa antes
+ACOES_OCORRENCIA = ("concluir", "adiar", "editar")
+
 
 @require_http_methods(["GET"])
-def calendario_mensal(request):
-    today = date.today()
-    
+@ler_da_replica
+def modal_ocorrencia(request, recorrencia_id, data):
+    """Conteúdo do modal de uma ocorrência de tarefa recorrente (ainda sem linha em ``Tarefa``)."""
+    data = _data_ocorrencia(data)
+    regra = get_object_or_404(Recorrencia.objects.select_related("categoria"), id=recorrencia_id)
+    if not datas_ocorrencias(regra, data, data):
+        raise Http404("Ocorrência não encontrada.")
+    return render(request, "tarefas/partials/modal_ocorrencia.html", {"tarefa": ocorrencia(regra, data)})
+
+
+def ocorrencia_tarefa(request, recorrencia_id, data, acao):
+    """Materializa a ocorrência e aplica ``acao`` à tarefa criada."""
+    if acao not in ACOES_OCORRENCIA:
+        raise Http404("Ação desconhecida.")
+    try:
+        tarefa = materializar(recorrencia_id, _data_ocorrencia(data))
+    except Recorrencia.DoesNotExist:
+        raise Http404("Ocorrência não encontrada.")
+    if acao == "editar":
+        return redirect("editar_tarefa", tarefa.id)
+    return _transicionar(tarefa.id, acao)
+
+@require_http_methods(["POST"])
+def acao_em_massa(request):
+    """Aplica concluir/adiar/mover/excluir a várias tarefas de uma vez.
+
+    Responde JSON com o total de linhas afetadas quando o cliente pede JSON;
+    caso contrário, volta para a lista de origem com uma mensagem.
+    """
+    acao = request.POST.get('acao', '')
+    ids = {int(i) for i in request.POST.getlist('ids') if i.isdigit()}
+    if acao not in ACOES or not ids or len(ids) > LIMITE_EM_MASSA:
+        return HttpResponseBadRequest("Ação ou seleção de tarefas inválida.")
+
+    afetadas = aplicar_em_massa(acao, ids)
+
+    if 'application/json' in request.headers.get('Accept', ''):
+        return JsonResponse({'acao': acao, 'afetadas': afetadas})
+    messages.success(request, f"{afetadas} tarefa(s) atualizada(s).")
+    destino = request.POST.get('next', '')
+    if not url_has_allowed_host_and_scheme(destino, allowed_hosts={request.get_host()}):
+        destino = 'tarefas_pendentes_list'
+    return redirect(destino)
+
+@require_http_methods(["GET"])
+@ler_da_replica
+def exportar_tarefas(request):
+    """Exporta as tarefas filtradas (todas, por padrão) em CSV ou NDJSON, em fluxo."""
+    formato = request.GET.get('formato', 'csv')
+    if formato not in FORMATOS:
+        return HttpResponseBadRequest("Formato inválido; use csv ou ndjson.")
+    filtros = filtros_da_requisicao(request.GET)
+    del filtros['ordenar_por']
+    # As linhas só são lidas durante o envio, depois que a view retornou;
+    # fixar o banco aqui mantém a leitura na réplica escolhida agora
+    linhas = linhas_exportacao(**filtros, using=router.db_for_read(Tarefa))
+    tipo, nome_arquivo = FORMATOS[formato]
+    response = StreamingHttpResponse(exportar(formato, linhas), content_type=tipo)
+    response['Content-Disposition'] = f'attachment; filename="{nome_arquivo}"'
+    return response
+
+def _fragmento_em_cache(chave, renderizar):
+    """Devolve o HTML de ``renderizar()`` em cache por (chave, versão das tarefas)."""
+    chave = f"tarefas:fragmento:{versao_tarefas()}:{chave}"
+    html = cache.get(chave)
+    if html is None:
+        html = renderizar()
+        if not leitura_em_replica():
+            cache.set(chave, html, timeout_cache())
+    return HttpResponse(html)
+
+
+@require_http_methods(["GET"])
+@ler_da_replica
+def modal_tarefa(request, tarefa_id):
+    """Conteúdo do modal de uma tarefa, buscado quando a linha é clicada."""
+    def renderizar():
+        tarefa = get_object_or_404(
+            Tarefa.objects.only('id', 'titulo', 'descricao', 'prioridade', 'status'), id=tarefa_id,
+        )
+        template_name = (
+            'tarefas/partials/modal_tarefa_pendente.html' if tarefa.status == 'pendente'
+            else 'tarefas/partials/modal_tarefa.html'
+        )
+        return render_to_string(template_name, {'tarefa': tarefa}, request)
+
+    return _fragmento_em_cache(f"tarefa:{tarefa_id}", renderizar)
+
+
+@require_http_methods(["GET"])
+@ler_da_replica
+def modal_dia(request, ano, mes, dia):
+    """Conteúdo do modal de um dia do calendário, buscado quando a célula é clicada."""
+    try:
+        data = date(ano, mes, dia)
+    except ValueError:
+        raise Http404("Data inválida.")
+
+    def renderizar():
+        pendentes = tarefas_para_listagem().filter(status='pendente', data=data).order_by('prioridade', 'id')
+        contexto = {'day': {'day': data, 'pendentes': [*pendentes, *ocorrencias(data, data)]}}
+        return render_to_string('tarefas/partials/modal_dia.html', contexto, request)
+
+    return _fragmento_em_cache(f"dia:{data.isoformat()}", renderizar)
+
+
+class _TarefasPorDia:
+    """Bucket the calendar rows, then the recurring occurrences, into their days on first access."""
+
+    def __init__(self, tarefas, ocorrencias=()):
+        self.tarefas = tarefas
+        self.ocorrencias = ocorrencias
+        self.dias = None
+
+    def do_dia(self, dia):
+        if self.dias is None:
+            self.dias = defaultdict(list)
+            for tarefa in chain(self.tarefas, self.ocorrencias):
+                self.dias[tarefa.data].append(tarefa)
+        return self.dias.get(dia, [])
+
+def _mes_calendario(request, today):
     # Safe parameter validation
     try:
         year = int(request.GET.get('year', today.year))
@@ -207,23 +421,42 @@ def calendario_mensal(request):
         # If conversion fails, use current date
         year = today.year
         month = today.month
+    return year, month
 
-    # Generate calendar grid for the month
-    month_days = calendar.Calendar(firstweekday=6).monthdatescalendar(year, month)
 
-    # Fetch all pending tasks
-    tarefas = Tarefa.objects.filter(status='pendente')
+def _pendentes_da_grade(month_days):
+    # Every pending task of the visible grid, in a single query
+    return tarefas_para_listagem().filter(
+        status='pendente',
+        data__range=(month_days[0][0], month_days[-1][-1]),
+    ).order_by('data', 'prioridade', 'id')
+
+
+def _ocorrencias_da_grade(month_days):
+    # Recurring occurrences are expanded for the visible grid only
+    return ocorrencias(month_days[0][0], month_days[-1][-1])
+
+
+def _pendentes_por_dia(month_days):
+    # Each day's list is lazy and only evaluated when the {% cache %} tag
+    # misses that day's cell, so the tasks are read only if some cell is
+    # missing, and a cell that expires mid-render still gets its tasks
+    tarefas_por_dia = _TarefasPorDia(
+        _pendentes_da_grade(month_days), SimpleLazyObject(partial(_ocorrencias_da_grade, month_days)),
+    )
+    return lambda day: SimpleLazyObject(partial(tarefas_por_dia.do_dia, day))
+
 
-    # Organize pending tasks per day 
+def _contexto_calendario(today, year, month, month_days, pendentes_do_dia, versao):
+    # Organize pending tasks per day
     calendar_data = []
     for week in month_days:
         week_data = []
         for day in week:
-            tarefas_do_dia = tarefas.filter(data=day)
             week_data.append({
                 'day': day,
                 'is_current_month': day.month == month,
-                'pendentes': tarefas_do_dia,
+                'pendentes': pendentes_do_dia(day),
             })
         calendar_data.append(week_data)
     
@@ -240,7 +473,7 @@ def calendario_mensal(request):
     prev_month = (first_day_of_month - timedelta(days=1)).replace(day=1)
     next_month = (last_day_of_month + timedelta(days=1)).replace(day=1)
 
-    context = {
+    return {
         'calendar_data': calendar_data,
         'year': year,
         'month': month,
@@ -249,6 +482,40 @@ def calendario_mensal(request):
         'prev_month': prev_month.month,
         'next_year': next_month.year,
         'next_month': next_month.month,
+        'versao_tarefas': versao,
+        # Cells read from a replica may be stale: render them, but don't keep them
+        'cache_timeout': 0 if leitura_em_replica() else timeout_cache(),
     }
 
+#view de calendário que exiba as tarefas pendentes em um calendário mensal
+
+@require_http_methods(["GET"])
+@cache_resposta
+@ler_da_replica
+def calendario_mensal(request):
+    today = date.today()
+    year, month = _mes_calendario(request, today)
+
+    # Generate calendar grid for the month
+    month_days = calendar.Calendar(firstweekday=6).monthdatescalendar(year, month)
+
+    context = _contexto_calendario(
+        today, year, month, month_days, _pendentes_por_dia(month_days), versao_tarefas(),
+    )
     return render(request, 'tarefas/calendario_mensal.html', context)
+
+
+@require_http_methods(["GET"])
+@cache_resposta
+@ler_da_replica
+async def calendario_mensal_async(request):
+    """Variante assíncrona de ``calendario_mensal``, usada sob ASGI (ver ``urls.py``)."""
+    today = date.today()
+    year, month = _mes_calendario(request, today)
+    month_days = calendar.Calendar(firstweekday=6).monthdatescalendar(year, month)
+    # The template renders in a sync thread, where the lazy day lists can
+    # query the database like in the sync view
+    context = _contexto_calendario(
+        today, year, month, month_days, _pendentes_por_dia(month_days), await aversao_tarefas(),
+    )
+    return await sync_to_async(render)(request, 'tarefas/calendario_mensal.html', context)